@@ -0,0 +1,81 @@
+"""Batch compile benchmark.
+
+Compares letters/sec of one TeX job per letter on the warm worker pool against
+multi-letter jobs (combine, compile once, split with PyPDF2).
+
+Run from the repository root with ``src`` and the root on the import path
+(the package is imported both as ``agent`` and as ``src.agent``).
+
+Usage:
+    PYTHONPATH=src:. python benchmarks/bench_batch.py --letters 200 --batch-size 50 --workers 2
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from bench_compile import SAMPLE_LETTER
+
+from agent.latex_pool import LatexWorkerPool
+from agent.letter_batch import combine_documents, split_pdf
+from agent.tools import generate_cover_letter_latex
+
+
+def sample_documents(count: int) -> list:
+    """Distinct letters, one per made-up company."""
+    return [
+        generate_cover_letter_latex(SAMPLE_LETTER.model_copy(update={"company_name": f"Company {i} GmbH"}), "en")
+        for i in range(count)
+    ]
+
+
+def run_single(pool: LatexWorkerPool, documents: list, out_dir: Path) -> float:
+    """Letters/sec with one pool job per letter."""
+    start = time.perf_counter()
+    futures = [pool.submit(latex, str(out_dir / f"single_{i}.pdf")) for i, latex in enumerate(documents)]
+    results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - start
+    failed = [r.message for r in results if not r.success]
+    assert not failed, f"single-letter job failed: {failed[0]}"
+    return len(documents) / elapsed
+
+
+def run_batched(pool: LatexWorkerPool, documents: list, out_dir: Path, batch_size: int) -> float:
+    """Letters/sec with ``batch_size`` letters per pool job, split afterwards."""
+    start = time.perf_counter()
+    chunks = [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
+    futures = [
+        pool.submit(combine_documents(chunk), str(out_dir / f"batch_{n}.pdf")) for n, chunk in enumerate(chunks)
+    ]
+    for n, (chunk, future) in enumerate(zip(chunks, futures)):
+        result = future.result()
+        assert result.success, f"batch job failed: {result.message}"
+        outputs = [str(out_dir / f"batched_{n}_{i}.pdf") for i in range(len(chunk))]
+        split_pdf(str(out_dir / f"batch_{n}.pdf"), outputs)
+    elapsed = time.perf_counter() - start
+    return len(documents) / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--letters", type=int, default=200, help="letters per run")
+    parser.add_argument("--batch-size", type=int, default=50, help="letters per TeX job")
+    parser.add_argument("--workers", type=int, default=2, help="concurrent compiles")
+    args = parser.parse_args()
+
+    documents = sample_documents(args.letters)
+    pool = LatexWorkerPool(size=args.workers)
+    try:
+        with tempfile.TemporaryDirectory() as out:
+            out_dir = Path(out)
+            # Let the workers spawn their first primed process before timing
+            pool.compile(documents[0], str(out_dir / "warmup.pdf"))
+            single = run_single(pool, documents, out_dir)
+            batched = run_batched(pool, documents, out_dir, args.batch_size)
+    finally:
+        pool.shutdown()
+
+    print(f"Letters: {args.letters}, batch size: {args.batch_size}, concurrency: {args.workers}")
+    print(f"  one job per letter: {single:7.2f} letters/sec")
+    print(f"  multi-letter jobs:  {batched:7.2f} letters/sec  ({batched / single:.2f}x)")
@@ -0,0 +1,78 @@
+"""Interactive latency under batch load.
+
+Measures p50/p95 latency of interactive compiles submitted one after another
+while a backlog of batch compiles is queued on the same worker pool: once with
+the backlog at batch priority and once with everything in one FIFO class (the
+behaviour before priority classes), next to an idle-pool baseline. The time
+the interactive compiles spent waiting for a free worker is reported as well.
+
+Run from the repository root with ``src`` and the root on the import path
+(the package is imported both as ``agent`` and as ``src.agent``).
+
+Usage:
+    PYTHONPATH=src:. python benchmarks/bench_priority.py --interactive 20 --backlog 100 --workers 2
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from bench_compile import SAMPLE_LETTER
+
+from agent.latex_pool import AdmissionControl, LatexWorkerPool
+from agent.tools import generate_cover_letter_latex
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Return the value below which ``fraction`` of ``values`` fall."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(latex_content: str, out_dir: Path, args, backlog_priority: str = "") -> tuple:
+    """Latencies and queue waits of interactive compiles, optionally behind a backlog of the given priority."""
+    admission = AdmissionControl(args.workers, args.backlog + args.interactive)
+    pool = LatexWorkerPool(size=args.workers, admission=admission)
+    try:
+        pool.compile(latex_content, str(out_dir / "warmup.pdf"))
+        backlog = [
+            pool.submit(latex_content, str(out_dir / f"backlog_{i}.pdf"), priority=backlog_priority)
+            for i in range(args.backlog if backlog_priority else 0)
+        ]
+        latencies, waits = [], []
+        for i in range(args.interactive):
+            start = time.perf_counter()
+            result = pool.compile(latex_content, str(out_dir / f"interactive_{i}.pdf"))
+            latencies.append(time.perf_counter() - start)
+            waits.append(result.queue_wait)
+            assert result.success, result.message
+        for future in backlog:
+            future.cancel()
+        return latencies, waits
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interactive", type=int, default=20, help="interactive compiles to time")
+    parser.add_argument("--backlog", type=int, default=100, help="batch compiles queued first")
+    parser.add_argument("--workers", type=int, default=2, help="pool size")
+    args = parser.parse_args()
+
+    latex = generate_cover_letter_latex(SAMPLE_LETTER, "en")
+    with tempfile.TemporaryDirectory() as out:
+        runs = {
+            "idle pool": measure(latex, Path(out), args),
+            "backlog, batch priority": measure(latex, Path(out), args, "batch"),
+            "backlog, one FIFO class": measure(latex, Path(out), args, "interactive"),
+        }
+
+    print(f"Interactive compiles: {args.interactive}, backlog: {args.backlog}, workers: {args.workers}")
+    for name, (latencies, waits) in runs.items():
+        print(
+            f"  {name:24s} p50 {statistics.median(latencies):6.2f}s   p95 {percentile(latencies, 0.95):6.2f}s"
+            f"   queue wait p50 {statistics.median(waits):6.2f}s"
+        )
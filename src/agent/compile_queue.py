@@ -0,0 +1,573 @@
+"""Queue-backed compile service.
+
+With ``config.COMPILE_SERVICE`` enabled, documents are not compiled in the
+calling process: they are written to a SQLite job queue and built by separate
+worker processes, which may run on other machines that share the queue file
+and the output directories. TeX capacity then scales independently of the
+LangGraph API workers.
+
+Workers claim the job that is due first (see ``latex_pool.priority_delay``)
+in a transaction, refresh a heartbeat while they run, and write the PDF
+straight to the job's output path. Jobs of a worker whose heartbeat stops are
+put back in the queue up to ``config.COMPILE_JOB_RETRIES`` times. TeX errors
+are not retried; they are deterministic. Like the in-process pool, the
+queue turns jobs away at once when ``config.LATEX_MAX_QUEUED`` of them are
+already waiting, and batch jobs can't take the last
+``config.LATEX_INTERACTIVE_RESERVED`` places.
+
+Clients need no TeX installation: they queue jobs with ``AUTO_ENGINE`` and
+the claiming worker picks the engine from its own toolchain. Workers publish
+their engines and versions in the ``workers`` table, and clients key the PDF
+cache on them.
+
+Start workers with:
+    python -m agent.compile_queue --processes 4
+
+Show queue and worker status with:
+    python -m agent.compile_queue --status
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from agent.latex_pool import (
+    AT_CAPACITY,
+    CompileResult,
+    LatexWorker,
+    LatexWorkerPool,
+    get_worker_pool,
+    priority_delay,
+)
+from agent.toolchain import Toolchain, get_toolchain, required_packages
+from agent.user_config import config
+
+# Idle workers and waiting clients poll between these intervals (seconds)
+POLL_MIN = 0.02
+POLL_MAX = 0.5
+# A running job is abandoned once its heartbeat is this many intervals old
+STALE_HEARTBEATS = 3
+# Engine of jobs whose worker picks the engine from its own toolchain
+AUTO_ENGINE = "auto"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    latex TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    draft INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',      -- queued, running, done, failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    heartbeat REAL,
+    success INTEGER,
+    message TEXT,
+    passes INTEGER,
+    pages INTEGER,
+    elapsed REAL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    due REAL NOT NULL DEFAULT 0                 -- created + priority class delay
+);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    engines TEXT NOT NULL DEFAULT '',
+    jobs_done INTEGER NOT NULL DEFAULT 0,
+    started REAL NOT NULL,
+    heartbeat REAL NOT NULL
+);
+"""
+# Queue databases created before priority scheduling lack the due column
+MIGRATIONS = (
+    ("due", "ALTER TABLE jobs ADD COLUMN due REAL NOT NULL DEFAULT 0"),
+)
+INDEXES = "CREATE INDEX IF NOT EXISTS jobs_due ON jobs (status, due);"
+
+
+@dataclass
+class QueuedJob:
+    """A job claimed by a worker."""
+    id: str
+    latex: str
+    output_path: str
+    engine: str
+    draft: bool
+    attempts: int
+
+
+class CompileQueue:
+    """SQLite-backed job queue shared by tool processes and compile workers.
+
+    Every thread gets its own connection. The database uses the default
+    rollback journal, so it also works on shared filesystems with POSIX locks.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Open (and create if needed) the queue database at ``path``."""
+        self.path = Path(path or config.COMPILE_QUEUE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.heartbeat_interval = config.COMPILE_HEARTBEAT_SECONDS
+        self.retries = config.COMPILE_JOB_RETRIES
+        self.max_queued = max(1, config.LATEX_MAX_QUEUED)
+        # Batch work always keeps at least one place
+        self.interactive_reserve = min(max(0, config.LATEX_INTERACTIVE_RESERVED), self.max_queued - 1)
+        self._local = threading.local()
+        self._waiting: Dict[str, Tuple[Future, float]] = {}
+        self._waiting_lock = threading.Condition()
+        self._waiter: Optional[threading.Thread] = None
+        db = self._db()
+        db.executescript(SCHEMA)
+        # Holding the write lock keeps processes that open the queue at once
+        # from both adding a missing column
+        with self._transaction() as db:
+            columns = {row["name"] for row in db.execute("PRAGMA table_info(jobs)")}
+            for column, statement in MIGRATIONS:
+                if column not in columns:
+                    db.execute(statement)
+        db.executescript(INDEXES)
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that takes the database lock up front."""
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    # Client side
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        latex_content: str,
+        output_path: str,
+        engine: str = "pdflatex",
+        draft: bool = False,
+        priority: str = "interactive"
+    ) -> Optional[str]:
+        """Add a job to the queue and return its id, or None if the queue is full."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        due = now + priority_delay(priority)
+        limit = self.max_queued
+        if priority == "batch":
+            limit -= self.interactive_reserve
+        with self._transaction() as db:
+            queued = db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if queued >= limit:
+                return None
+            db.execute(
+                "INSERT INTO jobs (id, latex, output_path, engine, draft, created, updated, due) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, latex_content, output_path, engine, int(draft), now, now, due),
+            )
+        return job_id
+
+    def submit(
+        self,
+        latex_content: str,
+        output_path: str,
+        engine: str = "pdflatex",
+        draft: bool = False,
+        priority: str = "interactive"
+    ) -> "Future[CompileResult]":
+        """Queue a document and return a future that completes when a worker has built it."""
+        # A relative path would resolve against the worker's directory
+        output_path = str(Path(output_path).resolve()) if output_path else ""
+        job_id = self.enqueue(latex_content, output_path, engine, draft, priority)
+        future: Future[CompileResult] = Future()
+        if job_id is None:
+            future.set_result(CompileResult(
+                False, f"{AT_CAPACITY} ({self.max_queued} jobs queued for the compile service); try again shortly."
+            ))
+            return future
+        with self._waiting_lock:
+            self._waiting[job_id] = (future, time.monotonic() + config.COMPILE_JOB_TIMEOUT)
+            if self._waiter is None:
+                self._waiter = threading.Thread(target=self._wait_loop, name="compile-queue-waiter", daemon=True)
+                self._waiter.start()
+            self._waiting_lock.notify()
+        return future
+
+    def _wait_loop(self) -> None:
+        """Resolve the futures of finished jobs; one thread serves every waiting job."""
+        delay = POLL_MIN
+        while True:
+            with self._waiting_lock:
+                while not self._waiting:
+                    self._waiting_lock.wait()
+                waiting = dict(self._waiting)
+
+            try:
+                finished = self._collect(list(waiting))
+            except sqlite3.Error:
+                # Locked or briefly unreachable (shared filesystem); try again
+                finished = {}
+            now = time.monotonic()
+            for job_id, (future, deadline) in waiting.items():
+                result = finished.get(job_id)
+                if result is None and now > deadline:
+                    result = self._expire(job_id)
+                if result is None:
+                    continue
+                with self._waiting_lock:
+                    self._waiting.pop(job_id, None)
+                future.set_result(result)
+
+            # Poll quickly while results arrive, back off while workers are busy
+            delay = POLL_MIN if finished else min(delay * 2, POLL_MAX)
+            time.sleep(delay)
+
+    def _collect(self, job_ids: List[str]) -> Dict[str, CompileResult]:
+        """Fetch and delete the finished jobs among ``job_ids``."""
+        results = {}
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = self._db().execute(
+                f"SELECT id, success, message, passes, pages, elapsed FROM jobs "
+                f"WHERE id IN ({marks}) AND status IN ('done', 'failed')",
+                chunk,
+            ).fetchall()
+            for row in rows:
+                results[row["id"]] = CompileResult(
+                    bool(row["success"]), row["message"] or "", row["passes"] or 0,
+                    row["pages"], elapsed=row["elapsed"] or 0.0,
+                )
+        if results:
+            with self._transaction() as db:
+                db.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in results])
+        return results
+
+    def _expire(self, job_id: str) -> CompileResult:
+        """Give up on a job that did not finish within COMPILE_JOB_TIMEOUT."""
+        with self._transaction() as db:
+            row = db.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        status = row["status"] if row else "missing"
+        hint = " (no compile workers running?)" if status == "queued" and not self.live_workers() else ""
+        return CompileResult(
+            False, f"Compile service did not finish the job within {config.COMPILE_JOB_TIMEOUT}s "
+                   f"(job was {status}){hint}."
+        )
+
+    def job_status(self, job_id: str) -> Optional[Dict]:
+        """Status, attempts and worker of a job, or None once its result was collected."""
+        row = self._db().execute(
+            "SELECT status, attempts, worker, message, created, updated FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def live_workers(self) -> int:
+        """Count workers whose heartbeat is recent."""
+        cutoff = time.time() - STALE_HEARTBEATS * self.heartbeat_interval
+        return self._db().execute("SELECT COUNT(*) FROM workers WHERE heartbeat >= ?", (cutoff,)).fetchone()[0]
+
+    def engine_versions(self) -> str:
+        """Engines and versions of the live workers, e.g. ``"pdflatex=3.14...;xelatex=..."``."""
+        cutoff = time.time() - STALE_HEARTBEATS * self.heartbeat_interval
+        engines = set()
+        for row in self._db().execute("SELECT engines FROM workers WHERE heartbeat >= ?", (cutoff,)):
+            engines.update(entry for entry in row["engines"].split(",") if entry)
+        return ";".join(sorted(engines))
+
+    def stats(self) -> Dict[str, int]:
+        """Job counts by status and the number of live workers."""
+        counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        for row in self._db().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        counts["workers"] = self.live_workers()
+        return counts
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def register_worker(self, worker_id: str, engines: str = "") -> None:
+        """Announce a worker and the engines (``name=version,...``) it can run."""
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO workers (id, host, pid, engines, started, heartbeat) VALUES (?, ?, ?, ?, ?, ?)",
+                (worker_id, socket.gethostname(), os.getpid(), engines, now, now),
+            )
+
+    def unregister_worker(self, worker_id: str) -> None:
+        """Remove a worker from the registry."""
+        with self._transaction() as db:
+            db.execute("DELETE FROM workers WHERE id = ?", (worker_id,))
+
+    def heartbeat(self, worker_id: str) -> None:
+        """Mark a worker and the job it is running as alive."""
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("UPDATE workers SET heartbeat = ? WHERE id = ?", (now, worker_id))
+            db.execute("UPDATE jobs SET heartbeat = ? WHERE worker = ? AND status = 'running'", (now, worker_id))
+
+    def claim(self, worker_id: str) -> Optional[QueuedJob]:
+        """Take the queued job that is due first, or None if the queue is empty."""
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT id, latex, output_path, engine, draft, attempts FROM jobs "
+                "WHERE status = 'queued' ORDER BY due LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                "heartbeat = ?, updated = ? WHERE id = ?",
+                (worker_id, now, now, row["id"]),
+            )
+        return QueuedJob(
+            row["id"], row["latex"], row["output_path"], row["engine"], bool(row["draft"]), row["attempts"] + 1
+        )
+
+    def finish(self, job: QueuedJob, worker_id: str, result: CompileResult) -> None:
+        """Store the result of a job, unless it was reassigned in the meantime."""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, success = ?, message = ?, passes = ?, pages = ?, elapsed = ?, "
+                "updated = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (
+                    "done" if result.success else "failed", int(result.success), result.message,
+                    result.passes, result.pages, result.elapsed, time.time(), job.id, worker_id,
+                ),
+            )
+            db.execute("UPDATE workers SET jobs_done = jobs_done + 1 WHERE id = ?", (worker_id,))
+
+    def release(self, job: QueuedJob, worker_id: str, error: str) -> None:
+        """Hand back a job the worker could not run; retried while attempts remain."""
+        now = time.time()
+        with self._transaction() as db:
+            if job.attempts <= self.retries:
+                db.execute(
+                    "UPDATE jobs SET status = 'queued', worker = NULL, updated = ? "
+                    "WHERE id = ? AND worker = ? AND status = 'running'",
+                    (now, job.id, worker_id),
+                )
+            else:
+                db.execute(
+                    "UPDATE jobs SET status = 'failed', success = 0, message = ?, updated = ? "
+                    "WHERE id = ? AND worker = ? AND status = 'running'",
+                    (f"Compile worker error after {job.attempts} attempts: {error}", now, job.id, worker_id),
+                )
+
+    def reap_stale(self) -> int:
+        """Requeue (or fail, once out of retries) jobs whose worker stopped sending heartbeats.
+
+        Returns:
+            Number of jobs affected
+        """
+        now = time.time()
+        cutoff = now - STALE_HEARTBEATS * self.heartbeat_interval
+        with self._transaction() as db:
+            requeued = db.execute(
+                "UPDATE jobs SET status = 'queued', worker = NULL, updated = ? "
+                "WHERE status = 'running' AND heartbeat < ? AND attempts <= ?",
+                (now, cutoff, self.retries),
+            ).rowcount
+            failed = db.execute(
+                "UPDATE jobs SET status = 'failed', success = 0, updated = ?, "
+                "message = 'Compile worker stopped responding (' || attempts || ' attempts).' "
+                "WHERE status = 'running' AND heartbeat < ?",
+                (now, cutoff),
+            ).rowcount
+            db.execute("DELETE FROM workers WHERE heartbeat < ?", (cutoff,))
+        return requeued + failed
+
+
+class QueuedCompiler:
+    """Compile service client with the submit/compile interface of ``LatexWorkerPool``."""
+
+    def __init__(self, compile_queue: CompileQueue, engine: str = "pdflatex"):
+        """Submit jobs for ``engine`` (or ``AUTO_ENGINE``) to ``compile_queue``."""
+        self.queue = compile_queue
+        self.engine = engine
+
+    def submit(
+        self,
+        latex_content: str,
+        output_path: str,
+        draft: bool = False,
+        priority: str = "interactive"
+    ) -> "Future[CompileResult]":
+        """Queue a document and return a future for its result."""
+        return self.queue.submit(latex_content, output_path, self.engine, draft, priority)
+
+    def compile(
+        self,
+        latex_content: str,
+        output_path: str,
+        draft: bool = False,
+        priority: str = "interactive"
+    ) -> CompileResult:
+        """Compile a document through the queue and wait for the result."""
+        return self.submit(latex_content, output_path, draft, priority).result()
+
+
+_queue: Optional[CompileQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_compile_queue() -> CompileQueue:
+    """Return the process-wide compile queue client."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = CompileQueue()
+        return _queue
+
+
+def get_compiler(engine: str = "pdflatex") -> Union[LatexWorkerPool, QueuedCompiler]:
+    """Compile backend for an engine: the compile service if enabled, else the in-process pool."""
+    if config.COMPILE_SERVICE:
+        return QueuedCompiler(get_compile_queue(), engine)
+    return get_worker_pool(engine)
+
+
+# ============================================================================
+# Worker process
+# ============================================================================
+
+def describe_engines(toolchain: Toolchain) -> str:
+    """Engines of a toolchain as stored in the workers table."""
+    return ",".join(f"{name}={info.version}" for name, info in toolchain.engines.items())
+
+
+def resolve_job_engine(job: QueuedJob, toolchain: Toolchain) -> Tuple[Optional[str], str]:
+    """Engine a worker uses for a job.
+
+    Returns:
+        Tuple of (engine or None, error message when there is no usable engine)
+    """
+    if job.engine != AUTO_ENGINE:
+        return job.engine, ""
+    engine = toolchain.select_engine(job.latex)
+    if engine is not None:
+        return engine, ""
+    if not toolchain.engines:
+        return None, f"LaTeX is not installed on compile worker {socket.gethostname()}."
+    missing = toolchain.missing_packages(required_packages(job.latex), "pdflatex")
+    return None, (
+        f"No TeX engine on compile worker {socket.gethostname()} can build this document "
+        f"(missing packages: {', '.join(missing)})."
+    )
+
+
+def run_worker(path: Optional[str] = None, stop: Optional[threading.Event] = None) -> None:
+    """Serve compile jobs until ``stop`` is set (or forever).
+
+    Keeps one warm ``LatexWorker`` per engine it has seen and sends heartbeats
+    from a background thread, so long compiles are not mistaken for dead workers.
+    """
+    compile_queue = CompileQueue(path)
+    stop = stop or threading.Event()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+    toolchain = get_toolchain()
+    compile_queue.register_worker(worker_id, describe_engines(toolchain))
+    workers: Dict[str, LatexWorker] = {}
+
+    def beat():
+        while not stop.wait(compile_queue.heartbeat_interval):
+            try:
+                compile_queue.heartbeat(worker_id)
+            except sqlite3.Error:
+                pass
+
+    threading.Thread(target=beat, name="compile-heartbeat", daemon=True).start()
+    delay = POLL_MIN
+    try:
+        while not stop.is_set():
+            job = compile_queue.claim(worker_id)
+            if job is None:
+                compile_queue.reap_stale()
+                stop.wait(delay)
+                delay = min(delay * 2, POLL_MAX)
+                continue
+            delay = POLL_MIN
+            engine, error = resolve_job_engine(job, toolchain)
+            if engine is None:
+                compile_queue.finish(job, worker_id, CompileResult(False, error))
+                continue
+            try:
+                worker = workers.get(engine)
+                if worker is None:
+                    worker = workers[engine] = LatexWorker(engine, config.LATEX_WORKER_MAX_JOBS)
+                result = worker.compile(job.latex, job.output_path, job.draft)
+            except Exception as e:
+                compile_queue.release(job, worker_id, str(e))
+                continue
+            compile_queue.finish(job, worker_id, result)
+    finally:
+        stop.set()
+        for worker in workers.values():
+            worker.close()
+        compile_queue.unregister_worker(worker_id)
+
+
+def _serve(path: Optional[str]) -> None:
+    # Finish the current job and deregister on SIGTERM
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        run_worker(path, stop)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run compile service workers for the shared job queue.")
+    parser.add_argument("--processes", type=int, default=config.LATEX_WORKERS, help="worker processes to start")
+    parser.add_argument("--queue", default=None, help="queue database (default: config.COMPILE_QUEUE_PATH)")
+    parser.add_argument("--status", action="store_true", help="print queue and worker status and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        for key, value in CompileQueue(args.queue).stats().items():
+            print(f"{key}: {value}")  # noqa: T201
+    else:
+        processes = [
+            multiprocessing.Process(target=_serve, args=(args.queue,), name=f"compile-worker-{i}")
+            for i in range(max(1, args.processes))
+        ]
+        for process in processes:
+            process.start()
+        signal.signal(signal.SIGTERM, lambda *_: [process.terminate() for process in processes])
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.join()
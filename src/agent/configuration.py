@@ -35,6 +35,22 @@ class Configuration:
     
     system_prompt: str = prompts.SYSTEM_PROMPT
 
+    compile_priority: str = field(
+        default="interactive",
+        metadata={
+            "description": "Scheduling class of this run's LaTeX compiles: 'interactive' "
+            "(a user is waiting, served first) or 'batch' (bulk generation, yields to interactive work)."
+        },
+    )
+
+    translation_backends: str = field(
+        default="",
+        metadata={
+            "description": "Comma-separated translation backends tried in order, e.g. 'google,identity' "
+            "or 'dictionary' for offline runs. Empty uses UserConfig.TRANSLATION_BACKENDS."
+        },
+    )
+
     @classmethod
     def from_runnable_config(
         cls, config: Optional[RunnableConfig] = None
@@ -288,6 +288,8 @@ You can call tools in parallel.
 
 
 # Create the agent
+# Every tool also carries an async implementation, which the API server's event
+# loop uses so concurrent threads never block on TeX, translation or file I/O
 graph = create_react_agent(
     llm,
     tools=[
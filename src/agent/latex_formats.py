@@ -0,0 +1,212 @@
+"""Precompiled preamble format files for the bundled templates.
+
+The preambles of the cover letter and resume templates never change between
+documents, so each template family gets a ``.fmt`` dumped with ``pdflatex -ini``
+that already contains geometry, carlito, hyperref, enumitem and the resume
+class. Formats are cached on disk under a name derived from the template
+preamble, ``resume.cls`` and the engine version, so any change to one of them
+makes the old format stale. Stale or missing formats are rebuilt in the
+background while documents fall back to the plain preamble.
+
+Build all formats ahead of time with:
+    python -m agent.latex_formats
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from agent.toolchain import engine_version, read_template
+from agent.user_config import config
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Template family name -> template file in templates/
+TEMPLATE_FAMILIES: Dict[str, str] = {
+    "cover_letter_en": "cover_letter_en.tex",
+    "cover_letter_de": "cover_letter_de.tex",
+    "resume_en": "resume_en.tex",
+}
+
+BEGIN_DOCUMENT = "\\begin{document}"
+FORMAT_BUILD_TIMEOUT = 60
+
+_building: Set[str] = set()
+_building_lock = threading.Lock()
+
+
+def format_dir() -> Path:
+    """Directory of the dumped formats (read at call time, so CACHE_DIR can change at runtime)."""
+    return Path(config.CACHE_DIR) / "formats"
+
+
+def split_preamble(latex_content: str) -> Tuple[str, str]:
+    r"""Split a LaTeX document at ``\begin{document}``.
+
+    Returns:
+        Tuple of (preamble: str, body: str) where body starts with ``\begin{document}``.
+        The preamble is empty if the document has no ``\begin{document}``.
+    """
+    index = latex_content.find(BEGIN_DOCUMENT)
+    if index == -1:
+        return "", latex_content
+    return latex_content[:index], latex_content[index:]
+
+
+@lru_cache(maxsize=16)
+def _preamble_of(template_text: str) -> str:
+    # Template texts come from read_template, so a hit costs no rehashing
+    return split_preamble(template_text)[0]
+
+
+def _template_preamble(family: str) -> str:
+    """Preamble of a template family's current template file."""
+    return _preamble_of(read_template(TEMPLATES_DIR / TEMPLATE_FAMILIES[family]))
+
+
+@lru_cache(maxsize=32)
+def _format_name(family: str, engine: str, preamble: str, resume_cls: str, version: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(preamble.encode('utf-8'))
+    digest.update(resume_cls.encode('utf-8'))
+    digest.update(version.encode('utf-8'))
+    return f"{family}-{engine}-{digest.hexdigest()[:16]}"
+
+
+def format_name(family: str, engine: str = "pdflatex") -> str:
+    """Name of the current format for a template family.
+
+    The name embeds a hash of the template preamble, ``resume.cls`` and the
+    engine version, so a changed input never matches an old ``.fmt``. Template
+    files are only re-read and re-hashed after they change.
+    """
+    return _format_name(
+        family, engine, _template_preamble(family), read_template(TEMPLATES_DIR / "resume.cls"), engine_version(engine)
+    )
+
+
+def _match_family(latex_content: str) -> Optional[Tuple[str, int]]:
+    """Template family whose preamble the document starts with, and that preamble's length."""
+    preamble, _ = split_preamble(latex_content)
+    if not preamble:
+        return None
+    best = None
+    for family in TEMPLATE_FAMILIES:
+        template_preamble = _template_preamble(family)
+        # Settings appended after the template preamble are run on top of the format
+        if template_preamble and preamble.startswith(template_preamble):
+            if best is None or len(template_preamble) > best[1]:
+                best = (family, len(template_preamble))
+    return best
+
+
+def find_family(latex_content: str) -> Optional[str]:
+    """Return the template family whose preamble this document starts with verbatim."""
+    match = _match_family(latex_content)
+    return match[0] if match else None
+
+
+def build_format(family: str, engine: str = "pdflatex") -> Optional[Path]:
+    """Dump the preamble of a template family into a ``.fmt`` file.
+
+    Returns:
+        Path to the format file, or None if the dump failed.
+    """
+    name = format_name(family, engine)
+    target = format_dir() / f"{name}.fmt"
+    if target.exists():
+        return target
+
+    preamble = _template_preamble(family)
+    if not preamble:
+        return None
+
+    format_dir().mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir_path = Path(temp_dir)
+        (temp_dir_path / f"{name}.tex").write_text(preamble + "\\dump\n", encoding='utf-8')
+        shutil.copy(TEMPLATES_DIR / "resume.cls", temp_dir_path / "resume.cls")
+        try:
+            subprocess.run(
+                [engine, "-ini", "-interaction=nonstopmode", f"-jobname={name}",
+                 f"&{engine}", f"{name}.tex"],
+                cwd=temp_dir, capture_output=True, text=True, timeout=FORMAT_BUILD_TIMEOUT
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+
+        dumped = temp_dir_path / f"{name}.fmt"
+        if not dumped.exists():
+            return None
+        # Publish atomically so concurrent compiles never load a half-written format
+        staging = format_dir() / f".{name}.{os.getpid()}.fmt"
+        shutil.copy(dumped, staging)
+        os.replace(staging, target)
+
+    # Drop formats built from older templates or engines
+    for old in format_dir().glob(f"{family}-{engine}-*.fmt"):
+        if old != target:
+            old.unlink(missing_ok=True)
+    return target
+
+
+def _build_in_background(family: str, engine: str) -> None:
+    key = f"{family}:{engine}"
+    with _building_lock:
+        if key in _building:
+            return
+        _building.add(key)
+
+    def run():
+        try:
+            build_format(family, engine)
+        finally:
+            with _building_lock:
+                _building.discard(key)
+
+    threading.Thread(target=run, name=f"fmt-build-{family}", daemon=True).start()
+
+
+def resolve_format(latex_content: str, engine: str = "pdflatex") -> Optional[Tuple[str, str]]:
+    """Find a ready format for a document.
+
+    Returns:
+        Tuple of (format_name: str, body: str) if the document's preamble starts with
+        a template family's preamble and that family has a current ``.fmt``; body is
+        everything after the template preamble. Otherwise None, in which case the
+        document must be compiled with its plain preamble. A missing or stale format
+        is rebuilt in the background for the next document.
+    """
+    # Tectonic has no -ini mode
+    if engine == "tectonic":
+        return None
+    match = _match_family(latex_content)
+    if match is None:
+        return None
+    family, preamble_length = match
+    name = format_name(family, engine)
+    if not (format_dir() / f"{name}.fmt").exists():
+        _build_in_background(family, engine)
+        return None
+    return name, latex_content[preamble_length:]
+
+
+def invalidate_format(name: str) -> None:
+    """Delete a format that the engine refused to load."""
+    (format_dir() / f"{name}.fmt").unlink(missing_ok=True)
+
+
+def ensure_formats(engine: str = "pdflatex") -> Dict[str, Optional[Path]]:
+    """Build the formats of all template families (build step)."""
+    return {family: build_format(family, engine) for family in TEMPLATE_FAMILIES}
+
+
+if __name__ == "__main__":
+    for family, path in ensure_formats().items():
+        print(f"{'✓' if path else '✗'} {family}: {path or 'format dump failed'}")  # noqa: T201
@@ -0,0 +1,669 @@
+"""Warm pdflatex worker pool.
+
+Each worker owns a private build directory and keeps one pdflatex process
+pre-spawned and waiting at TeX's ``**`` prompt. A compile pass only has to
+send the first input line, so process startup and kpathsea initialisation
+happen while the worker is idle instead of on the critical path of a document.
+
+Build directories live on tmpfs (``/dev/shm``) when available and persist
+across documents: template assets are symlinked in once, and the auxiliary
+files of the previous document are kept while the template stays the same (so
+a document whose cross-references match them converges in one pass). TeX's
+many small writes stay in memory; only the finished PDF is copied to the
+output directory. With ``config.LATEX_BUILD_ROOT`` on the output filesystem
+the PDF is renamed into place instead.
+"""
+
+import atexit
+import hashlib
+import itertools
+import math
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from agent.latex_formats import (
+    BEGIN_DOCUMENT,
+    format_dir,
+    invalidate_format,
+    resolve_format,
+    split_preamble,
+)
+from agent.pdf_cache import move_file
+from agent.pdf_size import format_size, recompress_pdf
+from agent.texlog import TEX_LOG_ENV, LogParser, LogReport, parse_log_file
+from agent.user_config import config
+
+try:
+    import resource
+except ImportError:                  # Windows
+    resource = None
+
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+# Template files linked into every build directory
+BUILD_ASSETS = ("resume.cls",)
+
+# First line typed at the ``**`` prompt of a primed process
+PASS_COMMAND = "\\nonstopmode\\input{document.tex}\n"
+# pdfTeX's equivalent of -draftmode, for processes that are already running
+DRAFT_MODE = "\\pdfdraftmode=1 "
+PASS_TIMEOUT = 30
+MAX_PASSES = 3
+
+# Log messages that ask for another pass (LaTeX kernel, hyperref, rerunfilecheck)
+RERUN_PATTERN = re.compile(r"Rerun to get|Label\(s\) may have changed|Please rerun LaTeX|rerun LaTeX")
+
+# Auxiliary files whose content feeds the next pass, and lines in them that don't
+AUX_FILES = ("document.aux", "document.out", "document.toc")
+INERT_AUX_LINES = ("\\relax", "\\providecommand", "\\gdef \\@abspage@last")
+
+# Draft compiles write no PDF, so the document reports its page count in the log
+PAGE_COUNT_HOOK = "\\AtEndDocument{\\clearpage\\typeout{PAGECOUNT=\\the\\numexpr\\value{page}-1\\relax}}"
+PAGE_COUNT_PATTERN = re.compile(r"^PAGECOUNT=(\d+)", re.MULTILINE)
+
+# Scheduling classes. A job is due at its submit time plus its class delay and
+# workers take the job due first, so batch work yields to interactive work but
+# ages to the front after config.LATEX_BATCH_AGING_SECONDS instead of starving.
+PRIORITY_CLASSES = ("interactive", "batch")
+# Jobs that waited at least this long for a free worker say so in their message
+QUEUE_WAIT_NOTE_SECONDS = 1.0
+# Start of the message of a job rejected by admission control
+AT_CAPACITY = "LaTeX compiler is at capacity"
+
+
+def build_root() -> Optional[str]:
+    """Parent directory for worker build directories.
+
+    Returns:
+        config.LATEX_BUILD_ROOT if set, else ``/dev/shm`` when it is a writable
+        directory, else None (the system temporary directory)
+    """
+    if config.LATEX_BUILD_ROOT:
+        return config.LATEX_BUILD_ROOT
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return str(shm)
+    return None
+
+
+def make_build_dir() -> Path:
+    """Create a build directory with the template assets linked in."""
+    build_dir = Path(tempfile.mkdtemp(prefix="latex-worker-", dir=build_root()))
+    for name in BUILD_ASSETS:
+        asset = TEMPLATES_DIR / name
+        if not asset.exists():
+            continue
+        try:
+            os.symlink(asset, build_dir / name)
+        except OSError:
+            shutil.copyfile(asset, build_dir / name)
+    return build_dir
+
+
+def priority_delay(priority: str) -> float:
+    """Scheduling delay of a priority class, in seconds."""
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown compile priority {priority!r} (expected one of {', '.join(PRIORITY_CLASSES)})")
+    return config.LATEX_BATCH_AGING_SECONDS if priority == "batch" else 0.0
+
+
+@dataclass
+class CompileResult:
+    """Outcome of compiling one document."""
+    success: bool
+    message: str
+    passes: int = 0
+    pages: Optional[int] = None
+    report: Optional[LogReport] = None
+    elapsed: float = 0.0
+    # Seconds the job waited for a free worker
+    queue_wait: float = 0.0
+
+
+def limit_resources(pid: int) -> None:
+    """Apply the configured CPU time and memory limits to a TeX process.
+
+    Primed processes sit idle at the ``**`` prompt when they get their limits,
+    so no work runs unlimited. Needs Linux (prlimit); elsewhere this is a no-op.
+    """
+    if resource is None or not hasattr(resource, "prlimit"):
+        return
+    limits = []
+    if config.LATEX_CPU_SECONDS:
+        limits.append((resource.RLIMIT_CPU, config.LATEX_CPU_SECONDS))
+    if config.LATEX_MEMORY_MB:
+        limits.append((resource.RLIMIT_AS, config.LATEX_MEMORY_MB * 1024 * 1024))
+    for kind, value in limits:
+        try:
+            resource.prlimit(pid, kind, (value, value))
+        except (OSError, ValueError):
+            # Process already gone, or a hard limit below ours
+            pass
+
+
+# ============================================================================
+# Admission control
+# ============================================================================
+
+class AdmissionControl:
+    """Process-wide bound on compiles.
+
+    At most ``max_running`` compiles run at once across all pools and at most
+    ``max_queued`` wait. Anything beyond is rejected immediately. Batch jobs
+    can't take the last ``interactive_reserve`` places, so a bulk run never
+    locks out the edits a user is waiting for.
+    """
+
+    def __init__(self, max_running: int, max_queued: int, interactive_reserve: int = 0):
+        """Allow ``max_running`` compiles at once and ``max_queued`` more waiting."""
+        self.max_running = max(1, max_running)
+        self.max_queued = max(0, max_queued)
+        # Batch work always keeps at least one place
+        self.interactive_reserve = min(max(0, interactive_reserve), self.max_running + self.max_queued - 1)
+        self._slots = threading.BoundedSemaphore(self.max_running)
+        self._lock = threading.Lock()
+        self._pending = 0           # admitted, not yet finished
+        self.admitted = 0
+        self.rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._started = 0
+
+    def admit(self, priority: str = "interactive") -> bool:
+        """Reserve a place for a new job, or return False if the queue is full."""
+        limit = self.max_running + self.max_queued
+        if priority == "batch":
+            limit -= self.interactive_reserve
+        with self._lock:
+            if self._pending >= limit:
+                self.rejected += 1
+                return False
+            self._pending += 1
+            self.admitted += 1
+            return True
+
+    def acquire(self, queued_at: float) -> float:
+        """Wait for a running slot; returns the seconds the job spent queued."""
+        self._slots.acquire()
+        wait = time.monotonic() - queued_at
+        with self._lock:
+            self._started += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+        return wait
+
+    def release(self, started: bool = True) -> None:
+        """Free the job's place (and its running slot if it got one)."""
+        if started:
+            self._slots.release()
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self) -> Dict[str, float]:
+        """Admission counters and queue wait times, for capacity planning."""
+        with self._lock:
+            return {
+                "running_limit": self.max_running,
+                "queue_limit": self.max_queued,
+                "interactive_reserve": self.interactive_reserve,
+                "in_flight": self._pending,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "avg_wait_s": self._wait_total / self._started if self._started else 0.0,
+                "max_wait_s": self._wait_max,
+            }
+
+
+def capacity_message(admission: AdmissionControl) -> str:
+    """Failure message of a job turned away by admission control."""
+    return (
+        f"{AT_CAPACITY} ({admission.max_running} running, {admission.max_queued} queued); try again shortly."
+    )
+
+
+def at_capacity(message: str) -> bool:
+    """Whether a compile failed only because admission control turned it away."""
+    return message.startswith(AT_CAPACITY)
+
+
+# ============================================================================
+# Worker
+# ============================================================================
+
+class LatexWorker:
+    """Single TeX worker with a private build directory and a primed process."""
+
+    def __init__(self, engine: str = "pdflatex", max_jobs: int = 50):
+        """Create a worker that recycles its build directory after ``max_jobs`` documents."""
+        self.engine = engine
+        self.max_jobs = max_jobs
+        self.jobs_done = 0
+        self.build_dir = make_build_dir()
+        # Preamble hash of the document whose auxiliary files are in the build directory
+        self._aux_template: Optional[str] = None
+        self._primed: Optional[subprocess.Popen] = None
+        self._prime()
+
+    @property
+    def primable(self) -> bool:
+        """Whether the engine reads its first line from a ``**`` prompt."""
+        return self.engine != "tectonic"
+
+    def _spawn(self) -> subprocess.Popen:
+        """Start an engine process that waits for its first input line."""
+        proc = self._popen()
+        limit_resources(proc.pid)
+        return proc
+
+    def _popen(self) -> subprocess.Popen:
+        if not self.primable:
+            # Tectonic takes the file on the command line and handles reruns itself
+            return subprocess.Popen(
+                [self.engine, "--keep-logs", "--keep-intermediates", "document.tex"],
+                cwd=self.build_dir,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                env={**os.environ, **TEX_LOG_ENV},
+            )
+        return subprocess.Popen(
+            # Stop at the first error instead of typesetting garbage until the timeout
+            [self.engine, "-jobname=document", "-halt-on-error"],
+            cwd=self.build_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            # Let ``&name`` on the first line find the cached preamble formats
+            env={**os.environ, **TEX_LOG_ENV, "TEXFORMATS": f"{format_dir()}{os.pathsep}"},
+        )
+
+    def _prime(self) -> None:
+        """Pre-spawn the process used by the next pass."""
+        if not self.primable:
+            return
+        try:
+            self._primed = self._spawn()
+        except OSError:
+            self._primed = None
+
+    def _discard_primed(self) -> None:
+        if self._primed is not None:
+            self._primed.kill()
+            self._primed.communicate()
+            self._primed = None
+
+    def run_pass(
+        self,
+        fmt: Optional[str] = None,
+        timeout: int = PASS_TIMEOUT,
+        draft: bool = False,
+        parser: Optional[LogParser] = None
+    ) -> Tuple[int, str]:
+        """Run one engine pass over ``document.tex`` in the build directory.
+
+        The terminal output is streamed through ``parser`` and the process is
+        killed as soon as it reports an error, so a broken document frees the
+        worker immediately instead of running into the timeout.
+
+        Args:
+            fmt: Name of a precompiled format to load instead of the engine default
+            timeout: Seconds before the pass is killed
+            draft: Typeset without writing the PDF (pdflatex only)
+            parser: Log parser fed with the terminal output
+
+        Returns:
+            Tuple of (returncode: int, terminal_output: str)
+        """
+        proc = self._primed
+        if proc is not None and proc.poll() is not None:
+            # The primed process died while idle (killed, out of memory): start a fresh one
+            proc.communicate()
+            proc = None
+        proc = proc or self._spawn()
+        # Warm up the next process while this pass runs
+        self._prime()
+
+        timed_out = threading.Event()
+
+        def expire():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, expire)
+        timer.start()
+        output = []
+        try:
+            if self.primable:
+                first_line = DRAFT_MODE + PASS_COMMAND if draft and self.engine == "pdflatex" else PASS_COMMAND
+                if fmt:
+                    first_line = f"&{fmt} {first_line}"
+                proc.stdin.write(first_line)
+                proc.stdin.close()
+            for line in proc.stdout:
+                output.append(line)
+                if parser is not None and parser.feed(line) is not None:
+                    proc.kill()
+                    break
+            proc.wait()
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(proc.args, timeout)
+        return proc.returncode, "".join(output)
+
+    def recycle(self) -> None:
+        """Throw away the build directory and primed process and start fresh."""
+        self._discard_primed()
+        shutil.rmtree(self.build_dir, ignore_errors=True)
+        self.build_dir = make_build_dir()
+        self._aux_template = None
+        self.jobs_done = 0
+        self._prime()
+
+    def close(self) -> None:
+        """Stop the primed process and remove the build directory."""
+        self._discard_primed()
+        shutil.rmtree(self.build_dir, ignore_errors=True)
+
+    def _reset_build_dir(self, template: str) -> None:
+        """Remove the previous document's files, keeping assets and, for the same template, its aux files."""
+        keep = set(BUILD_ASSETS)
+        if template == self._aux_template:
+            keep.update(AUX_FILES)
+        self._aux_template = template
+        for entry in os.scandir(self.build_dir):
+            if entry.name not in keep and not entry.is_dir(follow_symlinks=False):
+                os.unlink(entry.path)
+
+    def _read_log(self) -> str:
+        log_file = self.build_dir / "document.log"
+        return log_file.read_text(errors='replace') if log_file.exists() else ""
+
+    def _aux_state(self) -> Tuple[str, ...]:
+        """Snapshot the meaningful content of the auxiliary files."""
+        state = []
+        for name in AUX_FILES:
+            path = self.build_dir / name
+            text = path.read_text(errors='replace') if path.exists() else ""
+            state.append("\n".join(
+                line for line in text.splitlines()
+                if line.strip() and not line.startswith(INERT_AUX_LINES)
+            ))
+        return tuple(state)
+
+    def _shrink(self, pdf_file: Path) -> str:
+        """Run the optional recompression post-pass; returns the size note for the message."""
+        size = pdf_file.stat().st_size
+        if not config.PDF_RECOMPRESS:
+            return format_size(size)
+        try:
+            before, after = recompress_pdf(pdf_file)
+        except Exception:
+            # The PDF from TeX is fine as it is
+            return format_size(size)
+        return f"{format_size(before)} -> {format_size(after)} recompressed"
+
+    def compile(self, latex_content: str, output_path: str, draft: bool = False) -> CompileResult:
+        """Compile LaTeX content to PDF inside this worker's build directory.
+
+        Runs as many passes as the document needs: another pass only happens
+        when the log asks for a rerun or the auxiliary files changed, capped
+        at ``MAX_PASSES``.
+
+        Args:
+            latex_content: LaTeX source code as string
+            output_path: Desired output path for the PDF file (unused for drafts)
+            draft: Run a single pass in draft mode that only measures the page count
+
+        Returns:
+            CompileResult with success flag, message, number of passes run and,
+            for drafts, the page count
+        """
+        started = time.perf_counter()
+        if self.jobs_done >= self.max_jobs:
+            self.recycle()
+        self.jobs_done += 1
+        self._reset_build_dir(hashlib.sha256(split_preamble(latex_content)[0].encode('utf-8')).hexdigest())
+
+        if draft:
+            latex_content = latex_content.replace(BEGIN_DOCUMENT, BEGIN_DOCUMENT + PAGE_COUNT_HOOK, 1)
+
+        # Load the template's precompiled preamble when one is ready
+        resolved = resolve_format(latex_content, self.engine)
+        fmt, source = resolved if resolved else (None, latex_content)
+        (self.build_dir / "document.tex").write_text(source, encoding='utf-8')
+        # Log line numbers refer to document.tex, which lacks the preamble when a format is used
+        line_offset = latex_content.count("\n") - source.count("\n")
+
+        passes = 0
+        stream = LogParser(line_offset)
+        try:
+            # Run passes until the auxiliary files reach a fixed point
+            state = self._aux_state()
+            max_passes = MAX_PASSES if self.primable else 1
+            while passes < max_passes:
+                stream = LogParser(line_offset)
+                _, output = self.run_pass(fmt, draft=draft, parser=stream)
+                passes += 1
+                if fmt and ("Fatal format file error" in output or "can't find the format file" in output):
+                    # Unusable format: drop it and redo the document with its own preamble
+                    invalidate_format(fmt)
+                    fmt = None
+                    line_offset = 0
+                    (self.build_dir / "document.tex").write_text(latex_content, encoding='utf-8')
+                    continue
+                if stream.report.errors or draft:
+                    # Drafts only need the page count, not converged cross-references
+                    break
+                if not (self.build_dir / "document.pdf").exists():
+                    # Another pass can't produce what this one didn't
+                    break
+                new_state = self._aux_state()
+                if new_state == state and not RERUN_PATTERN.search(self._read_log()):
+                    break
+                state = new_state
+
+            pass_note = f"{passes} pass" if passes == 1 else f"{passes} passes"
+            report = parse_log_file(self.build_dir / "document.log", line_offset)
+            if not report.errors:
+                # The log of a killed pass may end before the error was flushed
+                report.errors = stream.close().errors
+            diagnostics = report.summary()
+
+            if draft:
+                page_count = PAGE_COUNT_PATTERN.search(self._read_log())
+                if page_count:
+                    pages = int(page_count.group(1))
+                    return CompileResult(
+                        True, f"Draft compiled: {pages} page(s)", passes, pages, report, time.perf_counter() - started
+                    )
+
+            # Check if PDF was generated (pdflatex can return non-zero even on success with warnings)
+            pdf_file = self.build_dir / "document.pdf"
+            if pdf_file.exists() and not draft and not report.errors:
+                size_note = self._shrink(pdf_file)
+                move_file(pdf_file, Path(output_path))
+                message = f"PDF successfully generated: {output_path} ({pass_note}, {size_note})"
+                if diagnostics:
+                    message += "\n" + diagnostics
+                return CompileResult(True, message, passes, report.pages, report, time.perf_counter() - started)
+
+            # PDF was not generated - report the first error and the other diagnostics
+            # and don't let the next document start from these aux files
+            self._aux_template = None
+            elapsed = time.perf_counter() - started
+            if report.errors:
+                message = f"LaTeX compilation error: {report.errors[0].describe()} (failed after {elapsed:.2f}s)"
+            else:
+                message = f"PDF file was not generated (failed after {elapsed:.2f}s)."
+            other = diagnostics.split("\n")[1:] if report.errors else diagnostics.split("\n")
+            message += "".join(f"\n{line}" for line in other if line)
+            return CompileResult(False, message, passes, report=report, elapsed=elapsed)
+
+        except subprocess.TimeoutExpired:
+            self._aux_template = None
+            return CompileResult(
+                False, f"LaTeX compilation timed out (>{PASS_TIMEOUT} seconds).", passes,
+                elapsed=time.perf_counter() - started
+            )
+        except Exception as e:
+            self._aux_template = None
+            return CompileResult(
+                False, f"Error during LaTeX compilation: {str(e)}", passes,
+                elapsed=time.perf_counter() - started
+            )
+
+
+# ============================================================================
+# Pool
+# ============================================================================
+
+class LatexWorkerPool:
+    """Fixed-size pool of warm TeX workers fed from a shared priority queue.
+
+    Each worker recycles its build directory after ``max_jobs_per_worker``
+    documents so stale files and long-lived processes never accumulate.
+    Jobs are served in order of their due time (see ``priority_delay``).
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_jobs_per_worker: int = 50,
+        engine: str = "pdflatex",
+        admission: Optional[AdmissionControl] = None
+    ):
+        """Start ``size`` worker threads, optionally bounded by ``admission``."""
+        self.size = max(1, size)
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self.engine = engine
+        self.admission = admission
+        # (due, sequence, job); a job of None stops a worker
+        self._jobs: queue.PriorityQueue[Tuple[float, int, Optional[Tuple[str, str, bool, float, Future]]]] = (
+            queue.PriorityQueue()
+        )
+        self._sequence = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        for i in range(self.size):
+            thread = threading.Thread(target=self._run, name=f"latex-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run(self) -> None:
+        worker = LatexWorker(self.engine, self.max_jobs_per_worker)
+        try:
+            while True:
+                _, _, job = self._jobs.get()
+                if job is None:
+                    break
+                latex_content, output_path, draft, queued_at, future = job
+                if not future.set_running_or_notify_cancel():
+                    if self.admission is not None:
+                        self.admission.release(started=False)
+                    continue
+                wait = self.admission.acquire(queued_at) if self.admission is not None else 0.0
+                try:
+                    result = worker.compile(latex_content, output_path, draft)
+                    result.queue_wait = wait
+                    if wait >= QUEUE_WAIT_NOTE_SECONDS:
+                        status, newline, diagnostics = result.message.partition("\n")
+                        result.message = f"{status} [waited {wait:.1f}s for a free worker]{newline}{diagnostics}"
+                    future.set_result(result)
+                except BaseException as e:
+                    future.set_exception(e)
+                finally:
+                    if self.admission is not None:
+                        self.admission.release()
+        finally:
+            worker.close()
+
+    def submit(
+        self,
+        latex_content: str,
+        output_path: str,
+        draft: bool = False,
+        priority: str = "interactive"
+    ) -> "Future[CompileResult]":
+        """Queue a document for compilation and return a future for its result.
+
+        When the admission queue is full the future is already resolved with a
+        failed result, so callers never wait behind a backlog they can't clear.
+        """
+        if self._closed:
+            raise RuntimeError("LaTeX worker pool is shut down")
+        queued_at = time.monotonic()
+        due = queued_at + priority_delay(priority)
+        future: Future[CompileResult] = Future()
+        if self.admission is not None and not self.admission.admit(priority):
+            future.set_result(CompileResult(False, capacity_message(self.admission)))
+            return future
+        self._jobs.put((due, next(self._sequence), (latex_content, output_path, draft, queued_at, future)))
+        return future
+
+    def compile(
+        self,
+        latex_content: str,
+        output_path: str,
+        draft: bool = False,
+        priority: str = "interactive"
+    ) -> CompileResult:
+        """Compile a document on the pool and wait for the result."""
+        return self.submit(latex_content, output_path, draft, priority).result()
+
+    def shutdown(self) -> None:
+        """Stop all workers after the queued jobs have finished."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            # Due after every queued job
+            self._jobs.put((math.inf, next(self._sequence), None))
+        for thread in self._threads:
+            thread.join()
+
+
+_pools: Dict[str, LatexWorkerPool] = {}
+_pool_lock = threading.Lock()
+_admission: Optional[AdmissionControl] = None
+
+
+def get_admission_control() -> AdmissionControl:
+    """Return the admission limits shared by every engine's pool."""
+    global _admission
+    with _pool_lock:
+        if _admission is None:
+            _admission = AdmissionControl(
+                config.LATEX_WORKERS, config.LATEX_MAX_QUEUED, config.LATEX_INTERACTIVE_RESERVED
+            )
+        return _admission
+
+
+def get_worker_pool(engine: str = "pdflatex") -> LatexWorkerPool:
+    """Return the process-wide worker pool for an engine, starting it on first use."""
+    admission = get_admission_control()
+    with _pool_lock:
+        pool = _pools.get(engine)
+        if pool is None:
+            pool = LatexWorkerPool(
+                size=config.LATEX_WORKERS,
+                max_jobs_per_worker=config.LATEX_WORKER_MAX_JOBS,
+                engine=engine,
+                admission=admission,
+            )
+            atexit.register(pool.shutdown)
+            _pools[engine] = pool
+        return pool
@@ -0,0 +1,97 @@
+"""Multi-letter TeX jobs.
+
+Cover letters built from the same template share their preamble, so many of
+them can be typeset as one document: each letter body starts on a fresh page
+behind a named PDF destination, and the combined PDF is split back into one
+file per letter at those destinations. TeX startup, format loading and font
+setup are paid once per job instead of once per letter.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import List, Sequence
+
+from PyPDF2 import PdfReader, PdfWriter
+
+from agent.latex_formats import BEGIN_DOCUMENT, split_preamble
+
+END_DOCUMENT = "\\end{document}"
+ANCHOR_PREFIX = "letter."
+
+
+def letter_anchor(index: int) -> str:
+    """Named destination marking the first page of letter ``index``."""
+    return f"{ANCHOR_PREFIX}{index}"
+
+
+def combine_documents(documents: Sequence[str]) -> str:
+    """Join complete LaTeX documents with an identical preamble into one.
+
+    Args:
+        documents: LaTeX documents built from the same template; the preamble
+            must load hyperref, which provides the page anchors
+
+    Returns:
+        One LaTeX document that typesets every letter on its own pages
+
+    Raises:
+        ValueError: If the documents do not share one preamble with hyperref
+    """
+    preamble = split_preamble(documents[0])[0]
+    if not preamble or "{hyperref}" not in preamble:
+        raise ValueError("Batched documents need a preamble that loads hyperref")
+
+    parts = [preamble, BEGIN_DOCUMENT, "\n"]
+    for index, document in enumerate(documents):
+        document_preamble, body = split_preamble(document)
+        if document_preamble != preamble:
+            raise ValueError(f"Document {index} does not share the batch preamble")
+        end = body.rfind(END_DOCUMENT)
+        content = body[len(BEGIN_DOCUMENT):end if end != -1 else len(body)]
+        # Start each letter on a fresh page and anchor it for splitting
+        parts.append(f"\\clearpage\\hypertarget{{{letter_anchor(index)}}}{{}}%\n{content}\n")
+    parts.append(END_DOCUMENT + "\n")
+    return "".join(parts)
+
+
+def split_pdf(pdf_path: str, output_paths: Sequence[str]) -> List[int]:
+    """Split a combined PDF into one file per letter.
+
+    Args:
+        pdf_path: PDF compiled from ``combine_documents``
+        output_paths: Target path of each letter, in batch order
+
+    Returns:
+        Page count of each written letter
+
+    Raises:
+        ValueError: If a letter's anchor is missing from the PDF
+    """
+    reader = PdfReader(pdf_path)
+    destinations = reader.named_destinations
+    starts = []
+    for index in range(len(output_paths)):
+        destination = destinations.get(letter_anchor(index))
+        if destination is None:
+            raise ValueError(f"Combined PDF has no anchor for letter {index}")
+        starts.append(reader.get_destination_page_number(destination))
+    ends = starts[1:] + [len(reader.pages)]
+
+    page_counts = []
+    for output_path, start, end in zip(output_paths, starts, ends):
+        writer = PdfWriter()
+        for page in reader.pages[start:end]:
+            writer.add_page(page)
+        # Stage next to the target and rename, like every other PDF we write
+        target = Path(output_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(staging, "wb") as f:
+                writer.write(f)
+            os.replace(staging, target)
+        finally:
+            staging.unlink(missing_ok=True)
+        page_counts.append(end - start)
+    return page_counts
@@ -0,0 +1,197 @@
+"""Pre-compile LaTeX linter.
+
+A single regex-driven scan over a generated document that catches the
+mistakes behind most failed compiles before a TeX process is started:
+unbalanced braces, unescaped ``&``/``#``/``_``/``^``/``%`` in text,
+unclosed math, leftover ``{{PLACEHOLDER}}`` tokens and Unicode characters the
+pdflatex + inputenc/T1 setup of the templates cannot typeset. Each issue
+carries the line and column in the document it was found in.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{[A-Z][A-Z0-9_]*\}\}')
+TOKEN_PATTERN = re.compile(r'\\(?:[a-zA-Z@]+\*?|.)|[{}%&#_^$\n]', re.DOTALL)
+ENVIRONMENT_PATTERN = re.compile(r'\s*\{([^}]*)\}')
+
+# Commands whose first argument is a URL, label or file name, not text
+RAW_ARGUMENT_COMMANDS = {
+    "\\href", "\\url", "\\label", "\\ref", "\\pageref", "\\cite",
+    "\\includegraphics", "\\input", "\\include", "\\usepackage", "\\documentclass",
+}
+# Environments in which & separates cells
+ALIGNMENT_ENVIRONMENTS = {
+    "tabular", "tabular*", "tabularx", "array", "align", "align*", "alignat",
+    "alignat*", "eqnarray", "eqnarray*", "matrix", "pmatrix", "bmatrix", "cases",
+}
+
+# Beyond ASCII and Latin-1/Latin Extended-A (T1), the typographic characters utf8.def maps
+TYPESETTABLE_EXTRA = set("‐‑‒–—―‖‘’‚‛“”„‟†‡•…‰′″‹›€™−←↑→↓√∞")
+
+MAX_ISSUES = 10
+
+
+@dataclass
+class LintIssue:
+    """A problem that would make TeX fail or drop text."""
+    line: int
+    column: int
+    message: str
+    snippet: str = ""
+
+    def describe(self) -> str:
+        """Format the issue as ``line L:C: message: `snippet```."""
+        text = f"line {self.line}:{self.column}: {self.message}"
+        if self.snippet:
+            text += f": `{self.snippet}`"
+        return text
+
+
+def _typesettable(char: str) -> bool:
+    code = ord(char)
+    return (
+        0x20 <= code < 0x7F
+        or char in "\t\n\r"
+        or 0xA0 <= code <= 0x17F
+        or char in TYPESETTABLE_EXTRA
+    )
+
+
+class _Document:
+    """Maps offsets in a document to (line, column) and context snippets."""
+
+    def __init__(self, latex_content: str):
+        self.text = latex_content
+        self.line_starts = [0] + [m.end() for m in re.finditer(r'\n', latex_content)]
+
+    def locate(self, offset: int) -> Tuple[int, int]:
+        # Binary search for the line containing offset
+        lo, hi = 0, len(self.line_starts) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.line_starts[mid] <= offset:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo + 1, offset - self.line_starts[lo] + 1
+
+    def issue(self, offset: int, message: str) -> LintIssue:
+        line, column = self.locate(offset)
+        start = max(self.line_starts[line - 1], offset - 30)
+        end = self.text.find("\n", offset)
+        end = min(end if end != -1 else len(self.text), offset + 30)
+        return LintIssue(line, column, message, self.text[start:end].strip())
+
+
+def lint_latex(latex_content: str) -> List[LintIssue]:
+    """Check a generated LaTeX document for problems that would break the compile.
+
+    Args:
+        latex_content: Complete LaTeX document
+
+    Returns:
+        Issues in document order (at most ``MAX_ISSUES``); empty if the document is clean.
+    """
+    document = _Document(latex_content)
+    issues: List[LintIssue] = []
+
+    for match in PLACEHOLDER_PATTERN.finditer(latex_content):
+        issues.append(document.issue(match.start(), f"unfilled placeholder {match.group()}"))
+
+    for offset, char in enumerate(latex_content):
+        if not _typesettable(char):
+            issues.append(document.issue(
+                offset, f"character {char!r} (U+{ord(char):04X}) cannot be typeset with pdflatex"
+            ))
+
+    issues += _scan(document)
+    issues.sort(key=lambda issue: (issue.line, issue.column))
+    return issues[:MAX_ISSUES]
+
+
+def _scan(document: _Document) -> List[LintIssue]:
+    """Brace, special character and math mode checks in one tokenizing pass."""
+    text = document.text
+    body_start = text.find("\\begin{document}")
+    issues: List[LintIssue] = []
+    braces: List[int] = []              # offsets of open braces
+    raw_depth = None                    # brace depth of a URL/label argument being skipped
+    expect_raw = False
+    environments: List[str] = []
+    math_start = None
+    line_start = 0
+    skip_until = -1                     # end of the comment being skipped
+
+    for match in TOKEN_PATTERN.finditer(text):
+        token, offset = match.group(), match.start()
+        if offset < skip_until:
+            continue
+        in_body = body_start != -1 and offset > body_start
+
+        if token == "\n":
+            line_start = offset + 1
+            continue
+        if token == "%":
+            before = text[line_start:offset]
+            # "80%" in content silently comments out the rest of the line
+            if in_body and raw_depth is None and before.strip() and not before[-1].isspace():
+                issues.append(document.issue(offset, "unescaped % (comments out the rest of the line; use \\%)"))
+            end = text.find("\n", offset)
+            skip_until = end if end != -1 else len(text)
+            continue
+        if token == "{":
+            braces.append(offset)
+            if expect_raw:
+                raw_depth, expect_raw = len(braces), False
+            continue
+        if token == "}":
+            if not braces:
+                issues.append(document.issue(offset, "unbalanced } without matching {"))
+                continue
+            if raw_depth == len(braces):
+                raw_depth = None
+            braces.pop()
+            continue
+        if token.startswith("\\"):
+            if token in RAW_ARGUMENT_COMMANDS:
+                expect_raw = True
+            elif token in ("\\begin", "\\end"):
+                environment = ENVIRONMENT_PATTERN.match(text, match.end())
+                if environment:
+                    name = environment.group(1).strip()
+                    if token == "\\begin":
+                        environments.append(name)
+                    elif name in environments:
+                        del environments[len(environments) - 1 - environments[::-1].index(name)]
+            elif token in ("\\(", "\\["):
+                math_start = offset
+            elif token in ("\\)", "\\]"):
+                math_start = None
+            continue
+
+        # Special characters in text
+        if raw_depth is not None or not in_body:
+            continue
+        if token == "$":
+            math_start = None if math_start is not None else offset
+        elif token == "&":
+            if not ALIGNMENT_ENVIRONMENTS.intersection(environments):
+                issues.append(document.issue(offset, "unescaped & outside a table (use \\&)"))
+        elif token == "#":
+            issues.append(document.issue(offset, "unescaped # (use \\#)"))
+        elif token in "_^" and math_start is None:
+            issues.append(document.issue(offset, f"unescaped {token} outside math mode (use \\{token})"))
+
+    for offset in braces:
+        issues.append(document.issue(offset, "unbalanced { is never closed"))
+    if math_start is not None:
+        issues.append(document.issue(math_start, "math mode is never closed"))
+    return issues
+
+
+def format_lint_issues(issues: List[LintIssue]) -> str:
+    """First issue as the status line, the rest on following lines."""
+    head, *rest = issues
+    return "\n".join([f"LaTeX lint error: {head.describe()}"] + [issue.describe() for issue in rest])
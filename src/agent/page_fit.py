@@ -0,0 +1,150 @@
+"""Page-count checks and layout tightening for generated documents.
+
+When a compiled document runs over its page budget, the tailoring code walks
+through ``TIGHTENING_LEVELS`` (each one tighter than the last) using cheap
+draft compiles that only report the page count, then builds the final PDF
+with the first level that fits. Tightening only appends to the template
+preamble and scales the spacing in the body, so the precompiled preamble
+formats stay usable.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List
+
+from PyPDF2 import PdfReader
+
+from agent.latex_formats import split_preamble
+
+GEOMETRY_PATTERN = re.compile(r'\\usepackage\s*\[([^\]]*)\]\s*\{geometry\}')
+FONT_SIZE_PATTERN = re.compile(r'\\documentclass\s*\[[^\]]*?(\d+(?:\.\d+)?)pt[^\]]*\]')
+LENGTH_PATTERN = re.compile(r'^\s*(\d*\.?\d+)\s*([a-z]{2})\s*$')
+
+# Vertical space the templates write out explicitly: \vspace{..}, \\[..], list separations
+SPACING_PATTERN = re.compile(
+    r'(\\vspace\*?\{\s*|\\\\\[\s*|\b(?:itemsep|topsep|parsep)\s*=\s*)(\d*\.?\d+)(\s*(?:pt|em|ex|cm|mm|in))'
+)
+
+MARGIN_KEYS = ("left", "right", "top", "bottom")
+
+
+@dataclass(frozen=True)
+class Tightening:
+    """One step of layout tightening, as scale factors on the template defaults."""
+    space_scale: float = 1.0
+    margin_scale: float = 1.0
+    font_scale: float = 1.0
+
+    def describe(self, latex_content: str = "") -> str:
+        """Summarise the level, with the resulting font size if ``latex_content`` is given."""
+        parts = []
+        if self.space_scale != 1.0:
+            parts.append(f"spacing x{self.space_scale:g}")
+        if self.margin_scale != 1.0:
+            parts.append(f"margins x{self.margin_scale:g}")
+        if self.font_scale != 1.0:
+            size = base_font_size(latex_content) * self.font_scale if latex_content else None
+            parts.append(f"font {size:.3g}pt" if size else f"font x{self.font_scale:g}")
+        return ", ".join(parts) or "none"
+
+
+# Progressively tighter layouts, tried in order (bounded number of draft compiles)
+TIGHTENING_LEVELS: List[Tightening] = [
+    Tightening(space_scale=0.5),
+    Tightening(space_scale=0.5, margin_scale=0.75),
+    Tightening(space_scale=0.5, margin_scale=0.75, font_scale=0.95),
+    Tightening(space_scale=0.25, margin_scale=0.6, font_scale=0.9),
+]
+
+
+@dataclass
+class PageFit:
+    """Final page count of a document and the tightening applied to reach it."""
+    pages: int
+    max_pages: int
+    adjustment: str = "none"
+    # Log diagnostics of the final compile (overfull boxes, font substitutions), one per line
+    diagnostics: str = ""
+
+    @property
+    def fits(self) -> bool:
+        """Whether the document is within its page budget."""
+        return self.pages <= self.max_pages
+
+    def describe(self) -> str:
+        """Describe the page count and tightening for tool replies."""
+        note = f"{self.pages} page" if self.pages == 1 else f"{self.pages} pages"
+        if self.adjustment != "none":
+            note += f", tightened: {self.adjustment}"
+        if not self.fits:
+            note += f"; still over the {self.max_pages}-page limit, shorten the content"
+        return note
+
+
+def count_pages(pdf_path: str) -> int:
+    """Count the pages of a PDF file."""
+    return len(PdfReader(pdf_path).pages)
+
+
+def base_font_size(latex_content: str) -> float:
+    r"""Body font size from the ``\documentclass`` options (LaTeX default 10pt)."""
+    match = FONT_SIZE_PATTERN.search(latex_content)
+    return float(match.group(1)) if match else 10.0
+
+
+def _geometry_margins(preamble: str) -> dict:
+    r"""Margins passed to ``\usepackage[...]{geometry}``, as (value, unit) per side."""
+    match = GEOMETRY_PATTERN.search(preamble)
+    if not match:
+        return {}
+    margins = {}
+    for option in match.group(1).split(","):
+        key, _, value = option.partition("=")
+        key = key.strip()
+        length = LENGTH_PATTERN.match(value)
+        if key == "margin" and length:
+            margins.update({side: (float(length.group(1)), length.group(2)) for side in MARGIN_KEYS})
+        elif key in MARGIN_KEYS and length:
+            margins[key] = (float(length.group(1)), length.group(2))
+    return margins
+
+
+def _scale_spacing(body: str, scale: float) -> str:
+    return SPACING_PATTERN.sub(
+        lambda m: f"{m.group(1)}{float(m.group(2)) * scale:.3g}{m.group(3)}", body
+    )
+
+
+def tighten_latex(latex_content: str, level: Tightening) -> str:
+    """Apply a tightening level to a document.
+
+    Layout settings are appended after the original preamble, so a document
+    built from a template still matches that template's precompiled format.
+
+    Args:
+        latex_content: Complete LaTeX document
+        level: Scale factors for spacing, margins and body font size
+
+    Returns:
+        The tightened LaTeX document
+    """
+    preamble, body = split_preamble(latex_content)
+    if not preamble:
+        return latex_content
+
+    settings = []
+    if level.space_scale != 1.0:
+        body = _scale_spacing(body, level.space_scale)
+        settings.append(f"\\AtBeginDocument{{\\setlength{{\\parskip}}{{{level.space_scale:g}\\parskip}}}}")
+    if level.margin_scale != 1.0:
+        margins = _geometry_margins(preamble)
+        if margins:
+            options = ",".join(
+                f"{side}={value * level.margin_scale:.3g}{unit}" for side, (value, unit) in margins.items()
+            )
+            settings.append(f"\\geometry{{{options}}}")
+    if level.font_scale != 1.0:
+        size = base_font_size(latex_content) * level.font_scale
+        settings.append(f"\\AtBeginDocument{{\\fontsize{{{size:.3g}}}{{{size * 1.2:.3g}}}\\selectfont}}")
+
+    return preamble + "".join(line + "\n" for line in settings) + body
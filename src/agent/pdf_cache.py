@@ -0,0 +1,173 @@
+"""Content-addressed cache of compiled PDFs.
+
+Entries are keyed on a hash of the final LaTeX source, ``resume.cls``, the
+engine version and the PDF output settings (profile and recompression), so an identical tool call is served without invoking TeX.
+Hits are copied to the output path (never linked, so editing an output can't
+change the cached entry), and the cache is kept under a size budget by
+evicting the least recently used entries.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from agent.latex_formats import TEMPLATES_DIR
+from agent.toolchain import engine_version, read_template
+from agent.user_config import config
+
+
+def place_file(src: Path, dst: Path) -> None:
+    """Put a copy of ``src`` at ``dst`` atomically.
+
+    The copy is staged next to ``dst`` and renamed over it, so readers never
+    see a partial PDF.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    staging = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        shutil.copyfile(src, staging)
+        os.replace(staging, dst)
+    finally:
+        staging.unlink(missing_ok=True)
+
+
+def move_file(src: Path, dst: Path) -> None:
+    """Move ``src`` to ``dst`` atomically.
+
+    A plain rename when both are on one filesystem. Otherwise the file is
+    copied with ``place_file`` and ``src`` removed. That is always the case
+    for the default tmpfs build directories, whose output is on disk.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(src, dst)
+    except OSError:
+        place_file(src, dst)
+        src.unlink(missing_ok=True)
+
+
+class PdfCache:
+    """On-disk LRU cache of PDFs keyed on the rendered LaTeX source."""
+
+    def __init__(self, directory: Path, max_bytes: int):
+        """Use ``directory`` for entries, evicting beyond ``max_bytes``."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(p.stat().st_size for p in self.directory.glob("*.pdf"))
+
+    def key_for(self, latex_content: str, engine: str = "pdflatex", version: Optional[str] = None) -> str:
+        """Hash of everything that determines the compiled PDF.
+
+        ``version`` overrides the local engine version, for PDFs built elsewhere
+        (the compile service). The output profile and recompression setting are
+        part of the key, so changing them never serves a PDF built with the old ones.
+        """
+        digest = hashlib.sha256()
+        digest.update(latex_content.encode('utf-8'))
+        digest.update(read_template(TEMPLATES_DIR / "resume.cls").encode('utf-8'))
+        digest.update(engine.encode('utf-8'))
+        digest.update((engine_version(engine) if version is None else version).encode('utf-8'))
+        digest.update(f"{config.PDF_PROFILE}\0{bool(config.PDF_RECOMPRESS)}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    def fetch(self, key: str, output_path: str, count: bool = True) -> bool:
+        """Place the cached PDF for ``key`` at ``output_path``.
+
+        Args:
+            key: Cache key from ``key_for``
+            output_path: Where to put the PDF
+            count: Record the lookup in the hit/miss counters; callers that
+                count it themselves (see ``record_lookup``) pass False
+
+        Returns:
+            True on a cache hit, False on a miss.
+        """
+        entry = self._path(key)
+        try:
+            place_file(entry, Path(output_path))
+            # Mark as recently used for LRU eviction
+            os.utime(entry)
+        except FileNotFoundError:
+            if count:
+                self.record_lookup(hit=False)
+            return False
+        if count:
+            self.record_lookup(hit=True)
+        return True
+
+    def record_lookup(self, hit: bool) -> None:
+        """Count one request as a cache hit or miss."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def store(self, key: str, pdf_path: str) -> None:
+        """Add a freshly compiled PDF to the cache and evict if over budget."""
+        entry = self._path(key)
+        if entry.exists():
+            return
+        # A copy: the output belongs to the user, who may edit it in place
+        place_file(Path(pdf_path), entry)
+        with self._lock:
+            self._size += entry.stat().st_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits its budget."""
+        entries = []
+        for path in self.directory.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size_bytes": self._size,
+            }
+
+
+_cache: Optional[PdfCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_pdf_cache() -> PdfCache:
+    """Return the process-wide PDF cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PdfCache(
+                Path(config.CACHE_DIR) / "pdf",
+                max_bytes=config.PDF_CACHE_MAX_MB * 1024 * 1024,
+            )
+        return _cache
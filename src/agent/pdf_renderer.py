@@ -0,0 +1,145 @@
+"""Pure-Python cover letter renderer.
+
+Lays out a cover letter with fpdf and the bundled Calibri fonts, mirroring the
+geometry and spacing of ``templates/cover_letter_{lang}.tex``. Carlito, the
+font the LaTeX template uses, is metric-compatible with Calibri, so line
+breaks come out close to the TeX build. Rendering takes milliseconds and needs
+no TeX installation, which makes it the engine for fast previews, large batches
+and machines without TeX.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Tuple
+
+from fpdf import FPDF
+
+from agent.user_config import config
+
+if TYPE_CHECKING:
+    from agent.tools import CoverLetterInput
+
+
+# Shipped with the package (see package-data in pyproject.toml)
+FONT_DIR = Path(__file__).parent / "fonts"
+
+PT_PER_IN = 72.0
+PT_PER_CM = 72.0 / 2.54
+
+# Geometry of cover_letter_*.tex (a4paper, 11pt, left/right 0.75in, top/bottom 0.6in)
+PAGE_FORMAT = "A4"
+MARGIN_X = 0.75 * PT_PER_IN
+MARGIN_Y = 0.6 * PT_PER_IN
+FONT_SIZE = 11.0
+LINE_HEIGHT = 13.6          # \baselineskip at 11pt
+NAME_SIZE = 14.4            # \Large at 11pt
+NAME_LINE_HEIGHT = 18.0
+PARSKIP = 6.0
+BULLET_INDENT = 0.2 * PT_PER_IN
+LABEL_SEP = 5.5             # enumitem default labelsep (0.5em)
+ITEM_SEP = 4.0
+TOP_SEP = 2.0
+LINK_COLOR = (0, 0, 255)
+
+# Text the template hardcodes per language
+TEMPLATE_TEXT = {
+    "en": {"subject": "Subject", "sign_off": "Warm regards,"},
+    "de": {"subject": "Betreff", "sign_off": "Mit freundlichen Grüßen,"},
+}
+
+
+def _new_document() -> FPDF:
+    pdf = FPDF(orientation='P', unit='pt', format=PAGE_FORMAT)
+    pdf.set_margins(MARGIN_X, MARGIN_Y, MARGIN_X)
+    pdf.set_auto_page_break(True, margin=MARGIN_Y)
+    pdf.add_font('Calibri', '', str(FONT_DIR / "calibri.ttf"), uni=True)
+    pdf.add_font('Calibri', 'B', str(FONT_DIR / "calibri_bold.ttf"), uni=True)
+    # The bundled metric pickles store a relative TTF path; subsetting needs the real one
+    pdf.fonts['calibri']['ttffile'] = str(FONT_DIR / "calibri.ttf")
+    pdf.fonts['calibriB']['ttffile'] = str(FONT_DIR / "calibri_bold.ttf")
+    return pdf
+
+
+def _centered_segments(pdf: FPDF, segments: List[Tuple[str, str]]) -> None:
+    """Write one centered line made of (text, link) segments."""
+    total = sum(pdf.get_string_width(text) for text, _ in segments)
+    pdf.set_x(MARGIN_X + (pdf.w - 2 * MARGIN_X - total) / 2)
+    for text, link in segments:
+        if link:
+            pdf.set_text_color(*LINK_COLOR)
+        pdf.cell(pdf.get_string_width(text), LINE_HEIGHT, text, link=link)
+        pdf.set_text_color(0, 0, 0)
+    pdf.ln(LINE_HEIGHT)
+
+
+def _paragraph(pdf: FPDF, text: str, space_before: float = 0.0, bold: bool = False) -> None:
+    pdf.ln(space_before + PARSKIP)
+    pdf.set_font('Calibri', 'B' if bold else '', FONT_SIZE)
+    pdf.multi_cell(0, LINE_HEIGHT, text, align='J')
+
+
+def _bullets(pdf: FPDF, bullets: List[str]) -> None:
+    pdf.set_font('Calibri', '', FONT_SIZE)
+    bullet_width = pdf.get_string_width("•")
+    for i, bullet in enumerate(bullets):
+        pdf.ln(TOP_SEP + PARSKIP if i == 0 else ITEM_SEP)
+        y = pdf.get_y()
+        pdf.set_xy(MARGIN_X + BULLET_INDENT - LABEL_SEP - bullet_width, y)
+        pdf.cell(bullet_width, LINE_HEIGHT, "•")
+        pdf.set_left_margin(MARGIN_X + BULLET_INDENT)
+        pdf.set_xy(MARGIN_X + BULLET_INDENT, y)
+        pdf.multi_cell(0, LINE_HEIGHT, bullet, align='J')
+        pdf.set_left_margin(MARGIN_X)
+    pdf.ln(TOP_SEP)
+
+
+def render_cover_letter(data: "CoverLetterInput", output_path: str, lang: str = "en", date: str = "") -> int:
+    """Render a cover letter to PDF without TeX.
+
+    Args:
+        data: Cover letter content, already in the target language (plain text, not LaTeX)
+        output_path: Desired output path for the PDF file
+        lang: Language code selecting the template's fixed text ('en' or 'de')
+        date: Formatted date line
+
+    Returns:
+        Number of pages written.
+    """
+    text = TEMPLATE_TEXT.get(lang, TEMPLATE_TEXT["en"])
+    pdf = _new_document()
+    pdf.add_page()
+
+    # Header with contact information
+    pdf.set_font('Calibri', 'B', NAME_SIZE)
+    pdf.cell(0, NAME_LINE_HEIGHT, config.FULL_NAME, align='C', ln=1)
+    pdf.ln(0.1 * PT_PER_CM)
+    pdf.set_font('Calibri', '', FONT_SIZE)
+    pdf.cell(0, LINE_HEIGHT, f"{config.LOCATION} — {config.PHONE}", align='C', ln=1)
+    pdf.ln(0.03 * PT_PER_CM)
+    _centered_segments(pdf, [
+        (config.EMAIL, f"mailto:{config.EMAIL}"), (" — ", ""),
+        ("LinkedIn", config.LINKEDIN_URL), (" — ", ""),
+        ("GitHub", config.GITHUB_URL),
+    ])
+
+    _paragraph(pdf, date, space_before=0.3 * PT_PER_CM)
+    _paragraph(pdf, f"{data.company_name}\n{data.company_address}", space_before=0.1 * PT_PER_CM)
+    _paragraph(pdf, f"{text['subject']}: {data.subject}", space_before=0.15 * PT_PER_CM, bold=True)
+    _paragraph(pdf, data.salutation, space_before=0.15 * PT_PER_CM)
+    _paragraph(pdf, data.intro_paragraph, space_before=0.1 * PT_PER_CM)
+    _bullets(pdf, data.bullet_sections)
+    _paragraph(pdf, data.closing_paragraph, space_before=0.1 * PT_PER_CM)
+    _paragraph(pdf, text['sign_off'], space_before=0.15 * PT_PER_CM)
+    _paragraph(pdf, config.FULL_NAME, space_before=0.2 * PT_PER_CM)
+
+    # Write next to the target and rename, like the TeX path
+    target = Path(output_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        pdf.output(str(staging), 'F')
+        os.replace(staging, target)
+    finally:
+        staging.unlink(missing_ok=True)
+    return pdf.page_no()
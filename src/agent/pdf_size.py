@@ -0,0 +1,87 @@
+"""PDF output size profiles.
+
+The ``compact`` profile asks pdfTeX for maximum stream and object-stream
+compression and drops metadata the portals never read: the PTEX.* keys, the
+creation date, the trailer ID and hyperref's creator/producer strings. Fonts
+are subset by pdfTeX in every profile, and ToUnicode maps are kept so ATS
+parsers can still extract the text. The settings are appended after the
+template preamble, so the precompiled formats stay usable.
+
+``recompress_pdf`` is an optional PyPDF2 post-pass that recompresses page
+content streams and keeps the result only if it is smaller.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Tuple
+
+from PyPDF2 import PdfReader, PdfWriter
+
+from agent.latex_formats import split_preamble
+
+PDF_PROFILES = ("standard", "compact")
+
+# Guarded with \ifdefined so engines without these primitives ignore them
+COMPACT_SETTINGS = (
+    "\\ifdefined\\pdfobjcompresslevel\\pdfcompresslevel=9 \\pdfobjcompresslevel=2 \\fi\n"
+    "\\ifdefined\\pdfsuppressptexinfo\\pdfsuppressptexinfo=-1 \\fi\n"
+    "\\ifdefined\\pdfinfoomitdate\\pdfinfoomitdate=1 \\fi\n"
+    "\\ifdefined\\pdftrailerid\\pdftrailerid{}\\fi\n"
+    "\\ifdefined\\pdfomitcharset\\pdfomitcharset=1 \\fi\n"
+    "\\ifdefined\\hypersetup\\hypersetup{pdfcreator={},pdfproducer={}}\\fi\n"
+)
+
+
+def apply_output_profile(latex_content: str, profile: str = "standard") -> str:
+    """Add the settings of an output profile to a document.
+
+    Args:
+        latex_content: Complete LaTeX document
+        profile: One of ``PDF_PROFILES``
+
+    Returns:
+        The document with the profile's settings after its preamble
+    """
+    if profile not in PDF_PROFILES:
+        raise ValueError(f"Unknown PDF profile {profile!r} (expected one of {', '.join(PDF_PROFILES)})")
+    if profile == "standard":
+        return latex_content
+    preamble, body = split_preamble(latex_content)
+    if not preamble:
+        return latex_content
+    return preamble + COMPACT_SETTINGS + body
+
+
+def recompress_pdf(pdf_path: Path) -> Tuple[int, int]:
+    """Recompress the page content streams of a PDF in place.
+
+    The rewritten file replaces the original only if it is smaller (PyPDF2
+    writes no object streams, so pdfTeX's own output can win).
+
+    Returns:
+        Tuple of (bytes_before: int, bytes_after: int)
+    """
+    before = pdf_path.stat().st_size
+    writer = PdfWriter()
+    # Cloning the document root keeps links, named destinations and outlines
+    writer.clone_reader_document_root(PdfReader(pdf_path))
+    for page in writer.pages:
+        page.compress_content_streams()
+
+    staging = pdf_path.with_name(f".{pdf_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(staging, "wb") as f:
+            writer.write(f)
+        after = staging.stat().st_size
+        if after < before:
+            os.replace(staging, pdf_path)
+            return before, after
+    finally:
+        staging.unlink(missing_ok=True)
+    return before, before
+
+
+def format_size(size: int) -> str:
+    """Human-readable byte count."""
+    return f"{size / 1024:.1f} KB" if size < 1024 * 1024 else f"{size / (1024 * 1024):.2f} MB"
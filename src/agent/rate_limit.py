@@ -0,0 +1,166 @@
+"""Rate limiting and retries for outbound translation requests.
+
+``TokenBucket`` allows ``rate`` requests per second with bursts of up to
+``capacity``; a rate of 0 means unlimited. Its state (tokens left and when they were counted) lives in a
+small file under an exclusive ``flock``, so every thread and every process on
+the machine draws from the same bucket and batch runs can't get the IP
+throttled. Without ``fcntl`` (Windows) the bucket is shared by threads only.
+
+``retry_with_backoff`` retries throttled and server-side failures with full
+jitter, so workers that were throttled together don't retry in lockstep.
+"""
+
+import os
+import random
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from agent.user_config import config
+
+try:
+    import fcntl
+except ImportError:                  # Windows
+    fcntl = None
+
+
+T = TypeVar("T")
+
+# (tokens, timestamp) as stored in the bucket file
+STATE = struct.Struct("<dd")
+# Upper bound of one backoff sleep, in seconds
+MAX_BACKOFF = 30.0
+
+
+class TokenBucket:
+    """Token bucket shared by threads and, through a locked state file, by processes."""
+
+    def __init__(self, rate: float, capacity: float, path: Optional[Path] = None):
+        """Allow ``rate`` acquisitions per second (0 = unlimited), bursts of ``capacity``; share state via ``path``."""
+        if rate < 0:
+            raise ValueError(f"Token bucket rate must be >= 0, got {rate}")
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.path = path
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._state: Tuple[float, float] = (self.capacity, time.time())
+        self.acquired = 0
+        self.throttled = 0          # acquisitions that had to wait
+        self.waited = 0.0
+        if path is not None and fcntl is not None and rate > 0:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def _read(self) -> Tuple[float, float]:
+        if self._fd is None:
+            return self._state
+        data = os.pread(self._fd, STATE.size, 0)
+        return STATE.unpack(data) if len(data) == STATE.size else (self.capacity, time.time())
+
+    def _write(self, tokens: float, stamp: float) -> None:
+        if self._fd is None:
+            self._state = (tokens, stamp)
+        else:
+            os.pwrite(self._fd, STATE.pack(tokens, stamp), 0)
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until one is."""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            if self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                tokens, stamp = self._read()
+                now = time.time()
+                tokens = min(self.capacity, tokens + max(0.0, now - stamp) * self.rate)
+                wait = 0.0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / self.rate
+                self._write(tokens, now)
+                return wait
+            finally:
+                if self._fd is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def acquire(self, deadline: Optional[float] = None) -> None:
+        """Block until a request may be sent.
+
+        Raises:
+            TimeoutError: If the token would only come after ``deadline``
+                (``time.monotonic()``), i.e. after the caller stopped waiting
+        """
+        started = time.perf_counter()
+        wait = self._take()
+        if wait > 0:
+            while wait > 0:
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    raise TimeoutError("Rate limit wait would outlast the caller's deadline")
+                time.sleep(wait)
+                wait = self._take()
+            with self._lock:
+                self.throttled += 1
+                self.waited += time.perf_counter() - started
+        with self._lock:
+            self.acquired += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Acquisition and throttling counters of this process."""
+        with self._lock:
+            return {
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "waited_s": self.waited,
+                "rate_per_s": self.rate,
+                "burst": self.capacity,
+            }
+
+
+def retry_with_backoff(
+    call: Callable[[], T],
+    retryable: Tuple[Type[BaseException], ...],
+    retries: int,
+    base_delay: float,
+    deadline: Optional[float] = None
+) -> T:
+    """Run ``call``, retrying ``retryable`` errors up to ``retries`` times.
+
+    Attempt n sleeps a uniformly random time up to ``base_delay * 2**n``
+    (capped at ``MAX_BACKOFF``) first. The last error is re-raised, also as
+    soon as the next attempt would start after ``deadline``
+    (``time.monotonic()``), so nobody retries for a caller that has given up.
+    """
+    attempt = 0
+    while True:
+        try:
+            return call()
+        except retryable:
+            if attempt >= retries:
+                raise
+            delay = random.uniform(0, min(MAX_BACKOFF, base_delay * 2 ** attempt))
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise
+            time.sleep(delay)
+            attempt += 1
+
+
+_limiter: Optional[TokenBucket] = None
+_limiter_lock = threading.Lock()
+
+
+def get_translation_limiter() -> TokenBucket:
+    """Return the token bucket that paces translation requests on this machine."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = TokenBucket(
+                config.TRANSLATION_RATE_PER_SECOND,
+                config.TRANSLATION_BURST,
+                Path(config.CACHE_DIR) / "translation_rate.bucket",
+            )
+        return _limiter
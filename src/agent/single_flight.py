@@ -0,0 +1,166 @@
+"""Single-flight coalescing of identical compiles.
+
+Parallel tool calls and double submissions often compile the same LaTeX at the
+same moment. Compiles are keyed on the PDF cache key (a hash of the source,
+``resume.cls`` and the engine version), and only one compile per key runs:
+
+* within a process, later callers attach to the running compile's future;
+* across processes, the compiling process holds an exclusive ``flock`` on
+  ``<CACHE_DIR>/locks/<key>.lock``. Other processes wait for the lock and then
+  take the PDF from the shared cache (or compile it themselves if the first
+  compile failed).
+
+Without ``fcntl`` (Windows) only the in-process coalescing applies.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from agent.user_config import config
+
+try:
+    import fcntl
+except ImportError:                  # Windows
+    fcntl = None
+
+
+# Threads that wait for compiles running in other processes
+MAX_REMOTE_WAITERS = 8
+
+
+class SingleFlight:
+    """Registry of compiles in flight, in this process and (via file locks) in others."""
+
+    def __init__(self, lock_dir: Path):
+        """Keep cross-process lock files in ``lock_dir``."""
+        self.lock_dir = lock_dir
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._flights: Dict[str, Future] = {}
+        self._waiters = ThreadPoolExecutor(max_workers=MAX_REMOTE_WAITERS, thread_name_prefix="single-flight")
+        self.leaders = 0            # compiles started by this process
+        self.coalesced = 0          # callers that joined a compile running in this process
+        self.remote_waits = 0       # compiles found running in another process
+        self.remote_hits = 0        # ... whose PDF could then be reused
+
+    def join(self, key: str) -> Tuple[bool, Future]:
+        """Register interest in compiling ``key``.
+
+        Returns:
+            Tuple of (leader: bool, flight: Future). The leader must eventually
+            call ``land``; everyone else just waits on the future.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return False, flight
+            flight = Future()
+            self._flights[key] = flight
+            self.leaders += 1
+            return True, flight
+
+    def land(self, key: str, result: object) -> None:
+        """Publish the result of a flight to all its callers."""
+        with self._lock:
+            flight = self._flights.pop(key)
+        flight.set_result(result)
+
+    def fail(self, key: str, flight: Future, error: BaseException) -> None:
+        """Resolve ``flight`` with an error, unless it has landed already."""
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        try:
+            flight.set_exception(error)
+        except InvalidStateError:
+            pass
+
+    def _lock_path(self, key: str) -> Path:
+        return self.lock_dir / f"{key}.lock"
+
+    def _acquire(self, key: str, blocking: bool) -> Optional[int]:
+        """Take the cross-process lock of ``key``.
+
+        Returns:
+            A file descriptor to pass to ``release``, -1 if file locks are
+            unavailable, or None if another process holds the lock (non-blocking).
+        """
+        if fcntl is None:
+            return -1
+        path = self._lock_path(key)
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                os.close(fd)
+                return None
+            # The previous holder unlinks the file before unlocking; retry on a fresh one
+            try:
+                if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                    return fd
+            except FileNotFoundError:
+                pass
+            os.close(fd)
+
+    def try_lock(self, key: str) -> Optional[int]:
+        """Take the cross-process lock of ``key`` if no other process holds it."""
+        return self._acquire(key, blocking=False)
+
+    def release(self, key: str, fd: int) -> None:
+        """Release the cross-process lock taken with ``try_lock`` or ``wait_remote``."""
+        if fd < 0:
+            return
+        self._lock_path(key).unlink(missing_ok=True)
+        os.close(fd)
+
+    def wait_remote(self, key: str, then: Callable[[int], None]) -> None:
+        """Wait off-thread until another process finishes ``key``, then call ``then`` with the lock held.
+
+        If waiting or ``then`` raises, the flight fails with that error so its
+        callers are never left waiting.
+        """
+        with self._lock:
+            self.remote_waits += 1
+            flight = self._flights[key]
+
+        def wait() -> None:
+            try:
+                then(self._acquire(key, blocking=True))
+            except Exception as e:
+                self.fail(key, flight, e)
+
+        self._waiters.submit(wait)
+
+    def record_remote_hit(self) -> None:
+        """Count a remote compile whose PDF was reused from the cache."""
+        with self._lock:
+            self.remote_hits += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Duplicate-work counters."""
+        with self._lock:
+            return {
+                "compiles": self.leaders,
+                "coalesced": self.coalesced,
+                "remote_waits": self.remote_waits,
+                "remote_hits": self.remote_hits,
+                "in_flight": len(self._flights),
+            }
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight registry."""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight(Path(config.CACHE_DIR) / "locks")
+        return _single_flight
@@ -0,0 +1,210 @@
+"""Structured TeX log analysis.
+
+``LogParser`` consumes a TeX log (or terminal output) one line at a time and
+collects errors with their source line and offending snippet, overfull and
+underfull boxes, font substitutions and missing characters, other LaTeX
+warnings and the page count. The worker pool runs TeX with
+``max_print_line`` raised so none of these messages are wrapped.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+# Environment for TeX processes: unwrapped log lines and longer error context
+TEX_LOG_ENV = {"max_print_line": "10000", "error_line": "254", "half_error_line": "238"}
+
+# Overfull boxes smaller than this are not worth reporting
+OVERFULL_REPORT_PT = 1.0
+MAX_REPORTED = 3
+
+ERROR_PATTERN = re.compile(r'^! (.*)')
+ERROR_LINE_PATTERN = re.compile(r'^l\.(\d+) ?(.*)')
+BOX_PATTERN = re.compile(
+    r'^(Overfull|Underfull) \\([hv])box \((?:(\d+(?:\.\d+)?)pt too \w+|badness (\d+))\)'
+    r'.*?(?:at lines? (\d+)(?:--(\d+))?)?$'
+)
+FONT_WARNING_PATTERN = re.compile(r'^LaTeX Font Warning: (.*)')
+FONT_CONTINUATION_PATTERN = re.compile(r'^\(Font\)\s+(.*)')
+MISSING_CHAR_PATTERN = re.compile(r'^Missing character: There is no (.+?) in font (.+?)!')
+WARNING_PATTERN = re.compile(r'^(?:LaTeX|Package (\w+)) Warning: (.*)')
+PAGES_PATTERN = re.compile(r'^Output written on .*\((\d+) pages?')
+# Font switches in box dumps, e.g. "\T1/Carlito-TLF/m/n/10.95 "
+BOX_FONT_PATTERN = re.compile(r'\\[A-Z0-9]+/[^/\s]+(?:/[^/\s]+)*/[\d.]+ ?|\[\]')
+
+
+@dataclass
+class Diagnostic:
+    """One error or warning from a TeX log."""
+    kind: str                         # error, overfull, underfull, font, warning
+    message: str
+    line: Optional[int] = None        # line in the compiled document
+    snippet: str = ""
+    amount_pt: Optional[float] = None
+
+    def describe(self) -> str:
+        """Format the diagnostic with its line and snippet."""
+        text = self.message
+        if self.line is not None:
+            text += f" at line {self.line}"
+        if self.snippet:
+            text += f": `{self.snippet}`"
+        return text
+
+
+@dataclass
+class LogReport:
+    """Diagnostics collected from one compile."""
+    errors: List[Diagnostic] = field(default_factory=list)
+    boxes: List[Diagnostic] = field(default_factory=list)
+    fonts: List[Diagnostic] = field(default_factory=list)
+    warnings: List[Diagnostic] = field(default_factory=list)
+    pages: Optional[int] = None
+
+    @property
+    def overfull(self) -> List[Diagnostic]:
+        """Overfull boxes worth reporting, worst first."""
+        boxes = [b for b in self.boxes if b.kind == "overfull" and (b.amount_pt or 0) >= OVERFULL_REPORT_PT]
+        return sorted(boxes, key=lambda b: -(b.amount_pt or 0))
+
+    def summary(self) -> str:
+        """Short multi-line digest for tool replies (empty if there is nothing to report)."""
+        lines = [f"error: {e.describe()}" for e in self.errors[:MAX_REPORTED]]
+        overfull = self.overfull
+        lines += [f"overfull box: {b.describe()}" for b in overfull[:MAX_REPORTED]]
+        if len(overfull) > MAX_REPORTED:
+            lines.append(f"... and {len(overfull) - MAX_REPORTED} more overfull boxes")
+        lines += [f"font: {f.describe()}" for f in self.fonts[:MAX_REPORTED]]
+        return "\n".join(lines)
+
+
+class LogParser:
+    """Incremental TeX log parser; feed it lines as they are produced."""
+
+    def __init__(self, line_offset: int = 0):
+        """Report line numbers shifted by ``line_offset`` (preamble lines in a format)."""
+        # Lines of the original document that precede the compiled file
+        self.line_offset = line_offset
+        self.report = LogReport()
+        self._pending: Optional[Diagnostic] = None   # error waiting for its l.NN line
+        self._expect_snippet = False                 # next line holds the error's continuation
+        self._box: Optional[Diagnostic] = None       # box waiting for its content dump
+        self._font: Optional[Diagnostic] = None      # font warning with continuation lines
+
+    def _line(self, number: str) -> int:
+        return int(number) + self.line_offset
+
+    def feed(self, line: str) -> Optional[Diagnostic]:
+        """Consume one log line.
+
+        Returns:
+            The error diagnostic completed by this line, if any, so callers can
+            react to the first error while TeX is still running.
+        """
+        line = line.rstrip("\r\n")
+
+        if self._expect_snippet:
+            self._expect_snippet = False
+            error = self.report.errors[-1]
+            error.snippet = (error.snippet + " " + line.strip()).strip()
+            return None
+
+        if self._box is not None:
+            box, self._box = self._box, None
+            # TeX dumps the box content right after the message, starting with [] or a font
+            if line.startswith(("[]", "\\")):
+                box.snippet = BOX_FONT_PATTERN.sub("", line).strip()[:120]
+                return None
+
+        if self._font is not None:
+            continuation = FONT_CONTINUATION_PATTERN.match(line)
+            if continuation:
+                self._font.message += " " + continuation.group(1).strip()
+                return None
+            self._font = None
+
+        error = ERROR_PATTERN.match(line)
+        if error:
+            self._pending = Diagnostic("error", error.group(1).strip())
+            return None
+
+        if self._pending is not None:
+            location = ERROR_LINE_PATTERN.match(line)
+            if location:
+                diagnostic, self._pending = self._pending, None
+                diagnostic.line = self._line(location.group(1))
+                diagnostic.snippet = location.group(2).strip()
+                self.report.errors.append(diagnostic)
+                self._expect_snippet = True
+                return diagnostic
+            # Errors without a source line (e.g. emergency stop) are complete at the next blank
+            if not line.strip() or line.startswith("!"):
+                diagnostic, self._pending = self._pending, None
+                self.report.errors.append(diagnostic)
+                return diagnostic
+            return None
+
+        box = BOX_PATTERN.match(line)
+        if box:
+            kind = box.group(1).lower()
+            amount = float(box.group(3)) if box.group(3) else None
+            message = f"{kind.capitalize()} \\{box.group(2)}box (" + (
+                f"{amount}pt too wide" if amount is not None else f"badness {box.group(4)}"
+            ) + ")"
+            diagnostic = Diagnostic(
+                kind, message,
+                line=self._line(box.group(5)) if box.group(5) else None,
+                amount_pt=amount,
+            )
+            self.report.boxes.append(diagnostic)
+            if box.group(2) == "h" and "paragraph" in line:
+                self._box = diagnostic
+            return None
+
+        font = FONT_WARNING_PATTERN.match(line)
+        if font:
+            self._font = Diagnostic("font", font.group(1).strip())
+            self.report.fonts.append(self._font)
+            return None
+
+        missing = MISSING_CHAR_PATTERN.match(line)
+        if missing:
+            message = f"Missing character {missing.group(1)} in font {missing.group(2)}"
+            if not any(f.message == message for f in self.report.fonts):
+                self.report.fonts.append(Diagnostic("font", message))
+            return None
+
+        warning = WARNING_PATTERN.match(line)
+        if warning:
+            source = f"{warning.group(1)}: " if warning.group(1) else ""
+            self.report.warnings.append(Diagnostic("warning", source + warning.group(2).strip()))
+            return None
+
+        pages = PAGES_PATTERN.match(line)
+        if pages:
+            self.report.pages = int(pages.group(1))
+        return None
+
+    def close(self) -> LogReport:
+        """Flush an error still waiting for its source line and return the report."""
+        if self._pending is not None:
+            self.report.errors.append(self._pending)
+            self._pending = None
+        return self.report
+
+
+def parse_log(lines: Iterable[str], line_offset: int = 0) -> LogReport:
+    """Parse an iterable of log lines."""
+    parser = LogParser(line_offset)
+    for line in lines:
+        parser.feed(line)
+    return parser.close()
+
+
+def parse_log_file(path: Path, line_offset: int = 0) -> LogReport:
+    """Parse a log file without loading it into memory at once."""
+    if not path.exists():
+        return LogReport()
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return parse_log(f, line_offset)
@@ -0,0 +1,330 @@
+"""Analytical text-fit estimator.
+
+Predicts line counts and page fill from the Calibri character widths bundled
+in ``fonts/`` and the page geometry of the templates, without running TeX.
+Widths are looked up with numpy over whole strings and lines are broken
+greedily at spaces, so a full cover letter is estimated in microseconds. The
+tools use it to reject or warn about over-length content before compiling and
+to hand the LLM a character budget per paragraph.
+
+The estimate follows ``pdf_renderer``'s model of the cover letter template.
+The resume is set in Helvetica, measured with the standard Helvetica metrics
+that fpdf ships for its core fonts.
+"""
+
+import pickle
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List
+
+import numpy as np
+from fpdf.fonts import fpdf_charwidths
+
+from agent.pdf_renderer import (
+    BULLET_INDENT,
+    FONT_DIR,
+    FONT_SIZE,
+    ITEM_SEP,
+    LINE_HEIGHT,
+    MARGIN_X,
+    MARGIN_Y,
+    NAME_LINE_HEIGHT,
+    PARSKIP,
+    PT_PER_CM,
+    PT_PER_IN,
+    TOP_SEP,
+)
+
+if TYPE_CHECKING:
+    from agent.tools import CoverLetterInput, TailoredResumeOutput
+
+
+# A4 in points
+PAGE_WIDTH = 595.28
+PAGE_HEIGHT = 841.89
+TEXT_WIDTH = PAGE_WIDTH - 2 * MARGIN_X
+TEXT_HEIGHT = PAGE_HEIGHT - 2 * MARGIN_Y
+
+# resume.cls: 11pt article on letter paper, 0.4in margins, default itemize indent (2.5em)
+RESUME_FONT_SIZE = 11.0
+RESUME_BULLET_WIDTH = 612.0 - 2 * 0.4 * PT_PER_IN - 2.5 * RESUME_FONT_SIZE
+RESUME_FONT = "helvetica"
+
+# Paragraphs whose length the LLM controls, in layout order
+FLEXIBLE_PARAGRAPHS = ("intro_paragraph", "bullet_sections", "closing_paragraph")
+
+LATEX_COMMAND = re.compile(r'\\[a-zA-Z]+\*?(?:\[[^\]]*\])?')
+LATEX_ESCAPE = re.compile(r'\\(.)')
+
+
+def _load_widths(stem: str) -> np.ndarray:
+    """Advance widths (1/1000 em) indexed by code point.
+
+    ASCII comes from the compact ``<stem>.cw127.pkl`` table; other code points
+    fall back to the full fpdf metrics in ``<stem>.pkl``.
+    """
+    with open(FONT_DIR / f"{stem}.pkl", 'rb') as f:
+        font = pickle.load(f)
+    widths = np.full(0x10000, font['desc'].get('MissingWidth', 500), dtype=np.float32)
+    widths[:len(font['cw'])] = font['cw'][:0x10000]
+    with open(FONT_DIR / f"{stem}.cw127.pkl", 'rb') as f:
+        ascii_ranges = pickle.load(f)['range']
+    for start, values in ascii_ranges.items():
+        widths[start:start + len(values)] = values
+    return widths
+
+
+def _core_font_widths(name: str, fallback: np.ndarray) -> np.ndarray:
+    """Advance widths of a PDF core font (e.g. Helvetica) indexed by code point.
+
+    The core font metrics cover the cp1252 characters. Other code points use
+    ``fallback`` scaled by the mean width ratio of the two fonts over the
+    characters both cover.
+    """
+    widths = np.zeros_like(fallback)
+    covered = []
+    for byte, width in enumerate(fpdf_charwidths[name][chr(i)] for i in range(256)):
+        try:
+            code = ord(bytes([byte]).decode('cp1252'))
+        except UnicodeDecodeError:
+            continue
+        widths[code] = width
+        covered.append(code)
+    ratio = widths[covered].sum() / fallback[covered].sum()
+    missing = np.ones(len(widths), dtype=bool)
+    missing[covered] = False
+    widths[missing] = fallback[missing] * ratio
+    return widths
+
+
+_widths: Dict[tuple, np.ndarray] = {}
+
+
+def _width_table(bold: bool, font: str = "calibri") -> np.ndarray:
+    if (font, bold) not in _widths:
+        calibri = _load_widths("calibri_bold" if bold else "calibri")
+        _widths[(font, bold)] = calibri if font == "calibri" else _core_font_widths(font + ("B" if bold else ""), calibri)
+    return _widths[(font, bold)]
+
+
+def char_widths(text: str, size: float = FONT_SIZE, bold: bool = False, font: str = "calibri") -> np.ndarray:
+    """Width in points of every character of ``text`` (in Calibri or a PDF core font)."""
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    return _width_table(bold, font)[np.minimum(codes, 0xFFFF)] * (size / 1000.0)
+
+
+def text_width(text: str, size: float = FONT_SIZE, bold: bool = False, font: str = "calibri") -> float:
+    """Natural width of ``text`` on one line, in points."""
+    return float(char_widths(text, size, bold, font).sum())
+
+
+def count_lines_many(
+    texts: List[str],
+    widths: List[float],
+    size: float = FONT_SIZE,
+    bold: bool = False,
+    font: str = "calibri"
+) -> List[int]:
+    """Count the lines each text takes in its column width, broken greedily at spaces.
+
+    All texts are measured in one vectorized pass; each output line then costs
+    one bisection over the cumulative word widths, so the work is proportional
+    to the number of lines rather than characters.
+    """
+    codes = np.frombuffer("\n".join(texts).encode('utf-32-le'), dtype=np.uint32)
+    cumulative = np.concatenate(([0.0], np.cumsum(_width_table(bold, font)[np.minimum(codes, 0xFFFF)])))
+    cumulative *= size / 1000.0
+    # Words are runs of non-space characters; paragraphs end at newlines
+    edges = np.diff(np.concatenate(([0], (codes > 32).astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    word_start = cumulative[starts].tolist()
+    word_end = cumulative[np.flatnonzero(edges == -1)].tolist()
+    newlines = np.flatnonzero(codes == 10)
+    paragraph_bounds = np.searchsorted(
+        np.searchsorted(newlines, starts), np.arange(len(newlines) + 2)
+    ).tolist()
+
+    counts = []
+    paragraph = 0
+    for text, width in zip(texts, widths):
+        lines = 0
+        for _ in range(text.count("\n") + 1):
+            lo, hi = paragraph_bounds[paragraph], paragraph_bounds[paragraph + 1]
+            paragraph += 1
+            if lo == hi:
+                lines += 1
+            while lo < hi:
+                lo = max(bisect_right(word_end, word_start[lo] + width, lo, hi), lo + 1)
+                lines += 1
+        counts.append(lines)
+    return counts
+
+
+def count_lines(text: str, width: float, size: float = FONT_SIZE, bold: bool = False, font: str = "calibri") -> int:
+    """Count the lines ``text`` takes in a column of ``width`` points."""
+    return count_lines_many([text], [width], size, bold, font)[0]
+
+
+def char_budget(lines: int, width: float, sample: str, size: float = FONT_SIZE, font: str = "calibri") -> int:
+    """Characters of text like ``sample`` that fit in ``lines`` lines of ``width``."""
+    mean_width = text_width(sample, size, font=font) / max(len(sample), 1) or size * 0.5
+    # Greedy breaking wastes about half a word per line
+    return max(0, int(lines * (width / mean_width - 3)))
+
+
+def plain_text(latex: str) -> str:
+    """Strip LaTeX markup from a resume fragment, keeping its visible text."""
+    text = latex.replace("---", "—").replace("--", "–").replace("~", " ")
+    text = LATEX_COMMAND.sub("", text)
+    text = LATEX_ESCAPE.sub(r"\1", text)
+    return text.replace("{", "").replace("}", "")
+
+
+# ============================================================================
+# Cover letter
+# ============================================================================
+
+@dataclass
+class LayoutEstimate:
+    """Predicted layout of a document against its page budget."""
+    fill: float
+    max_pages: int
+    lines: Dict[str, int] = field(default_factory=dict)
+    budgets: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def overflows(self) -> bool:
+        """Whether the estimate exceeds the page budget."""
+        return self.fill > self.max_pages
+
+    def describe(self) -> str:
+        """Describe the fill and any character budgets for tool replies."""
+        note = f"estimated {self.fill:.2f} of {self.max_pages} page(s)"
+        if self.budgets:
+            note += "; character budgets: " + ", ".join(
+                f"{name} ≤ {budget}" for name, budget in self.budgets.items()
+            )
+        return note
+
+
+def _cover_letter_blocks(data: "CoverLetterInput") -> List[tuple]:
+    """(name, text, width, bold, space_before) for every paragraph of the letter body."""
+    # Date, sign-off and name always take one line, so stand-in text is enough
+    blocks = [
+        ("date", "September 30, 2025", TEXT_WIDTH, False, 0.3 * PT_PER_CM + PARSKIP),
+        ("company", f"{data.company_name}\n{data.company_address}", TEXT_WIDTH, False, 0.1 * PT_PER_CM + PARSKIP),
+        ("subject", f"Subject: {data.subject}", TEXT_WIDTH, True, 0.15 * PT_PER_CM + PARSKIP),
+        ("salutation", data.salutation, TEXT_WIDTH, False, 0.15 * PT_PER_CM + PARSKIP),
+        ("intro_paragraph", data.intro_paragraph, TEXT_WIDTH, False, 0.1 * PT_PER_CM + PARSKIP),
+    ]
+    for i, bullet in enumerate(data.bullet_sections):
+        space = TOP_SEP + PARSKIP if i == 0 else ITEM_SEP
+        blocks.append((f"bullet_sections[{i}]", bullet, TEXT_WIDTH - BULLET_INDENT, False, space))
+    blocks += [
+        ("closing_paragraph", data.closing_paragraph, TEXT_WIDTH, False, TOP_SEP + 0.1 * PT_PER_CM + PARSKIP),
+        ("sign_off", "Warm regards,", TEXT_WIDTH, False, 0.15 * PT_PER_CM + PARSKIP),
+        ("name", "Name", TEXT_WIDTH, False, 0.2 * PT_PER_CM + PARSKIP),
+    ]
+    return blocks
+
+
+def estimate_cover_letter(data: "CoverLetterInput", max_pages: int = 1) -> LayoutEstimate:
+    """Predict how much of its page budget a cover letter fills.
+
+    Args:
+        data: Cover letter content (English, plain text)
+        max_pages: Page budget
+
+    Returns:
+        LayoutEstimate with the page fill, lines per paragraph and, when the
+        letter overflows, a character budget for each flexible paragraph
+    """
+    header = NAME_LINE_HEIGHT + 2 * LINE_HEIGHT + 0.13 * PT_PER_CM
+    blocks = _cover_letter_blocks(data)
+    lines: Dict[str, int] = {}
+    for bold in (False, True):
+        selected = [block for block in blocks if block[3] == bold]
+        counts = count_lines_many([b[1] for b in selected], [b[2] for b in selected], bold=bold)
+        lines.update(zip((b[0] for b in selected), counts))
+
+    height = fixed = header
+    for name, _, _, _, space in blocks:
+        height += space + lines[name] * LINE_HEIGHT
+        fixed += space
+        if not name.startswith(FLEXIBLE_PARAGRAPHS):
+            fixed += lines[name] * LINE_HEIGHT
+
+    estimate = LayoutEstimate(fill=height / TEXT_HEIGHT, max_pages=max_pages, lines=lines)
+    if estimate.overflows:
+        estimate.budgets = cover_letter_budgets(data, lines, max_pages * TEXT_HEIGHT - fixed)
+    return estimate
+
+
+def cover_letter_budgets(data: "CoverLetterInput", lines: Dict[str, int], available: float) -> Dict[str, int]:
+    """Share the free lines among the flexible paragraphs in proportion to their current length."""
+    flexible = {name: count for name, count in lines.items() if name.startswith(FLEXIBLE_PARAGRAPHS)}
+    used = sum(flexible.values())
+    free_lines = max(0, int(available // LINE_HEIGHT))
+    texts = {"intro_paragraph": data.intro_paragraph, "closing_paragraph": data.closing_paragraph}
+    texts.update({f"bullet_sections[{i}]": b for i, b in enumerate(data.bullet_sections)})
+    budgets = {}
+    for name, count in flexible.items():
+        allowed = max(1, int(count * free_lines / used)) if used else 1
+        width = TEXT_WIDTH - BULLET_INDENT if name.startswith("bullet") else TEXT_WIDTH
+        budgets[name] = min(len(texts[name]), char_budget(allowed, width, texts[name]))
+    return budgets
+
+
+# ============================================================================
+# Resume
+# ============================================================================
+
+def resume_bullet_lines(latex: str) -> int:
+    """Lines a resume bullet (LaTeX) takes in the resume template."""
+    return count_lines(plain_text(latex), RESUME_BULLET_WIDTH, RESUME_FONT_SIZE, font=RESUME_FONT)
+
+
+def resume_bullet_budget(latex: str) -> int:
+    """Characters a tailored bullet may have while keeping the original's line count."""
+    text = plain_text(latex)
+    return char_budget(resume_bullet_lines(latex), RESUME_BULLET_WIDTH, text, RESUME_FONT_SIZE, RESUME_FONT)
+
+
+@dataclass
+class ResumeGrowth:
+    """Extra lines tailored bullets add over the original resume."""
+    extra_lines: int
+    over_budget: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def page_fraction(self) -> float:
+        """Share of a resume page the extra lines take."""
+        text_height = 792.0 - 2 * 0.4 * PT_PER_IN
+        return self.extra_lines * RESUME_FONT_SIZE * 1.2 / text_height
+
+    def describe(self) -> str:
+        """Describe the growth and the bullets to shorten for tool replies."""
+        note = f"tailored bullets add {self.extra_lines} line(s) (~{self.page_fraction:.0%} of a page)"
+        if self.over_budget:
+            note += "; shorten: " + ", ".join(f"{name} ≤ {budget} chars" for name, budget in self.over_budget.items())
+        return note
+
+
+def estimate_resume_growth(tailored: "TailoredResumeOutput") -> ResumeGrowth:
+    """Compare each tailored bullet's line count with its original."""
+    pairs = []
+    for exp in tailored.experience_sections:
+        pairs += [(f"{exp.company} bullet {i}", b) for i, b in enumerate(exp.bullet_points, 1)]
+    for proj in tailored.project_sections:
+        pairs += [(f"{proj.project_name} bullet {i}", b) for i, b in enumerate(proj.bullet_points, 1)]
+    for hack in tailored.hackathon_sections:
+        pairs.append((f"{hack.project_name} description", hack.description))
+
+    growth = ResumeGrowth(extra_lines=0)
+    for name, bullet in pairs:
+        extra = resume_bullet_lines(bullet.tailored_text) - resume_bullet_lines(bullet.original_text)
+        if extra > 0:
+            growth.extra_lines += extra
+            growth.over_budget[name] = resume_bullet_budget(bullet.original_text)
+    return growth
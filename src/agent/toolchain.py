@@ -0,0 +1,276 @@
+"""TeX toolchain capability registry.
+
+Detects the installed engines (pdflatex, xelatex, lualatex, tectonic), their
+versions and the LaTeX packages the templates need, once per process. The probe
+result is persisted under ``CACHE_DIR`` together with a fingerprint of ``PATH``
+and the engine binaries' mtimes, so later processes reuse it without spawning
+anything until the toolchain actually changes.
+
+Template and class files are read through ``read_template``, which keeps their
+text until the file's mtime or size changes, so per-compile checks don't touch
+the disk beyond a ``stat``.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from agent.user_config import config
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Engines in order of preference (fastest first)
+ENGINE_PREFERENCE = ["pdflatex", "xelatex", "lualatex", "tectonic"]
+
+# Tectonic fetches packages from its bundle on demand
+BUNDLED_ENGINES = {"tectonic"}
+
+PACKAGE_PATTERN = re.compile(r'\\(?:usepackage|RequirePackage)\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+CLASS_PATTERN = re.compile(r'\\documentclass\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+
+
+@dataclass
+class EngineInfo:
+    """An installed TeX engine."""
+    name: str
+    path: str
+    version: str
+
+
+@dataclass
+class Toolchain:
+    """Probed TeX toolchain: engines and package availability."""
+    engines: Dict[str, EngineInfo] = field(default_factory=dict)
+    packages: Dict[str, bool] = field(default_factory=dict)
+    fingerprint: str = ""
+
+    def missing_packages(self, packages: Set[str], engine: str) -> List[str]:
+        """List the packages from ``packages`` that ``engine`` cannot load."""
+        if engine in BUNDLED_ENGINES:
+            return []
+        # Packages outside the probed set are assumed to be present
+        return sorted(p for p in packages if self.packages.get(p) is False)
+
+    def select_engine(self, latex_content: str) -> Optional[str]:
+        """Fastest installed engine that has every package the document loads."""
+        packages = required_packages(latex_content)
+        for engine in ENGINE_PREFERENCE:
+            if engine in self.engines and not self.missing_packages(packages, engine):
+                return engine
+        return None
+
+
+# ============================================================================
+# Template files
+# ============================================================================
+
+# Path -> ((mtime_ns, size), text) of template files read so far
+_template_texts: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+# (directory mtime_ns, template and class files) of the last listing
+_template_files: Tuple[int, List[Path]] = (-1, [])
+# (stamps of the template files, packages they load) of the last scan
+_template_packages: Tuple[tuple, Set[str]] = ((), set())
+_template_lock = threading.Lock()
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_template(path: Path) -> str:
+    """Text of a template or class file ("" if missing), re-read only after it changed."""
+    stamp = _stamp(path)
+    if stamp is None:
+        return ""
+    with _template_lock:
+        cached = _template_texts.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    text = path.read_text(encoding='utf-8')
+    with _template_lock:
+        _template_texts[path] = (stamp, text)
+    return text
+
+
+def template_files() -> List[Path]:
+    """List the bundled templates and class files (again only when the directory changed)."""
+    global _template_files
+    stamp = _stamp(TEMPLATES_DIR)
+    if stamp is None:
+        return []
+    with _template_lock:
+        if _template_files[0] != stamp[0]:
+            _template_files = (stamp[0], sorted(TEMPLATES_DIR.glob("*.tex")) + sorted(TEMPLATES_DIR.glob("*.cls")))
+        return _template_files[1]
+
+
+# ============================================================================
+# Probing
+# ============================================================================
+
+def required_packages(latex_content: str) -> Set[str]:
+    """Collect the packages a document's preamble loads, including its bundled class file."""
+    preamble = latex_content.split("\\begin{document}", 1)[0]
+    packages = _packages_in(preamble)
+    for cls in CLASS_PATTERN.findall(preamble):
+        packages |= _packages_in(read_template(TEMPLATES_DIR / f"{cls.strip()}.cls"))
+    return packages
+
+
+def _packages_in(text: str) -> Set[str]:
+    # Ignore commented-out lines
+    text = "\n".join(line.split("%", 1)[0] for line in text.splitlines())
+    return {
+        name.strip()
+        for group in PACKAGE_PATTERN.findall(text)
+        for name in group.split(",")
+        if name.strip()
+    }
+
+
+def template_packages() -> Set[str]:
+    """Every package the bundled templates and class file load (rescanned only after a change)."""
+    global _template_packages
+    files = template_files()
+    stamps = tuple((path, _stamp(path)) for path in files)
+    with _template_lock:
+        if _template_packages[0] == stamps:
+            return set(_template_packages[1])
+    packages: Set[str] = set()
+    for template in files:
+        if template.suffix == ".tex":
+            packages |= required_packages(read_template(template))
+    with _template_lock:
+        _template_packages = (stamps, packages)
+    return set(packages)
+
+
+def _fingerprint() -> str:
+    """Cheap hash of PATH, engine binaries and template packages (no subprocesses)."""
+    digest = hashlib.sha256(os.environ.get("PATH", "").encode('utf-8'))
+    for name in ENGINE_PREFERENCE + ["kpsewhich"]:
+        path = shutil.which(name)
+        if path:
+            digest.update(f"{name}:{path}:{os.stat(path).st_mtime_ns}".encode())
+    digest.update(",".join(sorted(template_packages())).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _version(path: str) -> str:
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return result.stdout.splitlines()[0] if result.returncode == 0 and result.stdout else ""
+
+
+def _probe_packages(packages: Set[str]) -> Dict[str, bool]:
+    """Look up ``<package>.sty`` for every package with a single kpsewhich call."""
+    kpsewhich = shutil.which("kpsewhich")
+    if not kpsewhich or not packages:
+        return {}
+    names = sorted(packages)
+    try:
+        result = subprocess.run(
+            [kpsewhich] + [f"{name}.sty" for name in names],
+            capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return {}
+    found = {Path(line.strip()).stem for line in result.stdout.splitlines() if line.strip()}
+    return {name: name in found for name in names}
+
+
+def probe_toolchain() -> Toolchain:
+    """Detect engines, versions and template packages (spawns subprocesses)."""
+    engines = {}
+    for name in ENGINE_PREFERENCE:
+        path = shutil.which(name)
+        if path:
+            version = _version(path)
+            if version:
+                engines[name] = EngineInfo(name=name, path=path, version=version)
+    return Toolchain(
+        engines=engines,
+        packages=_probe_packages(template_packages()),
+        fingerprint=_fingerprint(),
+    )
+
+
+def toolchain_file() -> Path:
+    """Where the registry is persisted (read at call time, so CACHE_DIR can change at runtime)."""
+    return Path(config.CACHE_DIR) / "toolchain.json"
+
+
+def _load(fingerprint: str) -> Optional[Toolchain]:
+    try:
+        data = json.loads(toolchain_file().read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if data.get("fingerprint") != fingerprint:
+        return None
+    return Toolchain(
+        engines={name: EngineInfo(**info) for name, info in data.get("engines", {}).items()},
+        packages=data.get("packages", {}),
+        fingerprint=fingerprint,
+    )
+
+
+def _save(toolchain: Toolchain) -> None:
+    path = toolchain_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".{path.name}.{os.getpid()}")
+    staging.write_text(json.dumps(asdict(toolchain), indent=2), encoding='utf-8')
+    os.replace(staging, path)
+
+
+_toolchain: Optional[Toolchain] = None
+_toolchain_lock = threading.Lock()
+
+
+def get_toolchain(refresh: bool = False) -> Toolchain:
+    """Return the toolchain registry for this process.
+
+    Loaded from disk when the persisted fingerprint still matches, otherwise
+    probed and saved. Probing happens at most once per process unless
+    ``refresh`` is set.
+    """
+    global _toolchain
+    with _toolchain_lock:
+        # An empty registry is re-checked so a TeX install is picked up without a restart
+        if _toolchain is None or refresh or not _toolchain.engines:
+            fingerprint = _fingerprint()
+            toolchain = None if refresh else _load(fingerprint)
+            if toolchain is None:
+                toolchain = probe_toolchain()
+                # Don't persist an empty probe, so installing TeX is noticed next time
+                if toolchain.engines:
+                    _save(toolchain)
+            _toolchain = toolchain
+        return _toolchain
+
+
+def engine_version(engine: str = "pdflatex") -> str:
+    """Version string of an installed engine, or "" if it is not installed."""
+    info = get_toolchain().engines.get(engine)
+    return info.version if info else ""
+
+
+if __name__ == "__main__":
+    toolchain = get_toolchain(refresh=True)
+    for name in ENGINE_PREFERENCE:
+        info = toolchain.engines.get(name)
+        print(f"{'✓' if info else '✗'} {name}: {info.version if info else 'not installed'}")  # noqa: T201
+    for package, available in sorted(toolchain.packages.items()):
+        print(f"  {'✓' if available else '✗'} {package}")  # noqa: T201
@@ -3,21 +3,37 @@ LaTeX-based PDF generation tools for cover letters.
 Supports English and German with professional formatting.
 """
 
+import asyncio
+import hashlib
 import os
 import re
-import subprocess
 import tempfile
-import shutil
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Literal, Optional, Tuple
 from pydantic import BaseModel, Field
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from deep_translator import GoogleTranslator
 from copy import deepcopy
 
 # Import user configuration
 from agent.user_config import config
+from agent.compile_queue import AUTO_ENGINE, get_compile_queue, get_compiler
+from agent.latex_pool import PRIORITY_CLASSES, CompileResult, at_capacity, get_admission_control
+from agent.letter_batch import combine_documents, split_pdf
+from agent.lint import format_lint_issues, lint_latex
+from agent.page_fit import TIGHTENING_LEVELS, PageFit, count_pages, tighten_latex
+from agent.pdf_cache import PdfCache, get_pdf_cache, place_file
+from agent.pdf_renderer import render_cover_letter
+from agent.pdf_size import apply_output_profile
+from agent.single_flight import get_single_flight
+from agent.text_fit import estimate_cover_letter, estimate_resume_growth, resume_bullet_budget, resume_bullet_lines
+from agent.toolchain import get_toolchain, required_packages
+from agent.translation import TranslationError, translate_incremental
 
 
 # ============================================================================
@@ -34,6 +50,10 @@ class CoverLetterInput(BaseModel):
     closing_paragraph: str = Field(description="Closing paragraph of the cover letter")
     salutation: str = Field(default="Dear Hiring Manager:", description="Salutation line")
     company_address: str = Field(default="", description="Company address if known")
+    render_engine: Optional[Literal["latex", "fpdf"]] = Field(
+        default=None,
+        description="PDF renderer: 'latex' for the typeset letter, 'fpdf' for an instant preview. Leave empty for the default"
+    )
 
 
 # ============================================================================
@@ -654,91 +674,373 @@ def check_latex_installed() -> Tuple[bool, str]:
     """
     Check if LaTeX is installed on the system.
     
+    Uses the toolchain registry, so no engine process is spawned once the
+    toolchain has been probed.
+    
     Returns:
         Tuple of (is_installed: bool, message: str)
     """
     try:
-        result = subprocess.run(
-            ["pdflatex", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return True, "LaTeX is installed and ready."
-        else:
-            return False, "pdflatex command failed."
-    except FileNotFoundError:
-        return False, "LaTeX (pdflatex) is not installed. Please install texlive-full or similar package."
+        toolchain = get_toolchain()
     except Exception as e:
         return False, f"Error checking LaTeX installation: {str(e)}"
+    if toolchain.engines:
+        return True, f"LaTeX is installed and ready ({', '.join(toolchain.engines)})."
+    return False, "LaTeX (pdflatex) is not installed. Please install texlive-full or similar package."
 
 
-def compile_latex_to_pdf(latex_content: str, output_path: str) -> Tuple[bool, str]:
-    """
-    Compile LaTeX content to PDF.
+def submit_latex_to_pdf(
+    latex_content: str,
+    output_path: str,
+    priority: str = "interactive",
+    cache: bool = True
+) -> "Future[Tuple[bool, str]]":
+    """Start compiling LaTeX content to PDF.
+
+    The job runs on the warm worker pool, or on the compile service when
+    config.COMPILE_SERVICE is enabled.
+    
+    The engine is the fastest one in the toolchain registry that has every
+    package the document loads; with the compile service the worker that runs
+    the job picks it, and this process needs no TeX at all. Toolchain errors
+    and cache hits resolve the returned future immediately; otherwise it
+    completes when a worker has built the PDF. Identical sources submitted
+    while one is compiling, in this or another process, share that compile
+    (see agent.single_flight). The document is built with the
+    config.PDF_PROFILE output profile. With ``cache=False`` the PDF cache and
+    the compile sharing are bypassed, for one-off documents such as the
+    combined documents of a batch.
     
     Args:
         latex_content: LaTeX source code as string
         output_path: Desired output path for the PDF file
+        priority: Scheduling class, 'interactive' (a user is waiting) or 'batch'
+        cache: Look the PDF up in and add it to the PDF cache
         
     Returns:
-        Tuple of (success: bool, message: str)
+        Future of (success: bool, message: str)
     """
-    # Check if LaTeX is installed
-    is_installed, msg = check_latex_installed()
-    if not is_installed:
-        return False, msg
-    
-    # Create temporary directory for compilation
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_dir_path = Path(temp_dir)
-        
-        # Write LaTeX content to temporary .tex file
-        tex_file = temp_dir_path / "document.tex"
-        tex_file.write_text(latex_content, encoding='utf-8')
+    done: Future[Tuple[bool, str]] = Future()
+    latex_content = apply_output_profile(latex_content, config.PDF_PROFILE)
+    
+    if config.COMPILE_SERVICE:
+        # The compile workers have TeX, not necessarily this process
+        engine, version = AUTO_ENGINE, get_compile_queue().engine_versions()
+    else:
+        is_installed, msg = check_latex_installed()
+        if not is_installed:
+            done.set_result((False, msg))
+            return done
         
-        # Copy resume.cls if the document uses it
-        if r'\documentclass' in latex_content and 'resume' in latex_content[:500]:
-            resume_cls_path = Path(__file__).parent / "templates" / "resume.cls"
-            if resume_cls_path.exists():
-                shutil.copy(resume_cls_path, temp_dir_path / "resume.cls")
+        toolchain = get_toolchain()
+        engine = toolchain.select_engine(latex_content)
+        if engine is None:
+            missing = toolchain.missing_packages(required_packages(latex_content), "pdflatex")
+            done.set_result((False, f"No installed TeX engine can build this document (missing packages: {', '.join(missing)})."))
+            return done
+        version = None
+    
+    if not cache:
+        try:
+            job = get_compiler(engine).submit(latex_content, output_path, priority=priority)
+        except Exception as e:
+            done.set_result((False, f"Error during LaTeX compilation: {str(e)}"))
+            return done
+        def relay(job: "Future[CompileResult]") -> None:
+            try:
+                result = job.result()
+                done.set_result((result.success, result.message))
+            except Exception as e:
+                done.set_result((False, f"Error during LaTeX compilation: {str(e)}"))
+        job.add_done_callback(relay)
+        return done
+    
+    # Identical source was compiled before: reuse the PDF without invoking TeX.
+    # A miss is only counted once this caller turns out to start a compile:
+    # callers that share one are counted by the compile sharing stats instead.
+    pdf_cache = get_pdf_cache()
+    cache_key = pdf_cache.key_for(latex_content, engine, version)
+    if pdf_cache.fetch(cache_key, output_path, count=False):
+        pdf_cache.record_lookup(hit=True)
+        done.set_result((True, f"PDF successfully generated: {output_path} (cached)"))
+        return done
+    
+    # The same source may be compiling right now: every caller gets the one result
+    flights = get_single_flight()
+    leader, flight = flights.join(cache_key)
+    def deliver(f: Future) -> None:
+        # Runs on whichever thread lands the flight: always resolve, never raise
+        try:
+            done.set_result(shared_compile_result(f.result(), pdf_cache, cache_key, output_path))
+        except Exception as e:
+            done.set_result((False, f"Error during LaTeX compilation: {str(e)}"))
+    
+    flight.add_done_callback(deliver)
+    if not leader:
+        return done
+    pdf_cache.record_lookup(hit=False)
+    
+    def compile_with(lock: int) -> None:
+        def finish(job: "Future[CompileResult]") -> None:
+            try:
+                result = job.result()
+                if result.success:
+                    pdf_cache.store(cache_key, output_path)
+                outcome = (result.success, result.message, output_path)
+            except Exception as e:
+                outcome = (False, f"Error during LaTeX compilation: {str(e)}", output_path)
+            flights.release(cache_key, lock)
+            flights.land(cache_key, outcome)
         
         try:
-            # Compile LaTeX to PDF (run twice for references)
-            for _ in range(2):
-                result = subprocess.run(
-                    ["pdflatex", "-interaction=nonstopmode", "document.tex"],
-                    cwd=temp_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-            
-            # Check if PDF was generated (pdflatex can return non-zero even on success with warnings)
-            pdf_file = temp_dir_path / "document.pdf"
-            if pdf_file.exists():
-                # Ensure output directory exists
-                output_dir = Path(output_path).parent
-                output_dir.mkdir(parents=True, exist_ok=True)
-                
-                shutil.copy(pdf_file, output_path)
-                return True, f"PDF successfully generated: {output_path}"
-            else:
-                # PDF was not generated - extract error from log
-                log_file = temp_dir_path / "document.log"
-                if log_file.exists():
-                    log_content = log_file.read_text()
-                    # Find the first error line
-                    for line in log_content.split('\n'):
-                        if line.startswith('!'):
-                            return False, f"LaTeX compilation error: {line}"
-                return False, "PDF file was not generated."
-                
-        except subprocess.TimeoutExpired:
-            return False, "LaTeX compilation timed out (>30 seconds)."
+            job = get_compiler(engine).submit(latex_content, output_path, priority=priority)
         except Exception as e:
-            return False, f"Error during LaTeX compilation: {str(e)}"
+            flights.release(cache_key, lock)
+            flights.land(cache_key, (False, f"Error during LaTeX compilation: {str(e)}", output_path))
+            return
+        job.add_done_callback(finish)
+    
+    lock = flights.try_lock(cache_key)
+    if lock is not None:
+        compile_with(lock)
+        return done
+    
+    def after_remote(lock: int) -> None:
+        # The other process has finished; its PDF is in the cache unless it failed
+        try:
+            hit = pdf_cache.fetch(cache_key, output_path, count=False)
+        except OSError:
+            hit = False
+        if hit:
+            flights.record_remote_hit()
+            flights.release(cache_key, lock)
+            flights.land(cache_key, (True, f"PDF successfully generated: {output_path} (shared compile)", output_path))
+        else:
+            compile_with(lock)
+    
+    flights.wait_remote(cache_key, after_remote)
+    return done
+
+
+def shared_compile_result(
+    outcome: Tuple[bool, str, str],
+    cache: PdfCache,
+    cache_key: str,
+    output_path: str
+) -> Tuple[bool, str]:
+    """Turn the result of a (possibly shared) compile into one caller's result.
+    
+    Args:
+        outcome: (success, message, pdf_path) of the compile that ran
+        cache: PDF cache holding the compiled PDF
+        cache_key: Cache key of the source
+        output_path: Where this caller wants its PDF
+        
+    Returns:
+        Tuple of (success: bool, message: str) for this caller
+    """
+    success, message, pdf_path = outcome
+    if not success or pdf_path == output_path:
+        return success, message
+    # Another caller's compile: put the same PDF at this caller's path
+    if not cache.fetch(cache_key, output_path, count=False):
+        try:
+            place_file(Path(pdf_path), Path(output_path))
+        except OSError as e:
+            return False, f"Shared compile succeeded but its PDF could not be copied: {str(e)}"
+    diagnostics = compile_diagnostics(message)
+    return True, f"PDF successfully generated: {output_path} (shared compile)" + (f"\n{diagnostics}" if diagnostics else "")
+
+
+def compile_latex_to_pdf(latex_content: str, output_path: str, priority: str = "interactive") -> Tuple[bool, str]:
+    """
+    Compile LaTeX content to PDF on the warm worker pool.
+    
+    Args:
+        latex_content: LaTeX source code as string
+        output_path: Desired output path for the PDF file
+        priority: Scheduling class, 'interactive' or 'batch'
+        
+    Returns:
+        Tuple of (success: bool, message: str). The first line of the message is the
+        status; any further lines are log diagnostics (errors with their source line
+        and snippet, overfull boxes, font problems).
+    """
+    return wait_for_compile(submit_latex_to_pdf(latex_content, output_path, priority))
+
+
+async def acompile_latex_to_pdf(latex_content: str, output_path: str, priority: str = "interactive") -> Tuple[bool, str]:
+    """Async variant of compile_latex_to_pdf that never blocks the event loop."""
+    # Cache lookups and the first toolchain probe touch the disk
+    future = await asyncio.to_thread(submit_latex_to_pdf, latex_content, output_path, priority)
+    try:
+        # Shielded: the compile may be shared with other callers
+        return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), config.LATEX_WAIT_TIMEOUT)
+    except asyncio.TimeoutError:
+        return False, compile_timeout_message()
+
+
+def compile_timeout_message() -> str:
+    """Failure message of a compile that outlived config.LATEX_WAIT_TIMEOUT."""
+    return f"LaTeX compilation did not finish within {config.LATEX_WAIT_TIMEOUT}s."
+
+
+def wait_for_compile(future: "Future[Tuple[bool, str]]") -> Tuple[bool, str]:
+    """Return the result of a submitted compile, or a failure after config.LATEX_WAIT_TIMEOUT."""
+    try:
+        return future.result(timeout=config.LATEX_WAIT_TIMEOUT)
+    except FutureTimeout:
+        return False, compile_timeout_message()
+
+
+def draft_page_count(latex_content: str, priority: str = "interactive") -> Optional[int]:
+    """Page count of a document from a draft compile that writes no PDF, or None on failure."""
+    engine = AUTO_ENGINE if config.COMPILE_SERVICE else get_toolchain().select_engine(latex_content)
+    if engine is None:
+        return None
+    try:
+        return get_compiler(engine).compile(latex_content, "", draft=True, priority=priority).pages
+    except Exception:
+        return None
+
+
+def compile_stats() -> Dict[str, Dict[str, float]]:
+    """Counters of this process's compile path, for capacity planning.
+    
+    Returns:
+        Dict with the PDF cache (``pdf_cache``), compile sharing
+        (``compile_sharing``) and worker admission and queue wait
+        (``admission``) statistics
+    """
+    return {
+        "pdf_cache": get_pdf_cache().stats(),
+        "compile_sharing": get_single_flight().stats(),
+        "admission": get_admission_control().stats(),
+    }
+
+
+def compile_diagnostics(message: str) -> str:
+    """Log diagnostics that follow the status line of a compile message."""
+    return message.partition("\n")[2]
+
+
+# Tightening level chosen for an overflowing source and page budget (None when
+# no level saves a page), so repeats of a letter skip the draft compiles
+_tightening_choices: "OrderedDict[str, Optional[int]]" = OrderedDict()
+_tightening_lock = threading.Lock()
+TIGHTENING_MEMO_SIZE = 256
+
+
+def tighten_to_page_budget(
+    latex_content: str,
+    output_path: str,
+    pages: int,
+    max_pages: int,
+    message: str = "",
+    priority: str = "interactive"
+) -> Tuple[bool, str, PageFit]:
+    """Rebuild an overflowing PDF with the first tightening level that fits.
+    
+    Each level is measured with a draft compile; only the chosen level is
+    compiled in full. If no level fits, the one with the fewest pages is used,
+    and if none saves a page the original PDF is kept. The choice is
+    remembered per source, so a repeat goes straight to the chosen level's
+    (usually cached) PDF.
+    
+    Args:
+        latex_content: LaTeX source the PDF at output_path was built from
+        output_path: Path of the overflowing PDF
+        pages: Its page count
+        max_pages: Page budget
+        message: Compile message of the overflowing PDF, kept if no level helps
+        priority: Scheduling class of the draft and final compiles
+        
+    Returns:
+        Tuple of (success: bool, message: str, fit: PageFit)
+    """
+    memo_key = hashlib.sha256(f"{max_pages}\0{latex_content}".encode()).hexdigest()
+    with _tightening_lock:
+        known = memo_key in _tightening_choices
+        choice = _tightening_choices.get(memo_key)
+        if known:
+            _tightening_choices.move_to_end(memo_key)
+    
+    if not known:
+        best_pages, measured = pages, False
+        for index, level in enumerate(TIGHTENING_LEVELS):
+            draft_pages = draft_page_count(tighten_latex(latex_content, level), priority)
+            if draft_pages is None:
+                continue
+            measured = True
+            if draft_pages < best_pages:
+                best_pages, choice = draft_pages, index
+            if draft_pages <= max_pages:
+                break
+        # A draft failure may be transient: only remember what was measured
+        if measured:
+            with _tightening_lock:
+                _tightening_choices[memo_key] = choice
+                while len(_tightening_choices) > TIGHTENING_MEMO_SIZE:
+                    _tightening_choices.popitem(last=False)
+    
+    untightened = PageFit(pages, max_pages, diagnostics=compile_diagnostics(message))
+    if choice is None:
+        return True, message, untightened
+    
+    level = TIGHTENING_LEVELS[choice]
+    tightened = tighten_latex(latex_content, level)
+    success, tightened_message = compile_latex_to_pdf(tightened, output_path, priority)
+    if not success:
+        # The untightened PDF is still in place
+        return True, message, untightened
+    return True, tightened_message, PageFit(
+        count_pages(output_path), max_pages, level.describe(latex_content),
+        diagnostics=compile_diagnostics(tightened_message)
+    )
+
+
+def compile_latex_to_page_budget(
+    latex_content: str,
+    output_path: str,
+    max_pages: int,
+    priority: str = "interactive"
+) -> Tuple[bool, str, Optional[PageFit]]:
+    """Compile LaTeX content to PDF and tighten the layout if it overflows.
+    
+    Args:
+        latex_content: LaTeX source code as string
+        output_path: Desired output path for the PDF file
+        max_pages: Page budget
+        priority: Scheduling class, 'interactive' or 'batch'
+        
+    Returns:
+        Tuple of (success: bool, message: str, fit: PageFit or None on failure)
+    """
+    success, message = compile_latex_to_pdf(latex_content, output_path, priority)
+    if not success:
+        return False, message, None
+    pages = count_pages(output_path)
+    if pages <= max_pages:
+        return True, message, PageFit(pages, max_pages, diagnostics=compile_diagnostics(message))
+    return tighten_to_page_budget(latex_content, output_path, pages, max_pages, message, priority)
+
+
+async def acompile_latex_to_page_budget(
+    latex_content: str,
+    output_path: str,
+    max_pages: int,
+    priority: str = "interactive"
+) -> Tuple[bool, str, Optional[PageFit]]:
+    """Async variant of compile_latex_to_page_budget."""
+    success, message = await acompile_latex_to_pdf(latex_content, output_path, priority)
+    if not success:
+        return False, message, None
+    pages = await asyncio.to_thread(count_pages, output_path)
+    if pages <= max_pages:
+        return True, message, PageFit(pages, max_pages, diagnostics=compile_diagnostics(message))
+    return await asyncio.to_thread(
+        tighten_to_page_budget, latex_content, output_path, pages, max_pages, message, priority
+    )
 
 
 # ============================================================================
@@ -780,16 +1082,6 @@ def escape_latex_special_chars(text: str) -> str:
     return result
 
 
-def translate_to_german(text: str) -> str:
-    """Translate text to German using deep_translator"""
-    try:
-        translator = GoogleTranslator(source='auto', target='de')
-        return translator.translate(text)
-    except Exception as e:
-        print(f"Translation error: {e}")
-        return text  # Return original if translation fails
-
-
 def get_output_directory(company_name: str, job_position: str) -> Path:
     """
     Generate output directory path following the pattern:
@@ -833,13 +1125,50 @@ def load_cover_letter_template(lang: str = "en") -> str:
     return template_path.read_text(encoding='utf-8')
 
 
-def generate_cover_letter_latex(data: CoverLetterInput, lang: str = "en") -> str:
+def localize_cover_letter(
+    data: CoverLetterInput,
+    lang: str = "en",
+    translators: Optional[List[str]] = None
+) -> CoverLetterInput:
+    """Return the cover letter content in the given language.
+    
+    Args:
+        data: Cover letter input data (English)
+        lang: Language code ('en' or 'de')
+        translators: Translation backend chain; defaults to config.TRANSLATION_BACKENDS
+        
+    Returns:
+        The input unchanged for English, a translated copy for German
+        
+    Raises:
+        TranslationError: If every translation backend failed
+    """
+    if lang != "de":
+        return data
+    # All fields go to the translator together (one round trip for a typical letter), and
+    # on edits only the sentences changed since the last letter in this output directory
+    fields = ["subject", "intro_paragraph", "closing_paragraph", "salutation", "company_name", "company_address"]
+    state_path = get_output_directory(data.company_name, data.job_position) / f".translation_{lang}.json"
+    translated = translate_incremental(
+        [getattr(data, field) or "" for field in fields] + list(data.bullet_sections), "de", state_path, translators
+    )
+    update = dict(zip(fields, translated))
+    update["bullet_sections"] = translated[len(fields):]
+    return data.model_copy(update=update)
+
+
+def generate_cover_letter_latex(
+    data: CoverLetterInput,
+    lang: str = "en",
+    translators: Optional[List[str]] = None
+) -> str:
     """
     Generate LaTeX content for cover letter in specified language.
     
     Args:
         data: Cover letter input data
         lang: Language code ('en' or 'de')
+        translators: Translation backend chain for German
         
     Returns:
         LaTeX content as string
@@ -848,22 +1177,14 @@ def generate_cover_letter_latex(data: CoverLetterInput, lang: str = "en") -> str
     template = load_cover_letter_template(lang)
     
     # Translate content if German
-    if lang == "de":
-        subject = translate_to_german(data.subject)
-        intro_paragraph = translate_to_german(data.intro_paragraph)
-        closing_paragraph = translate_to_german(data.closing_paragraph)
-        bullet_sections = [translate_to_german(bullet) for bullet in data.bullet_sections]
-        salutation = translate_to_german(data.salutation)
-        company_name = translate_to_german(data.company_name) if data.company_name else ""
-        company_address = translate_to_german(data.company_address) if data.company_address else ""
-    else:
-        subject = data.subject
-        intro_paragraph = data.intro_paragraph
-        closing_paragraph = data.closing_paragraph
-        bullet_sections = data.bullet_sections
-        salutation = data.salutation
-        company_name = data.company_name
-        company_address = data.company_address
+    data = localize_cover_letter(data, lang, translators)
+    subject = data.subject
+    intro_paragraph = data.intro_paragraph
+    closing_paragraph = data.closing_paragraph
+    bullet_sections = data.bullet_sections
+    salutation = data.salutation
+    company_name = data.company_name
+    company_address = data.company_address
     
     # Escape special LaTeX characters in user-provided content
     subject = escape_latex_special_chars(subject)
@@ -896,35 +1217,372 @@ def generate_cover_letter_latex(data: CoverLetterInput, lang: str = "en") -> str
     return latex_content
 
 
-def create_cover_letter_pdf(data: CoverLetterInput, lang: str = "en") -> Tuple[bool, str]:
+def get_cover_letter_path(data: CoverLetterInput, lang: str = "en") -> Path:
+    """Output path of the cover letter PDF for a language."""
+    output_dir = get_output_directory(data.company_name, data.job_position)
+    lang_suffix = "_de" if lang == "de" else "_en"
+    filename = f"{config.NAME_FOR_FILES}_cover_letter{lang_suffix}_{config.CURRENT_YEAR}.pdf"
+    return output_dir / filename
+
+
+def select_cover_letter_engine(engine: Optional[str] = None) -> str:
+    """Resolve the cover letter renderer for a call.
+    
+    Args:
+        engine: Requested renderer ('latex' or 'fpdf'), or None for config.COVER_LETTER_ENGINE
+        
+    Returns:
+        'fpdf' if requested or if no TeX engine is installed, otherwise 'latex'
+    """
+    engine = engine or config.COVER_LETTER_ENGINE
+    # The compile service's workers have TeX even when this process doesn't
+    if engine == "latex" and not config.COMPILE_SERVICE and not check_latex_installed()[0]:
+        return "fpdf"
+    return engine
+
+
+def render_cover_letter_pdf(
+    data: CoverLetterInput,
+    lang: str = "en",
+    translators: Optional[List[str]] = None
+) -> Tuple[bool, str, Optional[PageFit]]:
+    """Create cover letter PDF with the pure-Python renderer (no TeX needed).
+    
+    Returns:
+        Tuple of (success: bool, file_path or error_message: str, fit: PageFit or None)
+    """
+    output_path = get_cover_letter_path(data, lang)
+    try:
+        pages = render_cover_letter(
+            localize_cover_letter(data, lang, translators), str(output_path), lang, get_date_string(lang)
+        )
+    except Exception as e:
+        return False, f"Error rendering PDF: {str(e)}", None
+    return True, str(output_path), PageFit(pages, config.COVER_LETTER_MAX_PAGES)
+
+
+def create_cover_letter_pdf(
+    data: CoverLetterInput,
+    lang: str = "en",
+    engine: Optional[str] = None,
+    priority: str = "interactive",
+    translators: Optional[List[str]] = None
+) -> Tuple[bool, str, Optional[PageFit]]:
     """
     Create cover letter PDF in specified language.
     
     Args:
         data: Cover letter input data
         lang: Language code ('en' or 'de')
+        engine: Renderer override ('latex' or 'fpdf'); defaults to data.render_engine,
+            then config.COVER_LETTER_ENGINE. Falls back to 'fpdf' without TeX.
+        priority: Compile scheduling class, 'interactive' or 'batch'
+        translators: Translation backend chain for German; defaults to
+            config.TRANSLATION_BACKENDS
         
     Returns:
-        Tuple of (success: bool, file_path or error_message: str)
+        Tuple of (success: bool, file_path or error_message: str, fit: PageFit or None).
+        A letter over config.COVER_LETTER_MAX_PAGES is tightened automatically and
+        fit reports the final page count and the adjustment applied.
     """
-    # Get output directory
-    output_dir = get_output_directory(data.company_name, data.job_position)
+    if select_cover_letter_engine(engine or data.render_engine) == "fpdf":
+        return render_cover_letter_pdf(data, lang, translators)
     
-    # Generate filename
-    lang_suffix = "_de" if lang == "de" else "_en"
-    filename = f"{config.NAME_FOR_FILES}_cover_letter{lang_suffix}_{config.CURRENT_YEAR}.pdf"
-    output_path = output_dir / filename
+    output_path = get_cover_letter_path(data, lang)
     
     # Generate LaTeX content
-    latex_content = generate_cover_letter_latex(data, lang)
+    latex_content = generate_cover_letter_latex(data, lang, translators)
+    
+    # Fail fast on mistakes that would only surface after seconds of TeX
+    issues = lint_latex(latex_content)
+    if issues:
+        return False, format_lint_issues(issues), None
     
     # Compile to PDF
-    success, message = compile_latex_to_pdf(latex_content, str(output_path))
+    success, message, fit = compile_latex_to_page_budget(
+        latex_content, str(output_path), config.COVER_LETTER_MAX_PAGES, priority
+    )
+    
+    if success:
+        return True, str(output_path), fit
+    else:
+        return False, message, None
+
+
+async def acreate_cover_letter_pdf(
+    data: CoverLetterInput,
+    lang: str = "en",
+    engine: Optional[str] = None,
+    priority: str = "interactive",
+    translators: Optional[List[str]] = None
+) -> Tuple[bool, str, Optional[PageFit]]:
+    """Async variant of create_cover_letter_pdf."""
+    if await asyncio.to_thread(select_cover_letter_engine, engine or data.render_engine) == "fpdf":
+        return await asyncio.to_thread(render_cover_letter_pdf, data, lang, translators)
+    
+    output_path = await asyncio.to_thread(get_cover_letter_path, data, lang)
+    # Translation makes blocking HTTP calls
+    latex_content = await asyncio.to_thread(generate_cover_letter_latex, data, lang, translators)
+    issues = lint_latex(latex_content)
+    if issues:
+        return False, format_lint_issues(issues), None
+    success, message, fit = await acompile_latex_to_page_budget(
+        latex_content, str(output_path), config.COVER_LETTER_MAX_PAGES, priority
+    )
     
     if success:
-        return True, str(output_path)
+        return True, str(output_path), fit
     else:
-        return False, message
+        return False, message, None
+
+
+# Pause before resubmitting a batch job that admission control turned away
+BATCH_RETRY_SECONDS = 1.0
+
+
+def create_cover_letter_pdf_batch(
+    letters: List[CoverLetterInput],
+    lang: str = "en",
+    translators: Optional[List[str]] = None
+) -> List[Tuple[bool, str, Optional[PageFit]]]:
+    """Create cover letter PDFs for many applications with a few TeX runs.
+    
+    Letters are typeset config.LATEX_BATCH_SIZE at a time as one combined
+    document per job, and each job's PDF is split into per-application files
+    at their get_cover_letter_path targets. Jobs run on the worker pool at
+    batch priority, behind interactive compiles, and at most
+    config.LATEX_WORKERS of them are queued at once so a large batch never
+    fills the admission queue; a job turned away because other batches hold
+    the queue is resubmitted once a place frees up. Each letter uses its own
+    renderer (see select_cover_letter_engine). Letters that fail to build or
+    lint are reported without compiling. Every letter of a job that fails,
+    and any letter over config.COVER_LETTER_MAX_PAGES, is rebuilt on its own,
+    so errors and tightening apply to the right letter.
+    
+    Args:
+        letters: Cover letter input data, one per application
+        lang: Language code ('en' or 'de')
+        translators: Translation backend chain for German
+        
+    Returns:
+        List of (success: bool, file_path or error_message: str, fit: PageFit or None)
+        in the order of ``letters``.
+    """
+    results: List[Optional[Tuple[bool, str, Optional[PageFit]]]] = [None] * len(letters)
+    pending = []    # (index, latex_content, output_path) of letters to typeset
+    for index, letter in enumerate(letters):
+        # One bad letter must not cost the results of the others
+        try:
+            if select_cover_letter_engine(letter.render_engine) == "fpdf":
+                results[index] = render_cover_letter_pdf(letter, lang, translators)
+                continue
+            latex_content = generate_cover_letter_latex(letter, lang, translators)
+            issues = lint_latex(latex_content)
+            if issues:
+                results[index] = (False, format_lint_issues(issues), None)
+                continue
+            pending.append((index, latex_content, str(get_cover_letter_path(letter, lang))))
+        except TranslationError as e:
+            results[index] = (False, str(e), None)
+        except Exception as e:
+            results[index] = (False, f"Error preparing cover letter: {str(e)}", None)
+    
+    size = max(1, config.LATEX_BATCH_SIZE)
+    chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+    max_pages = config.COVER_LETTER_MAX_PAGES
+    
+    with tempfile.TemporaryDirectory(prefix="cover-letter-batch-") as batch_dir:
+        def submit(n: int) -> Optional["Future[Tuple[bool, str]]"]:
+            try:
+                combined = combine_documents([latex for _, latex, _ in chunks[n]])
+            except ValueError:
+                return None
+            # The combined document is split right away: caching it would only evict useful PDFs
+            return submit_latex_to_pdf(combined, str(Path(batch_dir) / f"batch_{n}.pdf"), "batch", cache=False)
+        
+        def finish(n: int, success: bool, message: str) -> None:
+            chunk = chunks[n]
+            if at_capacity(message):
+                for index, _, _ in chunk:
+                    results[index] = (False, message, None)
+                return
+            page_counts = None
+            if success:
+                try:
+                    page_counts = split_pdf(str(Path(batch_dir) / f"batch_{n}.pdf"), [path for _, _, path in chunk])
+                except Exception:
+                    page_counts = None
+            
+            for k, (index, latex_content, output_path) in enumerate(chunk):
+                if page_counts is not None and page_counts[k] <= max_pages:
+                    results[index] = (True, output_path, PageFit(page_counts[k], max_pages))
+                    continue
+                # Compile alone to pin down the failing letter or tighten the long one
+                success, message, fit = compile_latex_to_page_budget(latex_content, output_path, max_pages, "batch")
+                results[index] = (True, output_path, fit) if success else (False, message, None)
+        
+        # Keep a few jobs queued so the workers stay busy, submitting the next as each one finishes
+        window = max(1, config.LATEX_WORKERS)
+        waiting = deque(range(len(chunks)))
+        in_flight = deque()
+        deadline = time.monotonic() + config.LATEX_WAIT_TIMEOUT
+        while waiting or in_flight:
+            while waiting and len(in_flight) < window:
+                n = waiting.popleft()
+                in_flight.append((n, submit(n)))
+            n, job = in_flight.popleft()
+            success, message = wait_for_compile(job) if job is not None else (False, "")
+            if not success and at_capacity(message) and time.monotonic() < deadline:
+                # Other batches hold the queue: retry after a pause instead of compiling letter by letter
+                time.sleep(BATCH_RETRY_SECONDS)
+                waiting.appendleft(n)
+                continue
+            finish(n, success, message)
+    
+    return results
+
+
+async def acreate_cover_letter_pdf_batch(
+    letters: List[CoverLetterInput],
+    lang: str = "en",
+    translators: Optional[List[str]] = None
+) -> List[Tuple[bool, str, Optional[PageFit]]]:
+    """Async variant of create_cover_letter_pdf_batch."""
+    return await asyncio.to_thread(create_cover_letter_pdf_batch, letters, lang, translators)
+
+
+LANGUAGE_NAMES = {"en": "English", "de": "German"}
+
+# Shared, bounded executor for building language variants side by side
+_language_executor = ThreadPoolExecutor(
+    max_workers=config.LANGUAGE_WORKERS, thread_name_prefix="cover-letter"
+)
+
+
+def cover_letter_languages() -> List[str]:
+    """Languages to generate, in the order results are reported."""
+    languages = []
+    if config.GENERATE_ENGLISH:
+        languages.append("en")
+    if config.GENERATE_GERMAN:
+        languages.append("de")
+    return languages
+
+
+def create_cover_letter_pdfs(
+    data: CoverLetterInput,
+    languages: List[str],
+    priority: str = "interactive",
+    translators: Optional[List[str]] = None
+) -> List[Tuple[str, bool, str, Optional[PageFit]]]:
+    """Create the cover letter PDFs for several languages concurrently.
+    
+    Each language is translated and compiled independently, so a failure in one
+    never blocks or cancels the others.
+    
+    Returns:
+        List of (lang, success, file_path or error_message, fit) in the order of ``languages``.
+    """
+    futures = [
+        _language_executor.submit(create_cover_letter_pdf, data, lang, None, priority, translators)
+        for lang in languages
+    ]
+    results = []
+    for lang, future in zip(languages, futures):
+        try:
+            success, path_or_error, fit = future.result()
+        except Exception as e:
+            success, path_or_error, fit = False, str(e), None
+        results.append((lang, success, path_or_error, fit))
+    return results
+
+
+async def acreate_cover_letter_pdfs(
+    data: CoverLetterInput,
+    languages: List[str],
+    priority: str = "interactive",
+    translators: Optional[List[str]] = None
+) -> List[Tuple[str, bool, str, Optional[PageFit]]]:
+    """Async variant of create_cover_letter_pdfs."""
+    outcomes = await asyncio.gather(
+        *(acreate_cover_letter_pdf(data, lang, priority=priority, translators=translators) for lang in languages),
+        return_exceptions=True
+    )
+    results = []
+    for lang, outcome in zip(languages, outcomes):
+        if isinstance(outcome, Exception):
+            results.append((lang, False, str(outcome), None))
+        else:
+            results.append((lang, *outcome))
+    return results
+
+
+def compile_priority(run_config: Optional[RunnableConfig]) -> str:
+    """Compile scheduling class of a tool call, from the graph Configuration."""
+    # Imported here: agent.configuration loads the graph package, which imports this module
+    from agent.configuration import Configuration
+    priority = Configuration.from_runnable_config(run_config).compile_priority
+    return priority if priority in PRIORITY_CLASSES else "interactive"
+
+
+def translation_backends(run_config: Optional[RunnableConfig]) -> Optional[List[str]]:
+    """Return the translation backend chain of a tool call from the graph Configuration (None = config default)."""
+    from agent.configuration import Configuration
+    chain = Configuration.from_runnable_config(run_config).translation_backends
+    names = [name.strip() for name in chain.split(",") if name.strip()]
+    return names or None
+
+
+def run_settings(run_config: Optional[RunnableConfig]) -> Tuple[str, Optional[List[str]]]:
+    """Compile priority and translation backend chain of a tool call.
+    
+    The first call imports agent.configuration (and with it the graph), so
+    async tools run this in a thread.
+    """
+    return compile_priority(run_config), translation_backends(run_config)
+
+
+def with_diagnostics(reply: str, diagnostics: str) -> str:
+    """Append log diagnostics, indented, under a tool reply line."""
+    return "\n".join([reply] + [f"    {line}" for line in diagnostics.splitlines()])
+
+
+def format_cover_letter_results(results: List[Tuple[str, bool, str, Optional[PageFit]]]) -> str:
+    """Format per-language results as the tool's reply."""
+    lines = []
+    for lang, success, path_or_error, fit in results:
+        name = LANGUAGE_NAMES.get(lang, lang)
+        if success:
+            reply = f"✓ {name} cover letter: {path_or_error}" + (f" ({fit.describe()})" if fit else "")
+            lines.append(with_diagnostics(reply, fit.diagnostics if fit else ""))
+        else:
+            error, _, diagnostics = path_or_error.partition("\n")
+            lines.append(with_diagnostics(f"✗ {name} cover letter failed: {error}", diagnostics))
+    return "\n".join(lines)
+
+
+def check_cover_letter_length(data: CoverLetterInput) -> Tuple[bool, str]:
+    """Estimate the letter's length before compiling.
+    
+    Returns:
+        Tuple of (acceptable: bool, note: str). Letters far over the page budget are
+        not acceptable; letters slightly over are compiled (and tightened) with a
+        warning. The note carries per-paragraph character budgets when over length.
+    """
+    estimate = estimate_cover_letter(data, config.COVER_LETTER_MAX_PAGES)
+    if estimate.fill > config.LENGTH_REJECT_FILL * config.COVER_LETTER_MAX_PAGES:
+        return False, (
+            f"✗ Cover letter is too long and was not compiled ({estimate.describe()}). "
+            "Shorten the paragraphs to their character budgets and try again."
+        )
+    if estimate.overflows:
+        return True, f"⚠️ Cover letter is over length ({estimate.describe()})."
+    return True, ""
+
+
+def with_note(note: str, reply: str) -> str:
+    """Prefix a tool reply with a warning line, if any."""
+    return f"{note}\n{reply}" if note else reply
 
 
 # ============================================================================
@@ -932,7 +1590,7 @@ def create_cover_letter_pdf(data: CoverLetterInput, lang: str = "en") -> Tuple[b
 # ============================================================================
 
 @tool("generate-cover-letter-pdfs", args_schema=CoverLetterInput, return_direct=False)
-def generate_cover_letter_pdfs(**kwargs) -> str:
+def generate_cover_letter_pdfs(run_config: RunnableConfig = None, **kwargs) -> str:
     """
     Generate cover letter PDFs in both English and German.
     
@@ -943,61 +1601,67 @@ def generate_cover_letter_pdfs(**kwargs) -> str:
         Success message with file paths or error message.
     """
     data = CoverLetterInput(**kwargs)
-    
-    results = []
-    
-    # Generate English version
-    if config.GENERATE_ENGLISH:
-        success_en, path_or_error_en = create_cover_letter_pdf(data, lang="en")
-        if success_en:
-            results.append(f"✓ English cover letter: {path_or_error_en}")
-        else:
-            results.append(f"✗ English cover letter failed: {path_or_error_en}")
-    
-    # Generate German version
-    if config.GENERATE_GERMAN:
-        success_de, path_or_error_de = create_cover_letter_pdf(data, lang="de")
-        if success_de:
-            results.append(f"✓ German cover letter: {path_or_error_de}")
-        else:
-            results.append(f"✗ German cover letter failed: {path_or_error_de}")
-    
-    return "\n".join(results)
+    acceptable, note = check_cover_letter_length(data)
+    if not acceptable:
+        return note
+    results = create_cover_letter_pdfs(
+        data, cover_letter_languages(), compile_priority(run_config), translation_backends(run_config)
+    )
+    return with_note(note, format_cover_letter_results(results))
+
+
+async def agenerate_cover_letter_pdfs(run_config: RunnableConfig = None, **kwargs) -> str:
+    """Async implementation of generate-cover-letter-pdfs."""
+    data = CoverLetterInput(**kwargs)
+    # The first estimate loads the font width tables from disk
+    acceptable, note = await asyncio.to_thread(check_cover_letter_length, data)
+    if not acceptable:
+        return note
+    priority, translators = await asyncio.to_thread(run_settings, run_config)
+    results = await acreate_cover_letter_pdfs(data, cover_letter_languages(), priority, translators)
+    return with_note(note, format_cover_letter_results(results))
+
+
+generate_cover_letter_pdfs.coroutine = agenerate_cover_letter_pdfs
 
 
 @tool("edit-cover-letter-pdfs", args_schema=CoverLetterInput, return_direct=False)
-def edit_cover_letter_pdfs(**kwargs) -> str:
+def edit_cover_letter_pdfs(run_config: RunnableConfig = None, **kwargs) -> str:
     """
     Edit and regenerate cover letter PDFs in both English and German.
     
-    This tool regenerates the cover letters with updated content.
+    This tool regenerates the cover letters with updated content. The German
+    letter only retranslates the sentences that changed since the last version.
     
     Returns:
         Success message with file paths or error message.
     """
-    # Reuse the generate function since we're overwriting anyway
-    return generate_cover_letter_pdfs(**kwargs)
+    # Reuse the generate function since we're overwriting anyway; translation
+    # state is kept per output directory, so unchanged sentences are not resent
+    return generate_cover_letter_pdfs.func(run_config, **kwargs)
+
+
+async def aedit_cover_letter_pdfs(run_config: RunnableConfig = None, **kwargs) -> str:
+    """Async implementation of edit-cover-letter-pdfs."""
+    return await agenerate_cover_letter_pdfs(run_config, **kwargs)
+
+
+edit_cover_letter_pdfs.coroutine = aedit_cover_letter_pdfs
 
 
 # ============================================================================
 # Resume Tailoring Functions
 # ============================================================================
 
-def create_tailored_resume_pdf(
+def prepare_tailored_resume(
     tailored_output: TailoredResumeOutput,
     company_name: str,
     job_position: str
-) -> Tuple[bool, str]:
-    """
-    Create tailored resume PDF.
+) -> Tuple[str, Path]:
+    """Render the tailored resume LaTeX and save the .tex next to its PDF path.
     
-    Args:
-        tailored_output: Structured output with tailored sections
-        company_name: Target company name
-        job_position: Job position for filename
-        
     Returns:
-        Tuple of (success: bool, file_path or error_message: str)
+        Tuple of (tailored_latex: str, output_path: Path)
     """
     # Load original template
     original_latex = load_resume_template()
@@ -1017,13 +1681,67 @@ def create_tailored_resume_pdf(
     tex_path = output_dir / tex_filename
     tex_path.write_text(tailored_latex, encoding='utf-8')
     
+    return tailored_latex, output_path
+
+
+def create_tailored_resume_pdf(
+    tailored_output: TailoredResumeOutput,
+    company_name: str,
+    job_position: str,
+    priority: str = "interactive"
+) -> Tuple[bool, str, Optional[PageFit]]:
+    """
+    Create tailored resume PDF.
+    
+    Args:
+        tailored_output: Structured output with tailored sections
+        company_name: Target company name
+        job_position: Job position for filename
+        priority: Compile scheduling class, 'interactive' or 'batch'
+        
+    Returns:
+        Tuple of (success: bool, file_path or error_message: str, fit: PageFit or None).
+        A resume over config.RESUME_MAX_PAGES is tightened automatically.
+    """
+    tailored_latex, output_path = prepare_tailored_resume(tailored_output, company_name, job_position)
+    
+    # Fail fast on mistakes that would only surface after seconds of TeX
+    issues = lint_latex(tailored_latex)
+    if issues:
+        return False, format_lint_issues(issues), None
+    
     # Compile to PDF
-    success, message = compile_latex_to_pdf(tailored_latex, str(output_path))
+    success, message, fit = compile_latex_to_page_budget(
+        tailored_latex, str(output_path), config.RESUME_MAX_PAGES, priority
+    )
+    
+    if success:
+        return True, str(output_path), fit
+    else:
+        return False, message, None
+
+
+async def acreate_tailored_resume_pdf(
+    tailored_output: TailoredResumeOutput,
+    company_name: str,
+    job_position: str,
+    priority: str = "interactive"
+) -> Tuple[bool, str, Optional[PageFit]]:
+    """Async variant of create_tailored_resume_pdf."""
+    tailored_latex, output_path = await asyncio.to_thread(
+        prepare_tailored_resume, tailored_output, company_name, job_position
+    )
+    issues = lint_latex(tailored_latex)
+    if issues:
+        return False, format_lint_issues(issues), None
+    success, message, fit = await acompile_latex_to_page_budget(
+        tailored_latex, str(output_path), config.RESUME_MAX_PAGES, priority
+    )
     
     if success:
-        return True, str(output_path)
+        return True, str(output_path), fit
     else:
-        return False, message
+        return False, message, None
 
 
 @tool("tailor-resume-for-ats", args_schema=ResumeInput, return_direct=False)
@@ -1116,6 +1834,7 @@ def tailor_resume_for_ats(**kwargs) -> str:
             output_parts.append(f"\n  ORIGINAL Bullet {j}:")
             output_parts.append(f"  {bullet}")
             output_parts.append(f"  ↳ SURGICAL EDIT: Append 3-6 relevant keywords (e.g., ', using X, Y, and Z'); do not remove details")
+            output_parts.append(f"  ↳ LENGTH BUDGET: ≤ {resume_bullet_budget(bullet)} characters (stays at {resume_bullet_lines(bullet)} lines)")
 
     # Projects
     output_parts.append("\n" + "-" * 50)
@@ -1133,6 +1852,7 @@ def tailor_resume_for_ats(**kwargs) -> str:
             output_parts.append(f"\n  ORIGINAL Bullet {j}:")
             output_parts.append(f"  {bullet}")
             output_parts.append(f"  ↳ SURGICAL EDIT: Append 3-6 relevant keywords; do not remove details")
+            output_parts.append(f"  ↳ LENGTH BUDGET: ≤ {resume_bullet_budget(bullet)} characters (stays at {resume_bullet_lines(bullet)} lines)")
 
     # Hackathons
     output_parts.append("\n" + "-" * 50)
@@ -1148,6 +1868,7 @@ def tailor_resume_for_ats(**kwargs) -> str:
         output_parts.append(f"\n  ORIGINAL Description:")
         output_parts.append(f"  {hack['description']}")
         output_parts.append(f"  ↳ SURGICAL EDIT: Append 3-6 relevant keywords; do not remove details")
+        output_parts.append(f"  ↳ LENGTH BUDGET: ≤ {resume_bullet_budget(hack['description'])} characters (stays at {resume_bullet_lines(hack['description'])} lines)")
 
     # Skills
     output_parts.append("\n" + "-" * 50)
@@ -1203,6 +1924,15 @@ Now call generate-tailored-resume-pdf with surgically edited bullets.
     return "\n".join(output_parts)
 
 
+async def atailor_resume_for_ats(**kwargs) -> str:
+    """Async implementation of tailor-resume-for-ats."""
+    # Reads the template from disk and does CPU-bound parsing
+    return await asyncio.to_thread(tailor_resume_for_ats.func, **kwargs)
+
+
+tailor_resume_for_ats.coroutine = atailor_resume_for_ats
+
+
 class TailoredResumeInput(BaseModel):
     """Input for generating tailored resume PDF"""
     company_name: str = Field(description="Target company name")
@@ -1219,8 +1949,32 @@ class TailoredResumeInput(BaseModel):
     skills: str = Field(description="Updated skills line")
 
 
+def check_resume_length(tailored_output: TailoredResumeOutput) -> Tuple[bool, str]:
+    """Estimate how much longer the tailored bullets make the resume.
+    
+    Returns:
+        Tuple of (acceptable: bool, note: str) with the bullets to shorten.
+    """
+    growth = estimate_resume_growth(tailored_output)
+    if growth.extra_lines > config.RESUME_MAX_EXTRA_LINES:
+        return False, f"✗ Tailored resume is too long and was not compiled: {growth.describe()}."
+    if growth.extra_lines > 0:
+        return True, f"⚠️ {growth.describe()}."
+    return True, ""
+
+
+def to_tailored_output(data: TailoredResumeInput) -> TailoredResumeOutput:
+    """Convert tool input to TailoredResumeOutput."""
+    return TailoredResumeOutput(
+        experience_sections=data.experience_sections,
+        project_sections=data.project_sections,
+        hackathon_sections=data.hackathon_sections,
+        skills=data.skills
+    )
+
+
 @tool("generate-tailored-resume-pdf", args_schema=TailoredResumeInput, return_direct=False)
-def generate_tailored_resume_pdf(**kwargs) -> str:
+def generate_tailored_resume_pdf(run_config: RunnableConfig = None, **kwargs) -> str:
     """
     Generate a tailored resume PDF with ATS-optimized content.
     
@@ -1231,23 +1985,47 @@ def generate_tailored_resume_pdf(**kwargs) -> str:
         Success message with file path or error message.
     """
     data = TailoredResumeInput(**kwargs)
-    
-    # Convert to TailoredResumeOutput
-    tailored_output = TailoredResumeOutput(
-        experience_sections=data.experience_sections,
-        project_sections=data.project_sections,
-        hackathon_sections=data.hackathon_sections,
-        skills=data.skills
+    tailored_output = to_tailored_output(data)
+    acceptable, note = check_resume_length(tailored_output)
+    if not acceptable:
+        return note
+    success, path_or_error, fit = create_tailored_resume_pdf(
+        tailored_output,
+        data.company_name,
+        data.job_position,
+        compile_priority(run_config)
     )
     
-    # Generate PDF
-    success, path_or_error = create_tailored_resume_pdf(
+    if success:
+        reply = f"✓ Tailored resume generated: {path_or_error} ({fit.describe()})"
+        return with_note(note, with_diagnostics(reply, fit.diagnostics))
+    else:
+        error, _, diagnostics = path_or_error.partition("\n")
+        return with_diagnostics(f"✗ Resume generation failed: {error}", diagnostics)
+
+
+async def agenerate_tailored_resume_pdf(run_config: RunnableConfig = None, **kwargs) -> str:
+    """Async implementation of generate-tailored-resume-pdf."""
+    data = TailoredResumeInput(**kwargs)
+    tailored_output = to_tailored_output(data)
+    # The first estimate loads the font width tables from disk
+    acceptable, note = await asyncio.to_thread(check_resume_length, tailored_output)
+    if not acceptable:
+        return note
+    priority, _ = await asyncio.to_thread(run_settings, run_config)
+    success, path_or_error, fit = await acreate_tailored_resume_pdf(
         tailored_output,
         data.company_name,
-        data.job_position
+        data.job_position,
+        priority
     )
     
     if success:
-        return f"✓ Tailored resume generated: {path_or_error}"
+        reply = f"✓ Tailored resume generated: {path_or_error} ({fit.describe()})"
+        return with_note(note, with_diagnostics(reply, fit.diagnostics))
     else:
-        return f"✗ Resume generation failed: {path_or_error}"
+        error, _, diagnostics = path_or_error.partition("\n")
+        return with_diagnostics(f"✗ Resume generation failed: {error}", diagnostics)
+
+
+generate_tailored_resume_pdf.coroutine = agenerate_tailored_resume_pdf
@@ -0,0 +1,553 @@
+"""Pluggable, batched translation of letter fields.
+
+Translation goes through a chain of registered backends (``google``, an
+offline ``dictionary``, ``identity`` and a ``local`` model hook), tried in
+order with a timeout each until one succeeds. The chain comes from
+``config.TRANSLATION_BACKENDS`` or the graph Configuration's
+``translation_backends``; with an offline chain the German pipeline runs
+deterministically without network access. When every backend fails,
+``TranslationError`` is raised instead of passing English text off as German.
+
+Google requests run concurrently on a bounded shared executor, paced by a
+machine-wide token bucket and retried with jittered backoff when throttled
+(see agent.rate_limit).
+
+Texts are translated sentence by sentence, and sentences already in the
+translation memory (see agent.translation_memory) are not sent at all.
+``translate_incremental`` additionally diffs a text against the previous
+version translated for the same output directory and reuses the unchanged
+sentences' translations directly.
+
+The Google backend packs the remaining sentences into as few requests as its
+size limit allows, separated by numbered markers on their own lines::
+
+    [[0]]
+    Application for Data Engineer
+    [[1]]
+    Dear Hiring Team,
+
+and splits the response on the same markers. The markers carry the segment
+index, so a reply that lost, merged or reordered markers is detected and that
+request falls back to one round trip per segment instead of misplacing text.
+"""
+
+import importlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+from deep_translator import GoogleTranslator
+from deep_translator.exceptions import RequestError, TooManyRequests
+
+from agent.rate_limit import get_translation_limiter, retry_with_backoff
+from agent.translation_memory import (
+    SENTENCE_END,
+    SENTENCE_START,
+    get_translation_memory,
+    normalize,
+    split_sentences,
+)
+from agent.user_config import config
+
+logger = logging.getLogger(__name__)
+
+
+# GoogleTranslator rejects payloads of 5000 characters or more
+MAX_REQUEST_CHARS = 4500
+
+MARKER = "[[{index}]]"
+MARKER_PATTERN = re.compile(r"\[\[\s*(\d+)\s*\]\]")
+# Where an oversized segment may be cut: paragraph breaks, then sentence ends
+CUT_PATTERNS = (re.compile(r"\n\s*\n"), re.compile(rf"{SENTENCE_END}\s+{SENTENCE_START}"))
+
+# Calls of one backend run on its own executor of this size, so a hung call
+# can be abandoned at its timeout and hung calls of one backend never take
+# the threads the next backend of the chain needs
+MAX_BACKEND_CALLS = 8
+# Throttling (429), other HTTP failures (deep_translator doesn't expose 5xx
+# separately) and network errors are retried; anything else fails at once
+RETRYABLE_ERRORS = (TooManyRequests, RequestError, requests.ConnectionError, requests.Timeout)
+# Characters of a backend's error message kept in TranslationError
+ERROR_CHARS = 120
+
+
+class TranslationError(Exception):
+    """Every backend of a translation chain failed."""
+
+
+# ============================================================================
+# Request Packing
+# ============================================================================
+
+def split_text(text: str, limit: int = MAX_REQUEST_CHARS) -> List[str]:
+    """Cut text longer than ``limit`` into pieces at paragraph or sentence breaks.
+
+    Pieces are translated as separate segments and joined with a space.
+    """
+    if len(text) <= limit:
+        return [text]
+    for pattern in CUT_PATTERNS:
+        pieces, current = [], ""
+        for part in pattern.split(text):
+            if current and len(current) + len(part) + 1 > limit:
+                pieces.append(current)
+                current = part
+            else:
+                current = f"{current} {part}" if current else part
+        pieces.append(current)
+        if all(len(piece) <= limit for piece in pieces):
+            return pieces
+    # No usable break: hard cut
+    return [text[i:i + limit] for i in range(0, len(text), limit)]
+
+
+def pack_segments(segments: List[str], limit: int = MAX_REQUEST_CHARS) -> List[List[Tuple[int, str]]]:
+    """Group segments into requests of at most ``limit`` characters, markers included.
+
+    Returns:
+        List of requests, each a list of (segment_index, text)
+    """
+    requests: List[List[Tuple[int, str]]] = []
+    size = limit
+    for index, text in enumerate(segments):
+        cost = len(MARKER.format(index=index)) + len(text) + 2
+        if size + cost > limit:
+            requests.append([])
+            size = 0
+        requests[-1].append((index, text))
+        size += cost
+    return requests
+
+
+def unpack_response(response: str, indices: List[int]) -> List[str]:
+    """Split a translated request back into its segments.
+
+    Raises:
+        ValueError: If the markers of the response don't match ``indices``
+    """
+    parts = MARKER_PATTERN.split(response)
+    # parts: [text before the first marker, index, text, index, text, ...]
+    found = [int(index) for index in parts[1::2]]
+    if parts[0].strip() or found != indices:
+        raise ValueError(f"Translation markers garbled: expected {indices}, got {found}")
+    return [text.strip() for text in parts[2::2]]
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+# Monotonic time at which the caller of the backend call running on this thread stops waiting
+_call_state = threading.local()
+
+
+def call_deadline() -> Optional[float]:
+    """Deadline of the backend call running on this thread, or None without a timeout."""
+    return getattr(_call_state, "deadline", None)
+
+
+def _run_backend(backend: "TranslationBackend", segments: List[str], target: str, deadline: Optional[float]) -> List[str]:
+    """Run ``backend.translate`` with ``deadline`` visible to it through ``call_deadline``."""
+    _call_state.deadline = deadline
+    try:
+        return backend.translate(segments, target)
+    finally:
+        _call_state.deadline = None
+
+
+class TranslationBackend(ABC):
+    """A translation service.
+
+    ``translate`` handles a list of segments in one call. Backends whose output
+    is not a real translation set ``cacheable`` to False so it never enters the
+    translation memory. Backends that wait or retry should stop at
+    ``call_deadline()``, when the caller moves on to the next backend.
+    """
+
+    name = ""
+    cacheable = True
+
+    @abstractmethod
+    def translate(self, segments: List[str], target: str) -> List[str]:
+        """Translate ``segments`` into ``target``, one translation per segment."""
+
+
+class GoogleBackend(TranslationBackend):
+    """Google Translate through deep_translator, with segments packed into few requests."""
+
+    name = "google"
+
+    def __init__(self):
+        """Create translators lazily, one per thread."""
+        self._local = threading.local()
+
+    def _translator(self, target: str) -> GoogleTranslator:
+        """Per-thread translator (GoogleTranslator keeps request state on the instance)."""
+        translators: Dict[str, GoogleTranslator] = self._local.__dict__.setdefault("translators", {})
+        if target not in translators:
+            translators[target] = GoogleTranslator(source='auto', target=target)
+        return translators[target]
+
+    def _call(self, text: str, target: str, deadline: Optional[float] = None) -> str:
+        """One rate-limited round trip, retried with jittered backoff when throttled or failing.
+
+        Neither waits for a token nor retries past ``deadline``, when the caller no longer listens.
+        """
+        def request() -> str:
+            get_translation_limiter().acquire(deadline)
+            return self._translator(target).translate(text)
+
+        return retry_with_backoff(
+            request, RETRYABLE_ERRORS, config.TRANSLATION_RETRIES, config.TRANSLATION_BACKOFF_SECONDS, deadline
+        )
+
+    def _translate_request(
+        self,
+        request: List[Tuple[int, str]],
+        target: str,
+        deadline: Optional[float] = None
+    ) -> Optional[List[str]]:
+        """Translate a packed request.
+
+        Returns:
+            The translations, or None if the reply's markers were garbled
+        """
+        if len(request) == 1:
+            return [self._call(request[0][1], target, deadline)]
+        payload = "\n".join(f"{MARKER.format(index=index)}\n{text}" for index, text in request)
+        try:
+            return unpack_response(self._call(payload, target, deadline), [index for index, _ in request])
+        except ValueError as e:
+            logger.warning("Translation batch fallback: %s", e)
+            return None
+
+    def translate(self, segments: List[str], target: str) -> List[str]:
+        """Translate segments with as few packed requests as possible."""
+        # Cut oversized segments so every piece fits a request
+        pieces: List[str] = []
+        owners: List[int] = []
+        for position, segment in enumerate(segments):
+            for piece in split_text(segment):
+                pieces.append(piece)
+                owners.append(position)
+
+        translated = list(pieces)
+        packed = pack_segments(pieces)
+        deadline = call_deadline()
+        # Requests (usually just one) go out side by side on the shared executor
+        replies = _request_pool.map(lambda request: self._translate_request(request, target, deadline), packed)
+        garbled: List[Tuple[int, str]] = []
+        for request, reply in zip(packed, list(replies)):
+            if reply is None:
+                garbled.extend(request)
+                continue
+            for (index, _), result in zip(request, reply):
+                translated[index] = result or pieces[index]
+        # Segments of garbled requests are sent one by one, again concurrently
+        singles = _request_pool.map(lambda item: self._call(item[1], target, deadline), garbled)
+        for (index, text), result in zip(garbled, list(singles)):
+            translated[index] = result or text
+
+        parts: List[List[str]] = [[] for _ in segments]
+        for position, text in zip(owners, translated):
+            parts[position].append(text)
+        return [" ".join(texts) for texts in parts]
+
+
+class DictionaryBackend(TranslationBackend):
+    """Offline lookup in a JSON file of ``{target: {source sentence: translation}}``.
+
+    Sources are matched after whitespace normalisation; unknown segments are
+    returned unchanged, so the output is deterministic for tests and benchmarks.
+    """
+
+    name = "dictionary"
+    cacheable = False
+
+    def __init__(self, path: Path):
+        """Read translations from the JSON file at ``path`` on first use."""
+        self.path = path
+        self._entries: Optional[Dict[str, Dict[str, str]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if self._entries is None:
+            raw = json.loads(self.path.read_text(encoding='utf-8')) if self.path.exists() else {}
+            self._entries = {
+                target: {normalize(source): translation for source, translation in entries.items()}
+                for target, entries in raw.items()
+            }
+        return self._entries
+
+    def translate(self, segments: List[str], target: str) -> List[str]:
+        """Look every segment up, returning unknown ones unchanged."""
+        entries = self._load().get(target, {})
+        return [entries.get(normalize(segment), segment) for segment in segments]
+
+
+class IdentityBackend(TranslationBackend):
+    """Returns every segment unchanged (a stand-in, or a last resort at the end of a chain)."""
+
+    name = "identity"
+    cacheable = False
+
+    def translate(self, segments: List[str], target: str) -> List[str]:
+        """Return the segments unchanged."""
+        return list(segments)
+
+
+class LocalModelBackend(TranslationBackend):
+    """Hook for a locally hosted model.
+
+    ``hook`` names a function as ``"package.module:function"`` that takes
+    ``(segments: List[str], target: str)`` and returns the translations.
+    """
+
+    name = "local"
+
+    def __init__(self, hook: str):
+        """Call the ``package.module:function`` named by ``hook``."""
+        self.hook = hook
+        self._function: Optional[Callable[[List[str], str], List[str]]] = None
+
+    def translate(self, segments: List[str], target: str) -> List[str]:
+        """Translate segments with the hook function, importing it on first use."""
+        if self._function is None:
+            if not self.hook:
+                raise TranslationError("no local model configured (config.TRANSLATION_LOCAL_MODEL)")
+            module, _, function = self.hook.partition(":")
+            self._function = getattr(importlib.import_module(module), function)
+        return list(self._function(segments, target))
+
+
+BACKEND_FACTORIES: Dict[str, Callable[[], TranslationBackend]] = {
+    "google": GoogleBackend,
+    "dictionary": lambda: DictionaryBackend(Path(config.TRANSLATION_DICTIONARY_PATH)),
+    "identity": IdentityBackend,
+    "local": lambda: LocalModelBackend(config.TRANSLATION_LOCAL_MODEL),
+}
+
+_backends: Dict[str, TranslationBackend] = {}
+_backends_lock = threading.Lock()
+_backend_calls: Dict[str, ThreadPoolExecutor] = {}
+# Individual HTTP requests of the Google backend, at most config.TRANSLATION_CONCURRENCY at once
+_request_pool = ThreadPoolExecutor(
+    max_workers=config.TRANSLATION_CONCURRENCY, thread_name_prefix="translation-request"
+)
+
+
+def register_backend(name: str, factory: Callable[[], TranslationBackend]) -> None:
+    """Make a backend available to translation chains under ``name``."""
+    with _backends_lock:
+        BACKEND_FACTORIES[name] = factory
+        _backends.pop(name, None)
+
+
+def get_backend(name: str) -> TranslationBackend:
+    """Return the process-wide instance of a registered backend."""
+    with _backends_lock:
+        if name not in _backends:
+            if name not in BACKEND_FACTORIES:
+                raise ValueError(
+                    f"Unknown translation backend {name!r} (expected one of {', '.join(BACKEND_FACTORIES)})"
+                )
+            _backends[name] = BACKEND_FACTORIES[name]()
+        return _backends[name]
+
+
+def _calls_of(name: str) -> ThreadPoolExecutor:
+    """Return the executor that runs the calls of backend ``name``."""
+    with _backends_lock:
+        if name not in _backend_calls:
+            _backend_calls[name] = ThreadPoolExecutor(
+                max_workers=MAX_BACKEND_CALLS, thread_name_prefix=f"translation-{name}"
+            )
+        return _backend_calls[name]
+
+
+def backend_timeout(name: str) -> float:
+    """Seconds a backend may take for one call."""
+    return config.TRANSLATION_TIMEOUTS.get(name, config.TRANSLATION_TIMEOUT_SECONDS)
+
+
+def translate_with_fallback(segments: List[str], target: str, chain: Sequence[str]) -> Tuple[List[str], str]:
+    """Translate segments with the first backend of ``chain`` that succeeds in time.
+
+    Returns:
+        Tuple of (translations: List[str], backend_name: str)
+
+    Raises:
+        TranslationError: If every backend failed or timed out
+    """
+    errors = []
+    for name in chain:
+        backend = get_backend(name)
+        timeout = backend_timeout(name)
+        deadline = time.monotonic() + timeout if timeout else None
+        call = _calls_of(name).submit(_run_backend, backend, segments, target, deadline)
+        try:
+            results = call.result(timeout=timeout or None)
+        except FutureTimeout:
+            errors.append(f"{name}: timed out after {timeout:g}s")
+            continue
+        except Exception as e:
+            # HTTP errors quote the whole request URL, i.e. the text
+            errors.append(f"{name}: {type(e).__name__}: {str(e)[:ERROR_CHARS]}")
+            continue
+        if len(results) != len(segments):
+            errors.append(f"{name}: returned {len(results)} translations for {len(segments)} segments")
+            continue
+        return results, name
+    raise TranslationError(f"Translation failed ({'; '.join(errors) or 'no backends configured'})")
+
+
+# ============================================================================
+# Batch API
+# ============================================================================
+
+def _translate_sentences(
+    sentences: List[str],
+    target: str,
+    chain: Sequence[str]
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Translate distinct sentences through the translation memory and the backend chain.
+
+    Returns:
+        Tuple of (translations: Dict[str, str], reusable: Dict[str, str]) where
+        reusable holds the real translations (memory hits and output of
+        cacheable backends) that may be remembered
+    """
+    # Sentences are reused from whichever backend of the chain translated them
+    memory = get_translation_memory()
+    known: Dict[str, str] = {}
+    for name in chain:
+        if memory is None or not get_backend(name).cacheable:
+            continue
+        missing = [sentence for sentence in sentences if sentence not in known]
+        if not missing:
+            break
+        known.update(memory.lookup(missing, target, name))
+    reusable = dict(known)
+
+    missing = [sentence for sentence in sentences if sentence not in known]
+    if missing:
+        translated, used = translate_with_fallback(missing, target, chain)
+        fresh = dict(zip(missing, translated))
+        if get_backend(used).cacheable:
+            if memory:
+                memory.store(fresh.items(), target, used)
+            reusable.update(fresh)
+        known.update(fresh)
+    return known, reusable
+
+
+def _sentences_of(pieces: List[List[str]]) -> List[str]:
+    """Distinct non-blank sentences of split texts, in order."""
+    return list(dict.fromkeys(
+        sentence for parts in pieces for sentence in parts[0::2] if sentence.strip()
+    ))
+
+
+def _splice(pieces: List[List[str]], translations: Dict[str, str]) -> List[str]:
+    """Reassemble split texts with each sentence replaced by its translation."""
+    return [
+        "".join(translations.get(part, part) if i % 2 == 0 else part for i, part in enumerate(parts))
+        for parts in pieces
+    ]
+
+
+def translate_batch(texts: List[str], target: str = "de", backends: Optional[Sequence[str]] = None) -> List[str]:
+    """Translate several texts in as few backend calls as possible.
+
+    Args:
+        texts: Texts to translate; empty strings are passed through
+        target: Target language code
+        backends: Backend chain, tried in order; defaults to config.TRANSLATION_BACKENDS
+
+    Returns:
+        Translations in the order of ``texts``
+
+    Raises:
+        TranslationError: If every backend of the chain failed
+    """
+    chain = list(backends or config.TRANSLATION_BACKENDS)
+    # [sentence, separator, sentence, ...] per text
+    pieces = [split_sentences(text) for text in texts]
+    translations, _ = _translate_sentences(_sentences_of(pieces), target, chain)
+    return _splice(pieces, translations)
+
+
+def translate_incremental(
+    texts: List[str],
+    target: str,
+    state_path: Path,
+    backends: Optional[Sequence[str]] = None
+) -> List[str]:
+    """Translate texts, reusing the sentences of the previous call with the same state file.
+
+    The state file keeps the last source sentences and their translations (for
+    one output directory). The new texts are diffed against it sentence by
+    sentence; only new or changed sentences are translated and spliced in
+    with the unchanged ones, so an edit costs in proportion to its size.
+
+    Args:
+        texts: Texts to translate
+        target: Target language code
+        state_path: JSON file holding the previous sentences and translations
+        backends: Backend chain; defaults to config.TRANSLATION_BACKENDS
+
+    Returns:
+        Translations in the order of ``texts``
+
+    Raises:
+        TranslationError: If every backend of the chain failed
+    """
+    chain = list(backends or config.TRANSLATION_BACKENDS)
+    pieces = [split_sentences(text) for text in texts]
+    sentences = _sentences_of(pieces)
+
+    previous: Dict[str, str] = {}
+    try:
+        state = json.loads(state_path.read_text(encoding='utf-8'))
+        # Translations from another chain or target don't carry over
+        if state.get("target") == target and state.get("backends") == chain:
+            previous = state.get("sentences", {})
+    except (OSError, ValueError):
+        pass
+
+    unchanged = {sentence: previous[sentence] for sentence in sentences if sentence in previous}
+    changed = [sentence for sentence in sentences if sentence not in unchanged]
+    translations, reusable = _translate_sentences(changed, target, chain) if changed else ({}, {})
+    translations.update(unchanged)
+
+    remembered = {**unchanged, **reusable}
+    # Nothing reusable (e.g. only the identity backend answered) or nothing new: keep the file as it is
+    if remembered and remembered != previous:
+        _save_state(state_path, {"target": target, "backends": chain, "sentences": remembered})
+
+    return _splice(pieces, translations)
+
+
+def _save_state(state_path: Path, state: Dict) -> None:
+    """Atomically replace the incremental translation state file."""
+    staging = state_path.with_name(f".{state_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        staging.write_text(json.dumps(state, ensure_ascii=False), encoding='utf-8')
+        os.replace(staging, state_path)
+    except OSError as e:
+        logger.warning("Could not save translation state: %s", e)
+    finally:
+        staging.unlink(missing_ok=True)
+
+
+def translate_to_german(text: str, backends: Optional[Sequence[str]] = None) -> str:
+    """Translate text to German with the configured backend chain."""
+    return translate_batch([text], "de", backends)[0]
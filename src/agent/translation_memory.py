@@ -0,0 +1,185 @@
+"""Persistent translation memory.
+
+Salutations, closings, company names and reused bullet sentences come back in
+almost every letter. Translations are stored per sentence in a SQLite
+database, keyed on a hash of the whitespace-normalised source sentence, the
+target language and the translation backend, so a repeated edit of a letter
+only sends the sentences that actually changed to the translator.
+
+Entries older than ``config.TRANSLATION_MEMORY_TTL_DAYS`` are ignored and
+purged, and the least recently used entries are evicted beyond
+``config.TRANSLATION_MEMORY_MAX_ENTRIES``.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from agent.user_config import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    key TEXT PRIMARY KEY,
+    target TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    source TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created REAL NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_used ON segments (used);
+"""
+
+# Abbreviations whose period doesn't end a sentence (matched case-sensitively)
+ABBREVIATIONS = (
+    "etc", "vs", "approx", "incl", "Dr", "Mr", "Mrs", "Ms", "Prof", "Jr", "Sr", "St",
+    "Inc", "Ltd", "Co", "No", "Nr", "Dipl", "Ing", "M.Sc", "B.Sc", "bzw", "ca", "usw",
+    "vgl", "inkl", "ggf", "Hr", "Fr", "Str", "Jan", "Feb", "Mar", "Apr", "Aug", "Sep",
+    "Sept", "Oct", "Okt", "Nov", "Dec", "Dez",
+)
+# A sentence ends at ., ! or ? unless the period closes an abbreviation, a
+# single letter ("e.g.", "z. B.", "J. Smith", "Ph.D.") or a day or month
+# number ("15. 03. 2026", "1. Juni")
+SENTENCE_END = r"(?<=[.!?])" + "".join(
+    rf"(?<!\b{re.escape(abbreviation)}\.)" for abbreviation in ABBREVIATIONS
+) + r"(?<!\b[A-Za-z]\.)(?<!\b\d\.)(?<!\b\d\d\.)"
+# ... and the next sentence doesn't start in lower case
+SENTENCE_START = r"(?=\S)(?![a-zß-ÿ])"
+# Sentence ends, keeping the whitespace after them so texts can be reassembled
+SENTENCE_BREAK = re.compile(rf"{SENTENCE_END}(\s+){SENTENCE_START}")
+# SQLite's default limit on host parameters per statement is 999
+LOOKUP_CHUNK = 500
+
+
+def normalize(text: str) -> str:
+    """Collapse whitespace so formatting changes don't miss the memory."""
+    return " ".join(text.split())
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences and the whitespace between them.
+
+    Returns:
+        Alternating [sentence, separator, sentence, ...]; joining the list
+        gives back ``text``
+    """
+    return SENTENCE_BREAK.split(text)
+
+
+class TranslationMemory:
+    """SQLite store of sentence translations. Every thread gets its own connection."""
+
+    def __init__(self, path: Path, max_entries: int, ttl_seconds: float = 0):
+        """Open the database at ``path``, keeping ``max_entries`` entries for ``ttl_seconds`` (0 = forever)."""
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db().executescript(SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.db = db
+        return db
+
+    @staticmethod
+    def key_for(source: str, target: str, backend: str) -> str:
+        """Return the memory key of a source sentence."""
+        return hashlib.sha256(f"{backend}\0{target}\0{normalize(source)}".encode()).hexdigest()
+
+    def lookup(self, sources: Iterable[str], target: str, backend: str) -> Dict[str, str]:
+        """Find stored translations.
+
+        Returns:
+            Mapping of each source found (as given) to its translation
+        """
+        keys = {self.key_for(source, target, backend): source for source in set(sources)}
+        now = time.time()
+        oldest = now - self.ttl_seconds if self.ttl_seconds else 0
+        found: Dict[str, str] = {}
+        db = self._db()
+        key_list = list(keys)
+        for i in range(0, len(key_list), LOOKUP_CHUNK):
+            chunk = key_list[i:i + LOOKUP_CHUNK]
+            rows = db.execute(
+                f"SELECT key, translation FROM segments WHERE created >= ? AND key IN ({','.join('?' * len(chunk))})",
+                [oldest, *chunk],
+            ).fetchall()
+            for key, translation in rows:
+                found[keys[key]] = translation
+        if found:
+            hit_keys = [(now, key) for key, source in keys.items() if source in found]
+            db.executemany("UPDATE segments SET used = ? WHERE key = ?", hit_keys)
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def store(self, pairs: Iterable[Tuple[str, str]], target: str, backend: str) -> None:
+        """Add (source, translation) pairs and evict if over budget."""
+        now = time.time()
+        rows = [
+            (self.key_for(source, target, backend), target, backend, normalize(source), translation, now, now)
+            for source, translation in pairs
+        ]
+        if not rows:
+            return
+        db = self._db()
+        db.executemany("INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        self._evict(db, now)
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> None:
+        """Purge expired entries and the least recently used ones beyond ``max_entries``."""
+        removed = 0
+        if self.ttl_seconds:
+            removed += db.execute("DELETE FROM segments WHERE created < ?", (now - self.ttl_seconds,)).rowcount
+        removed += db.execute(
+            "DELETE FROM segments WHERE key IN (SELECT key FROM segments ORDER BY used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        if removed:
+            with self._lock:
+                self.evictions += removed
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current size."""
+        entries = self._db().execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+            }
+
+
+_memory: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """Return the process-wide translation memory, or None if it is disabled."""
+    global _memory
+    if not config.TRANSLATION_MEMORY:
+        return None
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory(
+                Path(config.TRANSLATION_MEMORY_PATH),
+                max_entries=config.TRANSLATION_MEMORY_MAX_ENTRIES,
+                ttl_seconds=config.TRANSLATION_MEMORY_TTL_DAYS * 86400,
+            )
+        return _memory
@@ -9,6 +9,7 @@ IMPORTANT: Keep all information accurate and factual. Do not add false informati
 """
 
 from datetime import datetime
+from pathlib import Path
 
 
 class UserConfig:
@@ -44,9 +45,105 @@ class UserConfig:
     GENERATE_ENGLISH = True
     GENERATE_GERMAN = True
     
+    # Maximum number of language variants generated concurrently
+    LANGUAGE_WORKERS = 4
+    
+    # Cover letter renderer: "latex" (typeset with TeX) or "fpdf" (pure Python,
+    # bundled Calibri fonts). "latex" falls back to "fpdf" when TeX is not installed.
+    COVER_LETTER_ENGINE = "latex"
+    
+    # Page budgets; overflowing documents are tightened automatically
+    COVER_LETTER_MAX_PAGES = 1
+    RESUME_MAX_PAGES = 2
+    
+    # Content whose estimated length exceeds this fraction of the page budget is
+    # rejected before compiling (tightening recovers less than that)
+    LENGTH_REJECT_FILL = 1.2
+    # Lines tailored resume bullets may add over the original before rejection
+    RESUME_MAX_EXTRA_LINES = 6
+    
     # Resume Path (for reference when tailoring)
     RESUME_LATEX_PATH = "src/agent/templates/resume_template.tex"
     
+    # LaTeX Compilation
+    # Number of warm pdflatex workers, and how many documents each worker
+    # compiles before its build directory is recycled
+    LATEX_WORKERS = 2
+    LATEX_WORKER_MAX_JOBS = 50
+    # Seconds a caller waits for its compile (queued, running or shared with
+    # another caller) before giving up
+    LATEX_WAIT_TIMEOUT = 600
+    # Parent directory of the workers' build directories ("" = /dev/shm if available).
+    # PDFs are renamed into place from a directory on the output filesystem and
+    # copied from anywhere else (such as /dev/shm)
+    LATEX_BUILD_ROOT = ""
+    # Cover letters typeset per TeX job by the batch API
+    LATEX_BATCH_SIZE = 50
+    # Admission control: at most LATEX_WORKERS compiles run at once (across all
+    # engines) and LATEX_MAX_QUEUED wait; further requests are rejected at once.
+    # The compile service applies the same limit to the jobs waiting in its queue
+    LATEX_MAX_QUEUED = 32
+    # Places of those that batch compiles can't take, kept free for interactive edits
+    LATEX_INTERACTIVE_RESERVED = 8
+    # Batch-priority compiles (bulk runs) yield to interactive ones for at most
+    # this many seconds before they move to the front of the queue
+    LATEX_BATCH_AGING_SECONDS = 20
+    # Limits per TeX process: CPU seconds and address space in MB (0 disables)
+    LATEX_CPU_SECONDS = 60
+    LATEX_MEMORY_MB = 2048
+    
+    # Cache directory for precompiled formats and other build artifacts
+    CACHE_DIR = str(Path.home() / ".cache" / "auto_cover_letter_creator")
+    
+    # Size budget of the compiled-PDF cache (least recently used entries are evicted)
+    PDF_CACHE_MAX_MB = 256
+    
+    # Output profile of compiled PDFs: "standard", or "compact" for maximum
+    # (object stream) compression without producer/date/ID metadata
+    PDF_PROFILE = "standard"
+    # Recompress page streams of compiled PDFs with PyPDF2 (kept only if smaller);
+    # compile messages report the size before and after
+    PDF_RECOMPRESS = False
+    
+    # Optional compile service: documents are queued in a SQLite database and built
+    # by worker processes started with `python -m agent.compile_queue`, on any
+    # machine that shares the queue file and the output directories
+    COMPILE_SERVICE = False
+    COMPILE_QUEUE_PATH = str(Path(CACHE_DIR) / "compile_queue.sqlite3")
+    # Seconds a tool waits for a queued document, times a job is retried after its
+    # worker died, and seconds between worker heartbeats
+    COMPILE_JOB_TIMEOUT = 300
+    COMPILE_JOB_RETRIES = 2
+    COMPILE_HEARTBEAT_SECONDS = 5
+    
+    # Translation backends tried in order until one succeeds: "google", "dictionary"
+    # (offline JSON file of {target: {sentence: translation}}), "identity" (no
+    # translation) and "local" (TRANSLATION_LOCAL_MODEL, a "module:function" taking
+    # (segments, target)). German letters fail if every backend fails.
+    TRANSLATION_BACKENDS = ["google"]
+    TRANSLATION_DICTIONARY_PATH = str(Path(CACHE_DIR) / "translation_dictionary.json")
+    TRANSLATION_LOCAL_MODEL = ""
+    # Seconds a backend may take per call, with per-backend overrides
+    TRANSLATION_TIMEOUT_SECONDS = 15
+    TRANSLATION_TIMEOUTS = {"local": 120}
+    # Google requests in flight per process, requests per second (with bursts of
+    # TRANSLATION_BURST) shared by every process on the machine, and retries of
+    # throttled or failed requests with jittered exponential backoff.
+    # A rate of 0 disables the rate limit.
+    TRANSLATION_CONCURRENCY = 4
+    TRANSLATION_RATE_PER_SECOND = 2.0
+    TRANSLATION_BURST = 5
+    TRANSLATION_RETRIES = 3
+    TRANSLATION_BACKOFF_SECONDS = 1.0
+    
+    # Translation memory: sentence translations are stored in SQLite and reused;
+    # entries expire after TRANSLATION_MEMORY_TTL_DAYS (0 = never) and the least
+    # recently used ones are evicted beyond TRANSLATION_MEMORY_MAX_ENTRIES
+    TRANSLATION_MEMORY = True
+    TRANSLATION_MEMORY_PATH = str(Path(CACHE_DIR) / "translation_memory.sqlite3")
+    TRANSLATION_MEMORY_MAX_ENTRIES = 50000
+    TRANSLATION_MEMORY_TTL_DAYS = 180
+    
     # Professional Profile Text (used in agent prompts)
     # PROFESSIONAL_PROFILE = """
     # Aditya Ghanashyam Ladawa is an AI and backend engineer whose work philosophy centers on system ownership, automation, and scalable execution. He treats code as an asset and inefficiency as a structural failure. His cognition is optimized for throughput, and he codes 15+ daily to maintain deep fluency in agentic architecture, infrastructure logic, and automation pipelines.
@@ -0,0 +1,38 @@
+"""Shared fixtures: keep every test's outputs, caches and databases in a temp directory."""
+
+from collections import OrderedDict
+
+import pytest
+
+from agent import (
+    compile_queue,
+    latex_pool,
+    pdf_cache,
+    rate_limit,
+    single_flight,
+    toolchain,
+    tools,
+    translation,
+    translation_memory,
+)
+from agent.user_config import config
+
+
+@pytest.fixture(autouse=True)
+def isolated_config(tmp_path, monkeypatch):
+    """Point output, cache and database paths at ``tmp_path``."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(config, "BASE_OUTPUT_DIR", str(tmp_path / "out"))
+    monkeypatch.setattr(config, "CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(config, "COMPILE_QUEUE_PATH", str(cache_dir / "compile_queue.sqlite3"))
+    monkeypatch.setattr(config, "TRANSLATION_MEMORY_PATH", str(cache_dir / "translation_memory.sqlite3"))
+    monkeypatch.setattr(config, "TRANSLATION_DICTIONARY_PATH", str(cache_dir / "translation_dictionary.json"))
+    # Process-wide singletons are rebuilt from the patched configuration
+    for module, name in [
+        (compile_queue, "_queue"), (latex_pool, "_admission"), (pdf_cache, "_cache"), (rate_limit, "_limiter"),
+        (single_flight, "_single_flight"), (toolchain, "_toolchain"), (translation_memory, "_memory"),
+    ]:
+        monkeypatch.setattr(module, name, None)
+    monkeypatch.setattr(translation, "_backends", {})
+    monkeypatch.setattr(tools, "_tightening_choices", OrderedDict())
+    return tmp_path
@@ -0,0 +1,129 @@
+"""The async tool implementations must not block the event loop (checked with blockbuster)."""
+
+import asyncio
+
+import pytest
+from blockbuster import blockbuster_ctx
+
+from agent import tools
+from agent.user_config import config
+
+LETTER = {
+    "company_name": "Example GmbH",
+    "job_position": "Data Engineer",
+    "subject": "Application for Data Engineer",
+    "intro_paragraph": "Your team is moving pipelines into production. That is where I like to work.",
+    "bullet_sections": ["Built a forecasting system that ran for 4 months without intervention."],
+    "closing_paragraph": "I would like to bring the same ownership to your team.",
+}
+
+
+def run_on_loop(coroutine_function, *args, **kwargs):
+    """Run a coroutine with blockbuster raising on any blocking call made on the loop."""
+    async def main():
+        with blockbuster_ctx():
+            return await coroutine_function(*args, **kwargs)
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """Render with fpdf and translate with the identity backend: no TeX, no network."""
+    monkeypatch.setattr(config, "COVER_LETTER_ENGINE", "fpdf")
+    monkeypatch.setattr(config, "TRANSLATION_BACKENDS", ["identity"])
+
+
+def test_generate_cover_letter_pdfs_does_not_block(offline):
+    reply = run_on_loop(tools.agenerate_cover_letter_pdfs, **LETTER)
+    assert "✓ English cover letter" in reply
+    assert "✓ German cover letter" in reply
+
+
+def test_edit_cover_letter_pdfs_does_not_block(offline):
+    run_on_loop(tools.agenerate_cover_letter_pdfs, **LETTER)
+    reply = run_on_loop(tools.aedit_cover_letter_pdfs, **{**LETTER, "subject": "Application: Data Engineer"})
+    assert "✓ English cover letter" in reply
+
+
+def test_tailor_resume_for_ats_does_not_block():
+    reply = run_on_loop(
+        tools.atailor_resume_for_ats,
+        company_name="Example GmbH", job_position="Data Engineer", job_description="Python, SQL, Airflow",
+    )
+    assert reply
+
+
+def test_generate_tailored_resume_pdf_does_not_block(offline):
+    reply = run_on_loop(
+        tools.agenerate_tailored_resume_pdf,
+        company_name="Example GmbH", job_position="Data Engineer",
+        experience_sections=[], project_sections=[], hackathon_sections=[], skills="Python, SQL",
+    )
+    # Without TeX the compile fails, but it must fail off the event loop
+    assert reply.startswith(("✓", "✗", "⚠️"))
+
+
+# LangGraph calls the tools through ``ainvoke``, which runs ``.coroutine`` and injects the run config
+
+RUN_CONFIG = {"configurable": {"compile_priority": "batch", "translation_backends": "identity"}}
+
+
+@pytest.fixture
+def settings_seen(monkeypatch):
+    """Record the settings the async implementations resolve (the sync ones don't call run_settings)."""
+    seen = []
+    run_settings = tools.run_settings
+
+    def spy(run_config):
+        seen.append(run_settings(run_config))
+        return seen[-1]
+
+    monkeypatch.setattr(tools, "run_settings", spy)
+    return seen
+
+
+def invoke_on_loop(tool, arguments, config=None):
+    """Call a tool the way LangGraph's ToolNode does, with blockbuster watching the loop."""
+    async def main():
+        with blockbuster_ctx():
+            return await tool.ainvoke(arguments, config=config)
+
+    return asyncio.run(main())
+
+
+def test_generate_cover_letter_pdfs_ainvoke_does_not_block(offline, settings_seen):
+    reply = invoke_on_loop(tools.generate_cover_letter_pdfs, LETTER, RUN_CONFIG)
+    assert "✓ English cover letter" in reply
+    assert "✓ German cover letter" in reply
+    assert settings_seen == [("batch", ["identity"])]
+
+
+def test_edit_cover_letter_pdfs_tool_call_does_not_block(offline, settings_seen):
+    call = {"name": "edit-cover-letter-pdfs", "args": LETTER, "id": "call-1", "type": "tool_call"}
+    message = invoke_on_loop(tools.edit_cover_letter_pdfs, call, RUN_CONFIG)
+    assert message.tool_call_id == "call-1"
+    assert "✓ English cover letter" in message.content
+    assert settings_seen == [("batch", ["identity"])]
+
+
+def test_tailor_resume_for_ats_ainvoke_does_not_block():
+    assert tools.tailor_resume_for_ats.coroutine is tools.atailor_resume_for_ats
+    reply = invoke_on_loop(
+        tools.tailor_resume_for_ats,
+        {"company_name": "Example GmbH", "job_position": "Data Engineer", "job_description": "Python, SQL, Airflow"},
+    )
+    assert reply
+
+
+def test_generate_tailored_resume_pdf_ainvoke_does_not_block(offline, settings_seen):
+    reply = invoke_on_loop(
+        tools.generate_tailored_resume_pdf,
+        {
+            "company_name": "Example GmbH", "job_position": "Data Engineer",
+            "experience_sections": [], "project_sections": [], "hackathon_sections": [], "skills": "Python, SQL",
+        },
+        RUN_CONFIG,
+    )
+    assert reply.startswith(("✓", "✗", "⚠️"))
+    assert settings_seen == [("batch", ["identity"])]
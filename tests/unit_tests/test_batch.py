@@ -0,0 +1,134 @@
+"""Tests for the batch cover letter API against a fake compiler."""
+
+import re
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+from PyPDF2 import PdfWriter
+
+from agent import tools
+from agent.latex_pool import AdmissionControl, CompileResult, capacity_message
+from agent.user_config import config
+
+LETTER = {
+    "company_name": "Example GmbH",
+    "job_position": "Data Engineer",
+    "subject": "Application for Data Engineer",
+    "intro_paragraph": "Your team is moving pipelines into production.",
+    "bullet_sections": ["Built a forecasting system that ran for 4 months without intervention."],
+    "closing_paragraph": "I would like to bring the same ownership to your team.",
+}
+
+
+class FakePool:
+    """Admission-controlled compiler that writes one anchored page per letter, off-thread."""
+
+    def __init__(self, admission):
+        self.admission = admission
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.submitted = 0
+
+    def submit(self, latex_content, output_path, draft=False, priority="interactive"):
+        future = Future()
+        with self.lock:
+            self.submitted += 1
+        if not self.admission.admit(priority):
+            future.set_result(CompileResult(False, capacity_message(self.admission)))
+            return future
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        def run():
+            writer = PdfWriter()
+            for anchor in re.findall(r"letter\.\d+", latex_content):
+                writer.add_blank_page(612, 792)
+                writer.add_named_destination(anchor, len(writer.pages) - 1)
+            with open(output_path, "wb") as f:
+                writer.write(f)
+            with self.lock:
+                self.in_flight -= 1
+            self.admission.release(started=False)
+            future.set_result(CompileResult(True, f"PDF successfully generated: {output_path}"))
+
+        threading.Timer(0.05, run).start()
+        return future
+
+
+def use_fake_pool(monkeypatch, admission):
+    pool = FakePool(admission)
+    monkeypatch.setattr(config, "COVER_LETTER_ENGINE", "latex")
+    monkeypatch.setattr(config, "LATEX_WORKERS", 2)
+    monkeypatch.setattr(config, "LATEX_BATCH_SIZE", 2)
+    monkeypatch.setattr(tools, "BATCH_RETRY_SECONDS", 0.01)
+    monkeypatch.setattr(tools, "check_latex_installed", lambda: (True, "LaTeX is installed"))
+    monkeypatch.setattr(tools, "get_toolchain", lambda: SimpleNamespace(select_engine=lambda latex: "pdflatex"))
+    monkeypatch.setattr(tools, "get_compiler", lambda engine: pool)
+
+    def compile_alone(*args, **kwargs):
+        raise AssertionError("letters of an admitted batch job must not be compiled one by one")
+
+    monkeypatch.setattr(tools, "compile_latex_to_page_budget", compile_alone)
+    return pool
+
+
+def letters(count):
+    return [tools.CoverLetterInput(**{**LETTER, "company_name": f"Company {n}"}) for n in range(count)]
+
+
+def test_batch_keeps_the_admission_queue_free_for_interactive_work(monkeypatch):
+    admission = AdmissionControl(2, 4, interactive_reserve=2)
+    pool = use_fake_pool(monkeypatch, admission)
+    results = tools.create_cover_letter_pdf_batch(letters(12))
+    assert all(success for success, _, _ in results)
+    assert pool.max_in_flight <= config.LATEX_WORKERS
+    assert admission.stats()["rejected"] == 0
+
+
+def test_rejected_batch_jobs_are_resubmitted(monkeypatch):
+    admission = AdmissionControl(1, 1, interactive_reserve=1)
+    pool = use_fake_pool(monkeypatch, admission)
+    # Another batch holds the only batch place for a moment
+    assert admission.admit("batch")
+    threading.Timer(0.2, admission.release, kwargs={"started": False}).start()
+    results = tools.create_cover_letter_pdf_batch(letters(4))
+    assert all(success for success, _, _ in results)
+    assert admission.stats()["rejected"] >= 1
+    assert pool.submitted > 2
+    # The reserved place stays open for interactive edits
+    assert admission.admit("interactive")
+
+
+def test_one_broken_letter_does_not_abort_the_batch(monkeypatch):
+    use_fake_pool(monkeypatch, AdmissionControl(2, 4))
+    batch = letters(3)
+    real = tools.generate_cover_letter_latex
+
+    def generate(letter, lang, translators=None):
+        if letter.company_name == "Company 1":
+            raise ValueError("bad template field")
+        return real(letter, lang, translators)
+
+    monkeypatch.setattr(tools, "generate_cover_letter_latex", generate)
+    results = tools.create_cover_letter_pdf_batch(batch)
+    assert [success for success, _, _ in results] == [True, False, True]
+    assert "bad template field" in results[1][1]
+
+
+def test_letters_pick_their_own_renderer(monkeypatch):
+    monkeypatch.setattr(config, "COVER_LETTER_ENGINE", "fpdf")
+    rendered = []
+    monkeypatch.setattr(tools, "check_latex_installed", lambda: (True, "LaTeX is installed"))
+    monkeypatch.setattr(
+        tools, "render_cover_letter_pdf", lambda letter, lang, translators: rendered.append(letter) or (True, "x", None)
+    )
+    latex_letter = tools.CoverLetterInput(**{**LETTER, "render_engine": "latex"})
+    assert tools.select_cover_letter_engine(latex_letter.render_engine) == "latex"
+    use_fake_pool(monkeypatch, AdmissionControl(2, 4))
+    monkeypatch.setattr(config, "COVER_LETTER_ENGINE", "fpdf")
+    results = tools.create_cover_letter_pdf_batch([tools.CoverLetterInput(**LETTER), latex_letter])
+    assert rendered == [tools.CoverLetterInput(**LETTER)]
+    assert results[1][0] and results[1][1].endswith(".pdf")
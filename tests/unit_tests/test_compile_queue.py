@@ -0,0 +1,67 @@
+"""Tests for the SQLite compile queue, without compile workers."""
+
+import sqlite3
+import threading
+
+from agent.compile_queue import CompileQueue
+from agent.latex_pool import at_capacity
+from agent.user_config import config
+
+LEGACY_JOBS = """
+CREATE TABLE jobs (
+    id TEXT PRIMARY KEY,
+    latex TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    draft INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    heartbeat REAL,
+    success INTEGER,
+    message TEXT,
+    passes INTEGER,
+    pages INTEGER,
+    elapsed REAL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+def test_clients_opening_an_old_queue_at_once_migrate_it_once(tmp_path):
+    path = tmp_path / "queue.sqlite3"
+    with sqlite3.connect(path) as db:
+        db.executescript(LEGACY_JOBS)
+    errors = []
+    start = threading.Barrier(8)
+
+    def open_queue():
+        start.wait()
+        try:
+            CompileQueue(str(path))
+        except sqlite3.Error as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=open_queue) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    with sqlite3.connect(path) as db:
+        assert "due" in {row[1] for row in db.execute("PRAGMA table_info(jobs)")}
+
+
+def test_full_queue_rejects_jobs_before_queueing_them(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "LATEX_MAX_QUEUED", 3)
+    monkeypatch.setattr(config, "LATEX_INTERACTIVE_RESERVED", 1)
+    queue = CompileQueue()
+    assert queue.enqueue("a", str(tmp_path / "a.pdf"), priority="batch")
+    assert queue.enqueue("b", str(tmp_path / "b.pdf"), priority="batch")
+    # The last place is kept for interactive work
+    assert queue.enqueue("c", str(tmp_path / "c.pdf"), priority="batch") is None
+    assert queue.enqueue("c", str(tmp_path / "c.pdf"))
+    result = queue.submit("d", str(tmp_path / "d.pdf")).result(timeout=1)
+    assert not result.success and at_capacity(result.message)
+    assert queue.stats()["queued"] == 3
@@ -0,0 +1,27 @@
+"""Format names follow template edits."""
+
+import os
+
+from agent import latex_formats
+
+PREAMBLE = "\\documentclass{article}\n\\usepackage{geometry}\n"
+
+
+def touch_later(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_format_name_changes_with_the_template(tmp_path, monkeypatch):
+    monkeypatch.setattr(latex_formats, "TEMPLATES_DIR", tmp_path)
+    monkeypatch.setattr(latex_formats, "TEMPLATE_FAMILIES", {"letter": "letter.tex"})
+    template = tmp_path / "letter.tex"
+    template.write_text(PREAMBLE + "\\begin{document}\\end{document}", encoding='utf-8')
+    name = latex_formats.format_name("letter")
+    assert latex_formats.format_name("letter") == name
+    assert latex_formats.find_family(PREAMBLE + "\\begin{document}Hi\\end{document}") == "letter"
+
+    template.write_text(PREAMBLE + "\\usepackage{xcolor}\n\\begin{document}\\end{document}", encoding='utf-8')
+    touch_later(template)
+    assert latex_formats.format_name("letter") != name
+    assert latex_formats.find_family(PREAMBLE + "\\begin{document}Hi\\end{document}") is None
@@ -0,0 +1,141 @@
+"""Tests for the warm worker pool, run against a fake pdflatex on PATH."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from agent.latex_pool import (
+    PASS_COMMAND,
+    AdmissionControl,
+    LatexWorker,
+    LatexWorkerPool,
+)
+from agent.user_config import config
+
+FAKE_PDFLATEX = """\
+import sys, time
+print("**", end="", flush=True)
+line = sys.stdin.readline()
+source = open("document.tex").read()
+with open("document.log", "w") as log:
+    log.write("first-line=" + line)
+    if "CRASH" in source:
+        sys.exit(3)
+    if "HANG" in source:
+        time.sleep(60)
+    if "\\\\pdfdraftmode=1" in line:
+        log.write("PAGECOUNT=1\\n")
+    else:
+        open("document.pdf", "wb").write(b"%PDF-1.4 fake")
+        log.write("Output written on document.pdf (1 page, 13 bytes).\\n")
+"""
+
+DOCUMENT = "\\documentclass{article}\n\\begin{document}\n%s\n\\end{document}\n"
+
+
+@pytest.fixture(autouse=True)
+def fake_pdflatex(tmp_path, monkeypatch):
+    """Put a fake pdflatex that waits at the ``**`` prompt first on PATH."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "pdflatex"
+    script.write_text(f"#!{sys.executable}\n{FAKE_PDFLATEX}", encoding='utf-8')
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(config, "LATEX_BUILD_ROOT", str(tmp_path / "build"))
+    (tmp_path / "build").mkdir()
+
+
+def test_compile_answers_the_prompt_of_a_primed_process(tmp_path):
+    worker = LatexWorker()
+    try:
+        primed = worker._primed
+        assert primed is not None and primed.poll() is None
+        result = worker.compile(DOCUMENT % "Hello", str(tmp_path / "out.pdf"))
+        assert result.success, result.message
+        assert result.passes == 1
+        assert (tmp_path / "out.pdf").read_bytes() == b"%PDF-1.4 fake"
+        assert primed.poll() is not None
+        assert (worker.build_dir / "document.log").read_text().startswith("first-line=" + PASS_COMMAND)
+        # The next pass already has a process waiting
+        assert worker._primed is not primed and worker._primed.poll() is None
+    finally:
+        worker.close()
+
+
+def test_draft_pass_switches_to_draft_mode_at_the_prompt(tmp_path):
+    worker = LatexWorker()
+    try:
+        result = worker.compile(DOCUMENT % "Hello", str(tmp_path / "out.pdf"), draft=True)
+        assert result.success and result.pages == 1
+        assert not (tmp_path / "out.pdf").exists()
+    finally:
+        worker.close()
+
+
+def test_worker_recovers_after_a_crash(tmp_path):
+    worker = LatexWorker()
+    try:
+        crashed = worker.compile(DOCUMENT % "CRASH", str(tmp_path / "crash.pdf"))
+        assert not crashed.success
+        assert "not generated" in crashed.message
+        # A primed process that died while idle is replaced
+        worker._primed.kill()
+        worker._primed.wait()
+        result = worker.compile(DOCUMENT % "Hello", str(tmp_path / "out.pdf"))
+        assert result.success, result.message
+    finally:
+        worker.close()
+
+
+def test_hung_pass_is_killed_at_the_timeout(tmp_path):
+    worker = LatexWorker()
+    try:
+        (worker.build_dir / "document.tex").write_text(DOCUMENT % "HANG", encoding='utf-8')
+        proc = worker._primed
+        started = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired):
+            worker.run_pass(timeout=1)
+        assert time.monotonic() - started < 10
+        assert proc.poll() is not None
+    finally:
+        worker.close()
+
+
+def test_recycle_starts_a_fresh_build_directory():
+    worker = LatexWorker(max_jobs=1)
+    try:
+        first = worker.build_dir
+        worker.recycle()
+        assert worker.build_dir != first and not first.exists()
+        assert worker._primed is not None
+    finally:
+        worker.close()
+
+
+def test_pool_compiles_queued_documents(tmp_path):
+    pool = LatexWorkerPool(size=2, admission=AdmissionControl(2, 8))
+    try:
+        futures = [pool.submit(DOCUMENT % n, str(tmp_path / f"{n}.pdf")) for n in range(4)]
+        assert all(future.result(timeout=30).success for future in futures)
+        assert pool.admission.stats()["in_flight"] == 0
+    finally:
+        pool.shutdown()
+    with pytest.raises(RuntimeError):
+        pool.submit(DOCUMENT % "late", str(tmp_path / "late.pdf"))
+
+
+def test_full_admission_queue_rejects_immediately(tmp_path):
+    admission = AdmissionControl(1, 0)
+    assert admission.admit()
+    pool = LatexWorkerPool(size=1, admission=admission)
+    try:
+        result = pool.submit(DOCUMENT % "Hello", str(tmp_path / "out.pdf")).result(timeout=1)
+        assert not result.success and "at capacity" in result.message
+        assert admission.stats()["rejected"] == 1
+    finally:
+        admission.release(started=False)
+        pool.shutdown()
@@ -0,0 +1,52 @@
+"""Tests for the pre-compile LaTeX linter."""
+
+from agent.lint import MAX_ISSUES, format_lint_issues, lint_latex
+
+
+def document(body: str, preamble: str = "") -> str:
+    return f"\\documentclass{{article}}\n{preamble}\\begin{{document}}\n{body}\n\\end{{document}}\n"
+
+
+def messages(latex: str) -> list:
+    return [issue.message for issue in lint_latex(latex)]
+
+
+def test_clean_document_has_no_issues():
+    body = "Costs fell by 80\\% \\& more. $x_1^2$ \\href{https://a.b/c_d#e}{link} % a comment"
+    assert lint_latex(document(body)) == []
+
+
+def test_unescaped_specials_in_text():
+    found = messages(document("R&D #1 snake_case x^2 grew 80% fast"))
+    assert any("unescaped &" in m for m in found)
+    assert any("unescaped #" in m for m in found)
+    assert any("unescaped _" in m for m in found)
+    assert any("unescaped ^" in m for m in found)
+    assert any("unescaped %" in m for m in found)
+
+
+def test_alignment_ampersand_is_allowed_in_tables():
+    assert lint_latex(document("\\begin{tabular}{ll} a & b \\end{tabular}")) == []
+
+
+def test_unbalanced_braces_and_math():
+    found = messages(document("\\textbf{open and } closed} $x"))
+    assert "unbalanced } without matching {" in found
+    assert "math mode is never closed" in found
+    assert "unbalanced { is never closed" in messages(document("\\textbf{open"))
+
+
+def test_placeholders_and_untypesettable_characters():
+    issues = lint_latex(document("Dear {{MANAGER}}, ☃"))
+    assert issues[0].message == "unfilled placeholder {{MANAGER}}"
+    assert issues[0].line == 3
+    assert issues[0].column == 6
+    assert "U+2603" in issues[1].message
+
+
+def test_issues_are_capped_and_formatted():
+    issues = lint_latex(document("#" * (MAX_ISSUES + 5)))
+    assert len(issues) == MAX_ISSUES
+    status, *rest = format_lint_issues(issues).split("\n")
+    assert status.startswith("LaTeX lint error: line 3:1: unescaped #")
+    assert len(rest) == MAX_ISSUES - 1
@@ -0,0 +1,52 @@
+"""Tests for fitting compiled documents into their page budget."""
+
+from PyPDF2 import PdfWriter
+
+from agent import tools
+
+DOCUMENT = "\\documentclass[11pt]{article}\n\\begin{document}\nLONG\n\\end{document}\n"
+
+
+def write_pdf(path, pages):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(612, 792)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_tightening_choice_is_reused_for_a_repeated_source(tmp_path, monkeypatch):
+    drafts = []
+
+    def compile_latex_to_pdf(latex_content, output_path, priority="interactive"):
+        write_pdf(output_path, 2 if latex_content == DOCUMENT else 1)
+        return True, f"PDF successfully generated: {output_path}"
+
+    def draft_page_count(latex_content, priority="interactive"):
+        drafts.append(latex_content)
+        return 2 if latex_content == DOCUMENT else 1
+
+    monkeypatch.setattr(tools, "compile_latex_to_pdf", compile_latex_to_pdf)
+    monkeypatch.setattr(tools, "draft_page_count", draft_page_count)
+
+    output = str(tmp_path / "letter.pdf")
+    first = tools.compile_latex_to_page_budget(DOCUMENT, output, 1)
+    assert first[0] and first[2].pages == 1 and first[2].adjustment != "none"
+    assert len(drafts) == 1
+
+    second = tools.compile_latex_to_page_budget(DOCUMENT, output, 1)
+    assert second[2] == first[2]
+    assert len(drafts) == 1
+
+
+def test_draft_failures_are_not_remembered(tmp_path, monkeypatch):
+    drafts = []
+    monkeypatch.setattr(tools, "compile_latex_to_pdf", lambda latex, path, priority="interactive": (
+        write_pdf(path, 2) or (True, "PDF successfully generated")
+    ))
+    monkeypatch.setattr(tools, "draft_page_count", lambda latex, priority="interactive": drafts.append(latex))
+
+    for _ in range(2):
+        success, _, fit = tools.compile_latex_to_page_budget(DOCUMENT, str(tmp_path / "letter.pdf"), 1)
+        assert success and fit.pages == 2
+    assert len(drafts) == 2 * len(tools.TIGHTENING_LEVELS)
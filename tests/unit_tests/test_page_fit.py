@@ -0,0 +1,53 @@
+"""Tests for layout tightening."""
+
+from agent.latex_formats import split_preamble
+from agent.page_fit import (
+    TIGHTENING_LEVELS,
+    PageFit,
+    Tightening,
+    base_font_size,
+    tighten_latex,
+)
+
+DOCUMENT = (
+    "\\documentclass[11pt]{article}\n"
+    "\\usepackage[left=2cm,right=2cm,top=1.5cm,bottom=1.5cm]{geometry}\n"
+    "\\begin{document}\n"
+    "Hello\\vspace{10pt}\n"
+    "\\begin{itemize}[itemsep=4pt]\\item One\\end{itemize}\n"
+    "\\end{document}\n"
+)
+
+
+def test_tightening_keeps_the_original_preamble():
+    tightened = tighten_latex(DOCUMENT, TIGHTENING_LEVELS[-1])
+    assert tightened.startswith(split_preamble(DOCUMENT)[0])
+
+
+def test_tightening_scales_spacing_margins_and_font():
+    tightened = tighten_latex(DOCUMENT, Tightening(space_scale=0.5, margin_scale=0.75, font_scale=0.9))
+    assert "\\vspace{5pt}" in tightened
+    assert "itemsep=2pt" in tightened
+    assert "\\geometry{left=1.5cm,right=1.5cm,top=1.12cm,bottom=1.12cm}" in tightened
+    assert "\\fontsize{9.9}{11.9}\\selectfont" in tightened
+    assert "{0.5\\parskip}" in tightened
+
+
+def test_identity_level_and_documents_without_preamble_are_unchanged():
+    assert tighten_latex(DOCUMENT, Tightening()) == DOCUMENT
+    assert tighten_latex("no preamble here", TIGHTENING_LEVELS[0]) == "no preamble here"
+
+
+def test_levels_get_tighter():
+    for looser, tighter in zip(TIGHTENING_LEVELS, TIGHTENING_LEVELS[1:]):
+        assert tighter.space_scale <= looser.space_scale
+        assert tighter.margin_scale <= looser.margin_scale
+        assert tighter.font_scale <= looser.font_scale
+
+
+def test_descriptions():
+    assert base_font_size(DOCUMENT) == 11.0
+    assert Tightening(font_scale=0.9).describe(DOCUMENT) == "font 9.9pt"
+    assert PageFit(2, 1, "spacing x0.5").describe() == (
+        "2 pages, tightened: spacing x0.5; still over the 1-page limit, shorten the content"
+    )
@@ -0,0 +1,76 @@
+"""Tests for the content-addressed PDF cache."""
+
+import os
+
+from agent.pdf_cache import PdfCache
+from agent.user_config import config
+
+DOCUMENT = r"\documentclass{article}\begin{document}Hi\end{document}"
+
+
+def test_key_depends_on_output_settings(tmp_path, monkeypatch):
+    cache = PdfCache(tmp_path / "pdf", max_bytes=1024)
+    monkeypatch.setattr(config, "PDF_PROFILE", "standard")
+    monkeypatch.setattr(config, "PDF_RECOMPRESS", False)
+    plain = cache.key_for(DOCUMENT, "pdflatex", "1")
+    assert cache.key_for(DOCUMENT, "pdflatex", "1") == plain
+
+    monkeypatch.setattr(config, "PDF_RECOMPRESS", True)
+    recompressed = cache.key_for(DOCUMENT, "pdflatex", "1")
+    monkeypatch.setattr(config, "PDF_PROFILE", "compact")
+    compact = cache.key_for(DOCUMENT, "pdflatex", "1")
+    assert len({plain, recompressed, compact}) == 3
+
+
+def test_key_depends_on_engine_and_version(tmp_path):
+    cache = PdfCache(tmp_path / "pdf", max_bytes=1024)
+    keys = {
+        cache.key_for(DOCUMENT, "pdflatex", "1"),
+        cache.key_for(DOCUMENT, "pdflatex", "2"),
+        cache.key_for(DOCUMENT, "xelatex", "1"),
+    }
+    assert len(keys) == 3
+
+
+def test_fetch_places_a_stored_pdf(tmp_path):
+    cache = PdfCache(tmp_path / "pdf", max_bytes=1024)
+    built = tmp_path / "built.pdf"
+    built.write_bytes(b"%PDF-1.4 test")
+    assert not cache.fetch("k", str(tmp_path / "miss.pdf"))
+    cache.store("k", str(built))
+    assert cache.fetch("k", str(tmp_path / "out" / "hit.pdf"))
+    assert (tmp_path / "out" / "hit.pdf").read_bytes() == b"%PDF-1.4 test"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(tmp_path):
+    cache = PdfCache(tmp_path / "pdf", max_bytes=350)
+    for n, key in enumerate("abc"):
+        built = tmp_path / f"{key}.pdf"
+        built.write_bytes(b"x" * 100)
+        cache.store(key, str(built))
+        os.utime(cache._path(key), (n, n))
+    # "a" was used last, so "b" is the least recently used
+    os.utime(cache._path("a"), (10, 10))
+
+    built = tmp_path / "d.pdf"
+    built.write_bytes(b"x" * 100)
+    cache.store("d", str(built))
+    assert sorted(path.stem for path in (tmp_path / "pdf").glob("*.pdf")) == ["a", "c", "d"]
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] == 300
+
+
+def test_editing_an_output_in_place_leaves_the_cache_intact(tmp_path):
+    cache = PdfCache(tmp_path / "pdf", max_bytes=1024)
+    output = tmp_path / "out.pdf"
+    output.write_bytes(b"%PDF-1.4 original")
+    cache.store("k", str(output))
+    with open(output, "r+b") as f:
+        f.write(b"%PDF-1.4 edited!!")
+    assert cache.fetch("k", str(tmp_path / "hit.pdf"))
+    assert (tmp_path / "hit.pdf").read_bytes() == b"%PDF-1.4 original"
+    with open(tmp_path / "hit.pdf", "r+b") as f:
+        f.write(b"%PDF-1.4 edited!!")
+    assert cache._path("k").read_bytes() == b"%PDF-1.4 original"
@@ -0,0 +1,79 @@
+"""Tests for the shared token bucket and the retry helper."""
+
+import time
+
+import pytest
+
+from agent import rate_limit
+from agent.rate_limit import TokenBucket, retry_with_backoff
+
+
+def test_burst_is_free_then_paced(tmp_path):
+    bucket = TokenBucket(rate=1000.0, capacity=3, path=tmp_path / "bucket")
+    for _ in range(3):
+        assert bucket._take() == 0
+    assert 0 < bucket._take() <= 0.002
+
+
+def test_processes_share_the_bucket_file(tmp_path):
+    first = TokenBucket(rate=0.001, capacity=2, path=tmp_path / "bucket")
+    second = TokenBucket(rate=0.001, capacity=2, path=tmp_path / "bucket")
+    assert first._take() == 0
+    assert second._take() == 0
+    # Both tokens of the shared bucket are spent
+    assert first._take() > 0
+
+
+def test_zero_rate_is_unlimited(tmp_path):
+    bucket = TokenBucket(rate=0, capacity=1, path=tmp_path / "bucket")
+    for _ in range(10):
+        bucket.acquire()
+    assert bucket.stats()["acquired"] == 10
+    assert bucket.stats()["throttled"] == 0
+    assert not (tmp_path / "bucket").exists()
+
+
+def test_negative_rate_is_rejected():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=-1, capacity=1)
+
+
+def test_retry_with_backoff_reraises_after_retries(monkeypatch):
+    monkeypatch.setattr(rate_limit, "MAX_BACKOFF", 0.0)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        retry_with_backoff(flaky, (ConnectionError,), retries=2, base_delay=1.0)
+    assert len(calls) == 3
+
+
+def test_retry_with_backoff_does_not_retry_other_errors():
+    def broken():
+        raise KeyError("bad")
+
+    with pytest.raises(KeyError):
+        retry_with_backoff(broken, (ConnectionError,), retries=5, base_delay=1.0)
+
+
+def test_retry_with_backoff_stops_at_the_deadline(monkeypatch):
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        retry_with_backoff(flaky, (ConnectionError,), retries=100, base_delay=0.05, deadline=time.monotonic() + 0.2)
+    assert 1 <= len(calls) < 100
+
+
+def test_acquire_gives_up_when_the_token_comes_too_late(tmp_path):
+    bucket = TokenBucket(rate=0.001, capacity=1, path=tmp_path / "bucket")
+    bucket.acquire()
+    with pytest.raises(TimeoutError):
+        bucket.acquire(deadline=time.monotonic() + 1)
+    assert bucket.stats()["acquired"] == 1
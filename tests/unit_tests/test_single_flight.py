@@ -0,0 +1,112 @@
+"""Tests for single-flight compile coalescing."""
+
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+from agent import tools
+from agent.latex_pool import CompileResult
+from agent.single_flight import SingleFlight, fcntl
+
+
+def test_callers_of_a_running_key_share_its_result(tmp_path):
+    flights = SingleFlight(tmp_path)
+    leader, flight = flights.join("k")
+    follower, same = flights.join("k")
+    assert leader and not follower and same is flight
+    flights.land("k", "pdf")
+    assert flight.result(timeout=1) == "pdf"
+    # Landed keys start a new flight
+    assert flights.join("k")[0]
+    assert flights.stats()["compiles"] == 2
+    assert flights.stats()["coalesced"] == 1
+
+
+def test_fail_resolves_followers_once(tmp_path):
+    flights = SingleFlight(tmp_path)
+    _, flight = flights.join("k")
+    flights.fail("k", flight, RuntimeError("boom"))
+    flights.fail("k", flight, RuntimeError("again"))
+    with pytest.raises(RuntimeError, match="boom"):
+        flight.result(timeout=1)
+    assert flights.stats()["in_flight"] == 0
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs flock")
+def test_lock_is_exclusive_across_instances(tmp_path):
+    first, second = SingleFlight(tmp_path), SingleFlight(tmp_path)
+    fd = first.try_lock("k")
+    assert fd is not None
+    assert second.try_lock("k") is None
+    first.release("k", fd)
+    other = second.try_lock("k")
+    assert other is not None
+    second.release("k", other)
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs flock")
+def test_wait_remote_runs_after_the_other_holder_releases(tmp_path):
+    holder, waiter = SingleFlight(tmp_path), SingleFlight(tmp_path)
+    fd = holder.try_lock("k")
+    _, flight = waiter.join("k")
+    called = threading.Event()
+
+    def then(lock: int) -> None:
+        called.set()
+        waiter.release("k", lock)
+        waiter.land("k", "from cache")
+
+    waiter.wait_remote("k", then)
+    assert not called.wait(0.1)
+    holder.release("k", fd)
+    assert flight.result(timeout=5) == "from cache"
+
+
+def test_wait_remote_fails_the_flight_when_then_raises(tmp_path):
+    flights = SingleFlight(tmp_path)
+    _, flight = flights.join("k")
+
+    def then(lock: int) -> None:
+        flights.release("k", lock)
+        raise OSError("cache unreadable")
+
+    flights.wait_remote("k", then)
+    with pytest.raises(OSError, match="cache unreadable"):
+        flight.result(timeout=5)
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_shared_compiles_are_not_counted_as_cache_lookups(tmp_path, monkeypatch):
+    release = threading.Event()
+    compiles = []
+
+    class SlowCompiler:
+        def submit(self, latex_content, output_path, draft=False, priority="interactive"):
+            compiles.append(output_path)
+            future = Future()
+
+            def run():
+                release.wait(5)
+                with open(output_path, "wb") as f:
+                    f.write(b"%PDF-1.4 shared")
+                future.set_result(CompileResult(True, f"PDF successfully generated: {output_path}"))
+
+            threading.Thread(target=run).start()
+            return future
+
+    monkeypatch.setattr(tools, "check_latex_installed", lambda: (True, "LaTeX is installed"))
+    monkeypatch.setattr(tools, "get_toolchain", lambda: SimpleNamespace(select_engine=lambda latex: "pdflatex"))
+    monkeypatch.setattr(tools, "get_compiler", lambda engine: SlowCompiler())
+
+    futures = [tools.submit_latex_to_pdf("same source", str(tmp_path / f"{n}.pdf")) for n in range(5)]
+    release.set()
+    assert all(future.result(timeout=5)[0] for future in futures)
+    assert len(compiles) == 1
+    stats = tools.compile_stats()
+    assert (stats["pdf_cache"]["hits"], stats["pdf_cache"]["misses"]) == (0, 1)
+    assert stats["compile_sharing"]["coalesced"] == 4
+
+    assert tools.wait_for_compile(tools.submit_latex_to_pdf("same source", str(tmp_path / "again.pdf")))[0]
+    assert (tools.get_pdf_cache().stats()["hits"], tools.get_pdf_cache().stats()["misses"]) == (1, 1)
@@ -0,0 +1,60 @@
+"""Tests for the TeX log parser."""
+
+from agent.texlog import LogParser, parse_log
+
+LOG = """\
+This is pdfTeX, Version 3.141592653-2.6-1.40.25
+! Undefined control sequence.
+l.12 Dear \\Hirng
+                  Team,
+Overfull \\hbox (12.5pt too wide) in paragraph at lines 20--21
+[]\\T1/Carlito-TLF/m/n/10.95 A very long unbreakable word
+Underfull \\hbox (badness 10000) in paragraph at lines 30--30
+LaTeX Font Warning: Font shape `T1/cmr/m/sc' undefined
+(Font)              using `T1/cmr/m/n' instead on input line 5.
+Missing character: There is no ☃ in font Carlito!
+Package hyperref Warning: Token not allowed in a PDF string
+Output written on document.pdf (2 pages, 34567 bytes).
+"""
+
+
+def test_collects_every_kind_of_diagnostic():
+    report = parse_log(LOG.splitlines())
+    (error,) = report.errors
+    assert error.message == "Undefined control sequence."
+    assert error.line == 12
+    assert error.snippet == "Dear \\Hirng Team,"
+    assert [box.kind for box in report.boxes] == ["overfull", "underfull"]
+    assert report.boxes[0].amount_pt == 12.5
+    assert report.boxes[0].line == 20
+    assert report.boxes[0].snippet == "A very long unbreakable word"
+    assert report.fonts[0].message.endswith("using `T1/cmr/m/n' instead on input line 5.")
+    assert report.fonts[1].message == "Missing character ☃ in font Carlito"
+    assert report.warnings[0].message == "hyperref: Token not allowed in a PDF string"
+    assert report.pages == 2
+
+
+def test_feed_returns_the_error_as_soon_as_it_is_located():
+    parser = LogParser()
+    assert parser.feed("! Missing $ inserted.") is None
+    error = parser.feed("l.7 x_1")
+    assert error is not None and error.line == 7
+
+
+def test_line_offset_maps_back_to_the_full_document():
+    report = parse_log(["! Undefined control sequence.", "l.3 \\foo", ""], line_offset=40)
+    assert report.errors[0].line == 43
+
+
+def test_close_flushes_an_error_without_source_line():
+    parser = LogParser()
+    parser.feed("! Emergency stop.")
+    assert [e.message for e in parser.close().errors] == ["Emergency stop."]
+
+
+def test_summary_reports_only_large_overfull_boxes():
+    report = parse_log([
+        "Overfull \\hbox (0.5pt too wide) in paragraph at lines 1--1",
+        "Overfull \\hbox (3.0pt too wide) in paragraph at lines 2--2",
+    ])
+    assert report.summary() == "overfull box: Overfull \\hbox (3.0pt too wide) at line 2"
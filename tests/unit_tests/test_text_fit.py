@@ -0,0 +1,83 @@
+"""Tests for the analytical text-fit estimator."""
+
+from agent.text_fit import (
+    RESUME_FONT,
+    count_lines,
+    count_lines_many,
+    estimate_cover_letter,
+    estimate_resume_growth,
+    plain_text,
+    resume_bullet_budget,
+    resume_bullet_lines,
+    text_width,
+)
+from agent.tools import (
+    CoverLetterInput,
+    ResumeBulletPoint,
+    ResumeExperienceSection,
+    TailoredResumeOutput,
+)
+
+SENTENCE = "Built a forecasting system that ran for four months without intervention. "
+
+
+def letter(bullets: int = 3, repeat: int = 2) -> CoverLetterInput:
+    return CoverLetterInput(
+        company_name="Example GmbH",
+        job_position="Data Engineer",
+        subject="Application for Data Engineer",
+        intro_paragraph=SENTENCE * repeat,
+        bullet_sections=[SENTENCE * repeat] * bullets,
+        closing_paragraph=SENTENCE * repeat,
+    )
+
+
+def test_count_lines_breaks_at_spaces():
+    word_width = text_width("word ")
+    assert count_lines("", 100.0) == 1
+    assert count_lines("word", 100.0) == 1
+    # Ten words in a column that holds a little more than three of them
+    assert count_lines("word " * 9 + "word", 3.5 * word_width) == 4
+    # A word wider than the column still takes (only) its own line
+    assert count_lines("a" * 200, 10.0) == 1
+
+
+def test_count_lines_many_matches_single_calls_and_keeps_paragraphs():
+    texts = ["short", SENTENCE * 5, "one\ntwo\n\nfour"]
+    widths = [200.0, 250.0, 200.0]
+    assert count_lines_many(texts, widths) == [count_lines(t, w) for t, w in zip(texts, widths)]
+    assert count_lines("one\ntwo\n\nfour", 200.0) == 4
+
+
+def test_bold_and_helvetica_are_wider_than_calibri():
+    assert text_width(SENTENCE, bold=True) > text_width(SENTENCE)
+    assert text_width(SENTENCE, font=RESUME_FONT) > text_width(SENTENCE)
+
+
+def test_cover_letter_fill_grows_with_content():
+    short, long = estimate_cover_letter(letter(1, 1)), estimate_cover_letter(letter(8, 6))
+    assert 0 < short.fill < long.fill
+    assert not short.overflows and not short.budgets
+    assert long.overflows
+    assert set(long.budgets) == {"intro_paragraph", "closing_paragraph"} | {f"bullet_sections[{i}]" for i in range(8)}
+    assert all(budget < len(SENTENCE * 6) for budget in long.budgets.values())
+    assert "character budgets" in long.describe()
+
+
+def test_plain_text_strips_markup():
+    assert plain_text(r"Cut cost by 40\% with \textbf{Spark}---fast~and {cheap}") == "Cut cost by 40% with Spark—fast and cheap"
+
+
+def test_resume_growth_flags_bullets_that_add_lines():
+    original = r"Built \textbf{pipelines} in Airflow."
+    tailored = TailoredResumeOutput(
+        experience_sections=[ResumeExperienceSection(job_title="Engineer", company="Acme", bullet_points=[
+            ResumeBulletPoint(original_text=original, tailored_text=original),
+            ResumeBulletPoint(original_text=original, tailored_text=SENTENCE * 4),
+        ])],
+        project_sections=[], hackathon_sections=[], skills="Python",
+    )
+    growth = estimate_resume_growth(tailored)
+    assert growth.extra_lines == resume_bullet_lines(SENTENCE * 4) - resume_bullet_lines(original) > 0
+    assert growth.over_budget == {"Acme bullet 2": resume_bullet_budget(original)}
+    assert resume_bullet_budget(original) >= len(plain_text(original))
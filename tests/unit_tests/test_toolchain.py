@@ -0,0 +1,43 @@
+"""Toolchain template reads are cached until the files change."""
+
+import os
+
+from agent import toolchain
+from agent.latex_formats import format_dir
+from agent.toolchain import read_template, template_packages
+from agent.user_config import config
+
+PREAMBLE = "\\documentclass{article}\n\\usepackage{geometry}\n"
+
+
+def touch_later(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_read_template_rereads_only_after_a_change(tmp_path):
+    path = tmp_path / "a.tex"
+    path.write_text("one", encoding='utf-8')
+    first = read_template(path)
+    assert read_template(path) is first
+    path.write_text("two", encoding='utf-8')
+    touch_later(path)
+    assert read_template(path) == "two"
+    assert read_template(tmp_path / "missing.tex") == ""
+
+
+def test_template_packages_follow_template_edits(tmp_path, monkeypatch):
+    monkeypatch.setattr(toolchain, "TEMPLATES_DIR", tmp_path)
+    template = tmp_path / "letter.tex"
+    template.write_text(PREAMBLE + "\\begin{document}\\end{document}", encoding='utf-8')
+    assert template_packages() == {"geometry"}
+
+    template.write_text(PREAMBLE + "\\usepackage{hyperref}\n\\begin{document}\\end{document}", encoding='utf-8')
+    touch_later(template)
+    assert template_packages() == {"geometry", "hyperref"}
+
+
+def test_cache_paths_follow_the_configured_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "elsewhere"))
+    assert toolchain.toolchain_file() == tmp_path / "elsewhere" / "toolchain.json"
+    assert format_dir() == tmp_path / "elsewhere" / "formats"
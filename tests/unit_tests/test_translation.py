@@ -0,0 +1,162 @@
+"""Tests for the translation backends and the incremental batch API."""
+
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from agent import rate_limit, translation
+from agent.translation import (
+    MARKER,
+    TranslationBackend,
+    TranslationError,
+    pack_segments,
+    split_text,
+    translate_incremental,
+    translate_with_fallback,
+    unpack_response,
+)
+from agent.user_config import config
+
+
+class UpperBackend(TranslationBackend):
+    """Cacheable stand-in that upper-cases and counts what it is sent."""
+
+    name = "upper"
+
+    def __init__(self):
+        self.sent = []
+
+    def translate(self, segments, target):
+        self.sent.extend(segments)
+        return [segment.upper() for segment in segments]
+
+
+@pytest.fixture
+def upper(monkeypatch):
+    backend = UpperBackend()
+    monkeypatch.setitem(translation.BACKEND_FACTORIES, "upper", lambda: backend)
+    return backend
+
+
+def test_pack_segments_respects_the_request_limit():
+    segments = ["a" * 40, "b" * 40, "c" * 40, "d"]
+    requests = pack_segments(segments, limit=100)
+    assert [[index for index, _ in request] for request in requests] == [[0, 1], [2, 3]]
+    for request in requests:
+        assert sum(len(MARKER.format(index=index)) + len(text) + 2 for index, text in request) <= 100
+
+
+def test_pack_segments_gives_oversized_segments_their_own_request():
+    assert [[i for i, _ in r] for r in pack_segments(["x" * 500, "y"], limit=100)] == [[0], [1]]
+
+
+
+def test_split_text_does_not_cut_after_abbreviations():
+    sentence = "Dr. Smith uses e.g. Python, z. B. seit 1. März. "
+    pieces = split_text(sentence * 4, limit=2 * len(sentence))
+    assert len(pieces) > 1
+    assert all(piece.startswith("Dr. Smith") for piece in pieces)
+
+
+def test_unpack_response_splits_on_markers():
+    response = "[[3]]\nBewerbung\n[[ 4 ]]\nSehr geehrtes Team,\n"
+    assert unpack_response(response, [3, 4]) == ["Bewerbung", "Sehr geehrtes Team,"]
+
+
+@pytest.mark.parametrize("response", [
+    "[[3]]\nBewerbung Sehr geehrtes Team,",          # lost marker
+    "[[4]]\nSehr geehrtes Team,\n[[3]]\nBewerbung",   # reordered
+    "Vorwort\n[[3]]\nBewerbung\n[[4]]\nTeam",        # text before the first marker
+])
+def test_unpack_response_rejects_garbled_markers(response):
+    with pytest.raises(ValueError):
+        unpack_response(response, [3, 4])
+
+
+class HungBackend(TranslationBackend):
+    """Never answers until released."""
+
+    name = "hung"
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def translate(self, segments, target):
+        self.release.wait()
+        return list(segments)
+
+
+def test_backend_must_implement_translate():
+    class Incomplete(TranslationBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_hung_calls_do_not_starve_the_fallback(monkeypatch, upper):
+    hung = HungBackend()
+    monkeypatch.setitem(translation.BACKEND_FACTORIES, "hung", lambda: hung)
+    monkeypatch.setattr(config, "TRANSLATION_TIMEOUTS", {"hung": 0.01})
+    try:
+        # More timed-out calls than a backend has threads
+        for _ in range(translation.MAX_BACKEND_CALLS + 2):
+            assert translate_with_fallback(["Hi."], "de", ["hung", "upper"]) == (["HI."], "upper")
+    finally:
+        hung.release.set()
+
+
+def test_fallback_raises_when_every_backend_fails(monkeypatch):
+    hung = HungBackend()
+    monkeypatch.setitem(translation.BACKEND_FACTORIES, "hung", lambda: hung)
+    monkeypatch.setattr(config, "TRANSLATION_TIMEOUTS", {"hung": 0.01})
+    try:
+        with pytest.raises(TranslationError, match="hung: timed out"):
+            translate_with_fallback(["Hi."], "de", ["hung"])
+    finally:
+        hung.release.set()
+
+
+def test_incremental_translates_only_changed_sentences(tmp_path, upper):
+    state = tmp_path / "state.json"
+    first = translate_incremental(["One. Two.", "Three."], "de", state, ["upper"])
+    assert first == ["ONE. TWO.", "THREE."]
+
+    upper.sent.clear()
+    second = translate_incremental(["One. Changed.", "Three."], "de", state, ["upper"])
+    assert second == ["ONE. CHANGED.", "THREE."]
+    assert upper.sent == ["Changed."]
+    assert json.loads(state.read_text())["sentences"]["Changed."] == "CHANGED."
+
+
+def test_incremental_skips_state_when_nothing_is_reusable(tmp_path):
+    state = tmp_path / "state.json"
+    assert translate_incremental(["Hello there."], "de", state, ["identity"]) == ["Hello there."]
+    assert not state.exists()
+
+
+def test_abandoned_google_calls_stop_retrying(monkeypatch, upper):
+    calls = []
+
+    class Unreachable:
+        def translate(self, text):
+            calls.append(text)
+            raise requests.ConnectionError("down")
+
+    google = translation.GoogleBackend()
+    monkeypatch.setattr(google, "_translator", lambda target: Unreachable())
+    monkeypatch.setitem(translation.BACKEND_FACTORIES, "google", lambda: google)
+    monkeypatch.setattr(config, "TRANSLATION_RATE_PER_SECOND", 0)
+    monkeypatch.setattr(config, "TRANSLATION_RETRIES", 1000)
+    monkeypatch.setattr(config, "TRANSLATION_BACKOFF_SECONDS", 0.01)
+    monkeypatch.setattr(rate_limit, "MAX_BACKOFF", 0.02)
+    monkeypatch.setattr(config, "TRANSLATION_TIMEOUTS", {"google": 0.2})
+
+    assert translate_with_fallback(["Hi."], "de", ["google", "upper"]) == (["HI."], "upper")
+    time.sleep(0.3)
+    settled = len(calls)
+    time.sleep(0.3)
+    assert len(calls) == settled
@@ -0,0 +1,57 @@
+"""Tests for the persistent translation memory."""
+
+import time
+
+import pytest
+
+from agent.translation_memory import TranslationMemory, split_sentences
+
+
+def test_split_sentences_round_trips():
+    text = "Dear team,\nI apply.  Thanks! Really?"
+    pieces = split_sentences(text)
+    assert "".join(pieces) == text
+    assert pieces[::2] == ["Dear team,\nI apply.", "Thanks!", "Really?"]
+
+
+
+@pytest.mark.parametrize("text", [
+    "Skills in ML, e.g. Python and SQL.",
+    "Dear Dr. Smith, thank you.",
+    "Ich nutze z. B. Python und SQL.",
+    "I hold an M.Sc. Degree in Physics.",
+    "Ich beginne am 15. März 2026 bei Ihnen.",
+    "I joined in Jan. 2024 as J. Smith's successor.",
+])
+def test_abbreviations_do_not_end_a_sentence(text):
+    assert split_sentences(f"{text} Next sentence.")[::2] == [text, "Next sentence."]
+
+
+def test_lookup_is_keyed_on_normalised_source_target_and_backend(tmp_path):
+    memory = TranslationMemory(tmp_path / "tm.sqlite3", max_entries=100)
+    memory.store([("Hello  world.", "Hallo Welt.")], "de", "google")
+    assert memory.lookup(["Hello world.", "Other."], "de", "google") == {"Hello world.": "Hallo Welt."}
+    assert memory.lookup(["Hello world."], "fr", "google") == {}
+    assert memory.lookup(["Hello world."], "de", "local") == {}
+    stats = memory.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["entries"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    memory = TranslationMemory(tmp_path / "tm.sqlite3", max_entries=2)
+    memory.store([("a.", "A."), ("b.", "B.")], "de", "google")
+    time.sleep(0.01)
+    memory.lookup(["a."], "de", "google")
+    time.sleep(0.01)
+    memory.store([("c.", "C.")], "de", "google")
+    assert set(memory.lookup(["a.", "b.", "c."], "de", "google")) == {"a.", "c."}
+    assert memory.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    memory = TranslationMemory(tmp_path / "tm.sqlite3", max_entries=100, ttl_seconds=60)
+    memory.store([("old.", "Alt.")], "de", "google")
+    memory._db().execute("UPDATE segments SET created = created - 120")
+    assert memory.lookup(["old."], "de", "google") == {}